@@ -7,7 +7,6 @@ import logging
 from pathlib import Path
 from types import SimpleNamespace
 from typing import Annotated, Any
-import xxhash
 from collections import defaultdict
 
 import typer
@@ -17,6 +16,7 @@ from cycax.cli import (
     cmd_config,
 )
 from cycax.cli.config import Settings
+from cycax.cycad.serialize import BINARY_SUFFIX, JSON_SUFFIX, loads_spec, spec_file, spec_hash
 
 FORMAT = "%(message)s"
 logging.basicConfig(level=logging.DEBUG, format=FORMAT, datefmt="[%X]", handlers=[RichHandler()])
@@ -102,12 +102,14 @@ def add_to_build_order(json_file: Path, build_order: dict, level: int = 100):
         logging.error("The file %s does not exist.", _json_file)
         raise typer.Exit(code=1)
 
-    data = json.loads(_json_file.read_text())
-    data_hash = xxhash.xxh64(json.dumps(data)).hexdigest()
+    content = _json_file.read_bytes()
+    # The specs are saved as canonical JSON, the saved bytes are hashed as they are.
+    data_hash = spec_hash(content)
     if data_hash not in build_order:
-        build_order[data_hash] = {'index': level, 'hash': xxhash.xxh64(json.dumps(data)).hexdigest(), 'path': _json_file}
+        build_order[data_hash] = {'index': level, 'hash': data_hash, 'path': _json_file}
+        data = loads_spec(content)
         for part in data.get('parts', []):
-            _part_json = _json_file.parent / part['part_no'] / f"{part['part_no']}.json"
+            _part_json = spec_file(_json_file.parent / part['part_no'] / f"{part['part_no']}.json")
             add_to_build_order(_part_json, build_order, level - 1)
     else:
         build_order[data_hash]['index'] -= 1
@@ -125,10 +127,10 @@ def send(
         json_files = run_compile(
             filename=fields["filename"], function_name=fields["function_name"], build_dir=fields["build_dir"]
         )
-    elif fields["filename"].suffix == ".json":
+    elif fields["filename"].suffix in (JSON_SUFFIX, BINARY_SUFFIX):
         json_files = [fields["filename"]]
     elif fields["filename"].is_dir():
-        json_files = [Path(f) for f in fields["filename"].iterdir() if f.suffix == ".json"]
+        json_files = [Path(f) for f in fields["filename"].iterdir() if f.suffix in (JSON_SUFFIX, BINARY_SUFFIX)]
     else:
         logging.error("The path %s is not a Python file, JSON file, or directory.", filename)
         raise typer.Exit(code=1)
@@ -16,3 +16,4 @@ from cycax.cycad.assembly_side import (
 from cycax.cycad.cuboid import Cuboid, Cylinder, Print3D, SheetMetal  # noqa: F401
 from cycax.cycad.cycad_part import CycadPart  # noqa: F401
 from cycax.cycad.cycad_side import BackSide, BottomSide, FrontSide, LeftSide, RightSide, TopSide  # noqa: F401
+from cycax.cycad.part_instance import PartInstance  # noqa: F401
@@ -2,13 +2,17 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import json
+import copy
 import logging
 import os
-from collections import defaultdict, namedtuple
-from concurrent.futures import ProcessPoolExecutor
+import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 
+import numpy as np
+
 from cycax.cycad.assembly_openscad import AssemblyOpenSCAD
 from cycax.cycad.assembly_side import (
     AssemblySide,
@@ -22,7 +26,120 @@ from cycax.cycad.assembly_side import (
 from cycax.cycad.cycad_part import CycadPart
 from cycax.cycad.engines.base_assembly_engine import AssemblyEngine
 from cycax.cycad.engines.base_part_engine import PartEngine
-from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP
+from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP, Coordinate, snap
+from cycax.cycad.orientation import ROTATIONS, axis_order, normalize, rotation_matrix
+from cycax.cycad.part_instance import PartInstance
+from cycax.cycad.serialize import BINARY_SUFFIX, JSON_SUFFIX, canonical_json, geometry_hash, loads_spec, save_spec
+from cycax.cycad.validate import DEFAULT_MIN_WALL, validate_assembly
+
+DEFAULT_OUT_FORMATS = (("png", "ALL"), ("STL",), ("DXF", TOP))
+# Number of threads that save the parts of an assembly.
+SAVE_WORKERS = 8
+
+
+def _link_files(data_files: list[dict], part_no: str, alias: str) -> list[dict]:
+    """Link the files built for a part into the directory of a part with the same geometry.
+
+    The files are hard linked, or copied when the file system cannot link them, and renamed to the part number of the
+    alias, e.g. fan/fan.stl is linked to fan_copy/fan_copy.stl.
+
+    Args:
+        data_files: The files built for the part, as returned by the part engine.
+        part_no: The part number the files were built for.
+        alias: The part number of the part with the same geometry.
+
+    Returns:
+        The data files of the alias.
+    """
+    linked = []
+    for data_file in data_files:
+        source = Path(data_file["file"])
+        if source.parent.name != part_no:
+            # Not in the directory of the part, the file is shared as it is.
+            linked.append(data_file)
+            continue
+        name = alias + source.name[len(part_no) :] if source.name.startswith(part_no) else source.name
+        target = source.parent.parent / alias / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if not (target.exists() and target.samefile(source)):
+            target.unlink(missing_ok=True)
+            try:
+                os.link(source, target)
+            except OSError:
+                shutil.copy2(source, target)
+        linked.append({**data_file, "file": target})
+    return linked
+
+
+def _unshare_files(path: Path, unique_parts: list[tuple]):
+    """Make sure that building a part does not change the files of another part.
+
+    The engines write their files in place, a file that is hard linked to the files of another part, see _link_files,
+    would change for both parts. The links of the aliases are removed, they are linked again after the build.
+    The files of a part that are still linked to another part, e.g. when the parts were the same in an earlier build,
+    are replaced by a copy.
+
+    Args:
+        path: The path the parts are built in.
+        unique_parts: The parts that are built with their aliases, see Assembly._unique_parts.
+    """
+    for _part, aliases in unique_parts:
+        for alias in aliases:
+            for file_path in (path / alias).glob("*"):
+                if file_path.is_file() and file_path.stat().st_nlink > 1:
+                    file_path.unlink()
+    for part, _aliases in unique_parts:
+        for file_path in (path / part.part_no).glob("*"):
+            if file_path.is_file() and file_path.stat().st_nlink > 1:
+                temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+                shutil.copy2(file_path, temp_path)
+                temp_path.replace(file_path)
+
+
+class _SpecPart:
+    """The part that a parallel build job builds, only the part number, the path and the specification.
+
+    Part engines only use these from the part, the CycadPart with its sides and features is not sent to the worker.
+    """
+
+    __slots__ = ("_base_path", "_spec", "part_no")
+
+    def __init__(self, part_no: str, path: Path, spec: dict):
+        self.part_no = part_no
+        self._base_path = path
+        self._spec = spec
+
+    @property
+    def path(self) -> Path:
+        """The directory of the part."""
+        return self._base_path / self.part_no
+
+    def spec(self, *, optimize: bool = True) -> dict:  # noqa: ARG002 Unused argument
+        """The specification of the part, it was optimized before it was sent."""
+        return self._spec
+
+
+def _build_part(engine_class: type, config: dict, part_no: str, content: bytes, path: Path) -> dict:
+    """Build a part in a worker process of Assembly.build_in_parallel.
+
+    The job only holds what the worker needs, the part specification as canonical JSON and the engine class and config,
+    so the assembly, its parts and the engine are not pickled for every job.
+
+    Args:
+        engine_class: The PartEngine class, it is pickled by name.
+        config: The config of the part engine.
+        part_no: The part number.
+        content: The part specification, see canonical_json.
+        path: The path the parts are built in.
+
+    Returns:
+        The part number and the files that were built.
+    """
+    logging.info("Enter Building part %s in parallel: pid %s", part_no, os.getpid())
+    part_engine = engine_class(name=part_no, path=path, config=config)
+    data_files = part_engine.build(_SpecPart(part_no, path, loads_spec(content)))
+    logging.info("Exit Part %s built in parallel: pid %s", part_no, os.getpid())
+    return {"part_no": part_no, "data_files": data_files}
 
 
 class Assembly:
@@ -46,6 +163,10 @@ class Assembly:
         self.front = AssemblySideFront(self)
         self.back = AssemblySideBack(self)
         self.assemblies = []
+        self._bounding_box = None
+        self._bounding_box_parts = None
+        self._center = None
+        self._moving_parts = False
 
     def _get_assembler(self, engine: str = "OpenSCAD", engine_config: dict | None = None) -> AssemblyEngine:
         logging.info("Calling to the assembler")
@@ -63,6 +184,7 @@ class Assembly:
         engine_config: dict | None = None,
         part_engine: str = "OpenSCAD",
         part_engine_config: dict | None = None,
+        quality: str | None = None,
     ):
         """Run the assembly and produce output files.
 
@@ -71,22 +193,106 @@ class Assembly:
             engine_config: Additional config to pass to the engine used for assembly.
             part_engine: The engine to use for part creation.
             part_engine_config: Additional config to pass to the part engine.
+            quality: The quality profile for the parts, one of preview, default or production.
         """
         assembler = self._get_assembler(engine, engine_config)
         assembler._base_path = self._base_path  # HACK
 
-        for part in self.parts.values():
-            data_files = part.render(engine=part_engine, engine_config=part_engine_config)
+        unique_parts = self._unique_parts()
+        _unshare_files(Path(self._base_path), unique_parts)
+        for part, aliases in unique_parts:
+            data_files = part.render(engine=part_engine, engine_config=part_engine_config, quality=quality)
             self._part_files[part.part_no] = data_files
+            for alias in aliases:
+                self._part_files[alias] = _link_files(data_files, part.part_no, alias)
 
         self.build(engine=assembler, part_engines=[])
 
-    def build(self, engine: AssemblyEngine | None = None, part_engines: list[PartEngine] | None = None):
+    def _unique_parts(self) -> list[tuple[CycadPart, list[str]]]:
+        """Find the parts that build to different files.
+
+        Parts are the same when their specifications, without the part number, are the same, see geometry_hash.
+        One part is built for every geometry, its files are linked for the other part numbers with that geometry.
+
+        Returns:
+            A part for every geometry, with the other part numbers that have the same geometry.
+
+        Raises:
+            ValueError: When parts with the same part number have different specifications.
+        """
+        part_hashes = {}
+        geometries = {}
+        for part in self.parts.values():
+            geometry = geometry_hash(part.spec())
+            if part_hashes.setdefault(part.part_no, geometry) != geometry:
+                msg = f"""The parts with part number {part.part_no} are not the same.
+                    Parts that are different must have different part numbers."""
+                raise ValueError(msg)
+            if geometry not in geometries:
+                geometries[geometry] = (part, [])
+            elif part.part_no != geometries[geometry][0].part_no and part.part_no not in geometries[geometry][1]:
+                geometries[geometry][1].append(part.part_no)
+        for part, aliases in geometries.values():
+            if aliases:
+                logging.info("The parts %s are the same as %s, the part is built once", aliases, part.part_no)
+        return list(geometries.values())
+
+    def _plan_out_formats(self, engine: AssemblyEngine | None, out_formats: list[tuple] | None) -> list[tuple]:
+        """Decide which file formats the part engines must produce.
+
+        The part engines are only asked for the formats the assembly engine needs and the formats requested.
+        When there is nothing to go on, e.g. no assembly engine, the default formats are produced.
+        An empty plan leaves the part engines to use their own configuration.
+
+        Args:
+            engine: The AssemblyEngine that will use the part files.
+            out_formats: The formats explicitly requested, e.g. [("png", "ALL"), ("DXF", TOP)].
+
+        Returns:
+            The list of formats for the out_formats config of the part engines.
+        """
+        planned = list(engine.part_formats) if engine is not None else []
+        if out_formats is None and engine is None:
+            out_formats = DEFAULT_OUT_FORMATS
+        for requested_format in out_formats or []:
+            file_format = tuple(requested_format)
+            if file_format not in planned:
+                planned.append(file_format)
+        return planned
+
+    @staticmethod
+    def _planned_engines(part_engines: list[PartEngine], planned_formats: list[tuple]) -> list[PartEngine]:
+        """Copies of the part engines that produce the planned formats, the engines that were given are not changed.
+
+        Args:
+            part_engines: The part engines given to build.
+            planned_formats: The formats for the out_formats config of the part engines, see _plan_out_formats.
+
+        Returns:
+            The part engines to build with.
+        """
+        if not planned_formats:
+            return list(part_engines)
+        planned_engines = []
+        for part_engine in part_engines:
+            planned_engine = copy.copy(part_engine)
+            planned_engine.config = dict(part_engine.config, out_formats=planned_formats)
+            planned_engines.append(planned_engine)
+        return planned_engines
+
+    def build(
+        self,
+        engine: AssemblyEngine | None = None,
+        part_engines: list[PartEngine] | None = None,
+        out_formats: list[tuple] | None = None,
+    ):
         """Create the parts defined in the assembly and assemble.
 
         Args:
             engine: Instance of AssemblyEngine to use.
             part_engines: Instances of PartEngine to use on parts.
+            out_formats: Formats to produce for every part, in addition to what the assembly engine needs.
+                E.g. [("png", "ALL"), ("DXF", TOP)].
         """
 
         if engine is not None:
@@ -96,26 +302,25 @@ class Assembly:
             logging.warning("No assembly engine specified. No assembly output.")
 
         if part_engines is not None:
-            unique_parts = {}
+            part_engines = self._planned_engines(part_engines, self._plan_out_formats(engine, out_formats))
+            unique_parts = self._unique_parts()
+            _unshare_files(Path(self._base_path), unique_parts)
             # Create the Parts.
-            for part in self.parts.values():
-                if part.part_no not in unique_parts:
-                    unique_parts[part.part_no] = part
-                    for part_engine in part_engines:
-                        part_engine.create(part)
-                else:
-                    logging.warning("The part %s is already processed", part.part_no)
+            for part, _aliases in unique_parts:
+                for part_engine in part_engines:
+                    part_engine.create(part)
 
             # For asyncrounouse build environments, e.g. CyCAx Server and LinkLocation
             # Creation on the Part in the Engine will start the build in the background.
             # The build step is a collect/download step.
             # Build the parts.
-            for part in unique_parts.values():
+            for part, aliases in unique_parts:
                 for part_engine in part_engines:
                     part_engine.new(part.part_no, self._base_path)
-                    part_engine.config["out_formats"] = [("png", "ALL"), ("STL",), ("DXF", TOP)]
                     data_files = part.build(engine=part_engine)
                     self._part_files[part.part_no] = data_files
+                    for alias in aliases:
+                        self._part_files[alias] = _link_files(data_files, part.part_no, alias)
         else:
             logging.warning("No Part engines given. No Parts created.")
 
@@ -125,20 +330,21 @@ class Assembly:
                 engine.add(action)
             engine.build()
 
-    def _run_build_in_parallel(self, part_engine: PartEngine, part: dict, worker_path: Path) -> dict:
-        logging.info("Enter Building part %s in parallel: pid %s", part.part_no, os.getpid())
-        part_engine.new(part.part_no, worker_path)
-        part_engine.config["out_formats"] = [("png", "ALL"), ("STL",), ("DXF", TOP)]
-        data_files = part_engine.build(part)
-        logging.info("Exit Part %s built in parallel: pid %s", part.part_no, os.getpid())
-        return {"part_no": part.part_no, "data_files": data_files}
-
-    def build_in_parallel(self, engine: AssemblyEngine | None = None, part_engines: list[PartEngine] | None = None):
+    def build_in_parallel(
+        self,
+        engine: AssemblyEngine | None = None,
+        part_engines: list[PartEngine] | None = None,
+        out_formats: list[tuple] | None = None,
+    ):
         """Create the parts defined in the assembly and assemble.
 
+        The parts are built in worker processes, a job only sends the part specification and the class and config of
+        the part engine to the worker, see _build_part.
+
         Args:
             engine: Instance of AssemblyEngine to use.
             part_engines: Instances of PartEngine to use on parts.
+            out_formats: Formats to produce for every part, in addition to what the assembly engine needs.
         """
 
         if engine:
@@ -148,13 +354,10 @@ class Assembly:
             logging.warning("No assembly engine specified. No assembly output.")
 
         if part_engines is not None:
-            unique_parts = {}
-            # Create the Parts.
-            for part in self.parts.values():
-                if part.part_no not in unique_parts:
-                    unique_parts[part.part_no] = part
-                else:
-                    logging.warning("The part %s is already processed", part.part_no)
+            part_engines = self._planned_engines(part_engines, self._plan_out_formats(engine, out_formats))
+            unique_parts = self._unique_parts()
+            _unshare_files(Path(self._base_path), unique_parts)
+            part_aliases = {part.part_no: aliases for part, aliases in unique_parts}
 
             # For asyncrounouse build environments, e.g. CyCAx Server and LinkLocation
             # Creation on the Part in the Engine will start the build in the background.
@@ -162,18 +365,33 @@ class Assembly:
             # Build the parts.
             results = []
             with ProcessPoolExecutor() as executor:
-                for part in unique_parts.values():
+                for part, _aliases in unique_parts:
+                    content = canonical_json(part.spec())
                     for part_engine in part_engines:
-                        results.append(executor.submit(self._run_build_in_parallel, part_engine, part, self._base_path))
+                        results.append(
+                            executor.submit(
+                                _build_part,
+                                type(part_engine),
+                                part_engine.config,
+                                part.part_no,
+                                content,
+                                self._base_path,
+                            )
+                        )
 
                 for result in results:
                     try:
                         data_files = result.result()
                         if data_files:
-                            if data_files.get("part_no") in self._part_files:
-                                self._part_files[data_files.get("part_no")].extend(data_files.get("data_files"))
-                            else:
-                                self._part_files[data_files.get("part_no")] = data_files.get("data_files")
+                            part_no = data_files.get("part_no")
+                            for alias in [part_no, *part_aliases.get(part_no, [])]:
+                                files = data_files.get("data_files")
+                                if alias != part_no:
+                                    files = _link_files(files, part_no, alias)
+                                if alias in self._part_files:
+                                    self._part_files[alias].extend(files)
+                                else:
+                                    self._part_files[alias] = files
                     except Exception as error:
                         logging.error("Error building part %s", error)
         else:
@@ -185,12 +403,24 @@ class Assembly:
                 engine.add(action)
             engine.build()
 
-    def save(self, path: Path | str | None = None) -> list[Path]:
+    def validate(self, min_wall: float = DEFAULT_MIN_WALL) -> dict:
+        """Check all the features of every part in the assembly, see cycax.cycad.validate.
+
+        Args:
+            min_wall: The thinnest wall in mm that is allowed around holes.
+
+        Returns:
+            A report with the name of the assembly and the issues found in its parts.
+        """
+        return validate_assembly(self, min_wall=min_wall)
+
+    def save(self, path: Path | str | None = None, *, binary: bool = False) -> list[Path]:
         """Save the assembly and parts to JSON files.
 
         Args:
             path: The location where the assembly is stored.
                 A directory for each part will be created in this path.
+            binary: Save the specs in the compact binary format, see cycax.cycad.serialize.
         """
 
         if path is None:
@@ -201,15 +431,20 @@ class Assembly:
         if not path.exists():
             msg = f"The directory {path} does not exists."
             raise FileNotFoundError(msg)
-        # Save the parts
+        # Save the parts, instances share the part definition that is saved once.
+        # Parts with the same part number are saved to the same file, the last part is kept.
+        definitions = {}
         for item in self.parts.values():
-            item.save(path)
+            item._base_path = path
+            definitions[item.part_no] = item.part if isinstance(item, PartInstance) else item
+        with ThreadPoolExecutor(max_workers=SAVE_WORKERS) as executor:
+            list(executor.map(lambda part: part.save(path, binary=binary), definitions.values()))
 
         # Save the assembly
         data = self.export()
-        data_filename = path / f"{self.name}.json"
+        data_filename = path / f"{self.name}{BINARY_SUFFIX if binary else JSON_SUFFIX}"
         data_filename = data_filename.expanduser().resolve().absolute()
-        data_filename.write_text(json.dumps(data))
+        save_spec(data_filename, data, binary=binary)
         logging.info("Saved assembly '%s' to %s", self.name, data_filename)
 
         return data_filename
@@ -219,9 +454,19 @@ class Assembly:
         """
         Creates a bounding box that will give the plane of each side of the assembly.
 
+        The bounding box is cached and kept up to date as parts are added and moved,
+        it is only calculated from all the parts again when a part on the side of the assembly moves inwards.
+
         Returns:
             Bounding box.
         """
+        if self._bounding_box is None or self._bounding_box_parts is not self.parts:
+            self._bounding_box = self._calculate_bounding_box()
+            self._bounding_box_parts = self.parts
+        return dict(self._bounding_box)
+
+    def _calculate_bounding_box(self) -> dict:
+        """Calculate the bounding box from the bounds of all the parts."""
         x_min = None
         x_max = None
         y_min = None
@@ -238,6 +483,42 @@ class Assembly:
         bounding_box = {LEFT: x_min, FRONT: y_min, BOTTOM: z_min, RIGHT: x_max, BACK: y_max, TOP: z_max}
         return bounding_box
 
+    def _part_bounds_changed(self, old: dict | None, new: dict):
+        """Update the cached bounding box after a part was added or moved.
+
+        Args:
+            old: The bounding box of the part before it moved, None when the part was added.
+            new: The bounding box of the part now.
+        """
+        self._center = None
+        box = self._bounding_box
+        if box is None or self._moving_parts:
+            return
+        if old is not None and (
+            any(old[side] == box[side] and new[side] > old[side] for side in (LEFT, FRONT, BOTTOM))
+            or any(old[side] == box[side] and new[side] < old[side] for side in (RIGHT, BACK, TOP))
+        ):
+            # The part was on the side of the assembly and moved inwards, the other parts decide where the side is.
+            self._bounding_box = None
+            return
+        for side in (LEFT, FRONT, BOTTOM):
+            box[side] = self._min(box[side], new[side])
+        for side in (RIGHT, BACK, TOP):
+            box[side] = self._max(box[side], new[side])
+
+    @contextmanager
+    def _move_parts(self):
+        """Move the parts of the assembly without updating the bounding box for every part.
+
+        The bounding box must be updated, or marked as stale, after all the parts moved.
+        """
+        self._moving_parts = True
+        try:
+            yield
+        finally:
+            self._moving_parts = False
+            self._center = None
+
     def _min(self, current_value: float, new_value: float):
         if current_value is None:
             return new_value
@@ -258,15 +539,17 @@ class Assembly:
         Returns:
             The coordinates of the center of the assembly.
         """
-        center_x = 0
-        center_y = 0
-        center_z = 0
-        for part in self.parts.values():
-            center_x = min(part.center[0], center_x)
-            center_y = min(part.center[1], center_y)
-            center_z = min(part.center[2], center_z)
-        coordinate = namedtuple("Coordinate", ["x", "y", "z"])
-        return coordinate(x=center_x, y=center_y, z=center_z)
+        if self._center is None or self._bounding_box_parts is not self.parts:
+            center_x = 0
+            center_y = 0
+            center_z = 0
+            for part in self.parts.values():
+                part_center = part.center
+                center_x = min(part_center[0], center_x)
+                center_y = min(part_center[1], center_y)
+                center_z = min(part_center[2], center_z)
+            self._center = Coordinate(x=center_x, y=center_y, z=center_z)
+        return self._center
 
     def move(self, x: float | None = None, y: float | None = None, z: float | None = None):
         """This method will be used for moving the assembly.
@@ -276,9 +559,16 @@ class Assembly:
             y: the amount the assembly should be moved by along the y axis.
             z: the amount the assembly should be moved by along the z axis
         """
-
-        for part in self.parts.values():
-            part.move(x=x, y=y, z=z)
+        box = self._bounding_box if self._bounding_box_parts is self.parts else None
+        with self._move_parts():
+            for part in self.parts.values():
+                part.move(x=x, y=y, z=z)
+        if box is not None and self.parts:
+            # Every part moved by the same amount, so does the bounding box.
+            for move, low, high in ((x, LEFT, RIGHT), (y, FRONT, BACK), (z, BOTTOM, TOP)):
+                if move is not None:
+                    box[low] = snap(box[low] + move)
+                    box[high] = snap(box[high] + move)
 
     def at(
         self,
@@ -309,28 +599,32 @@ class Assembly:
             msg = "Cannot specify both min_z and center_z"
             raise ValueError(msg)
 
+        bounding_box = self.bounding_box
         x_move, y_move, z_move = None, None, None
 
         if min_x is not None:
-            x_move = min_x - self.bounding_box[LEFT]
+            x_move = min_x - bounding_box[LEFT]
         if min_y is not None:
-            y_move = min_y - self.bounding_box[FRONT]
+            y_move = min_y - bounding_box[FRONT]
         if min_z is not None:
-            z_move = min_z - self.bounding_box[BOTTOM]
+            z_move = min_z - bounding_box[BOTTOM]
         if center_x is not None:
-            x_move = center_x - self.bounding_box[LEFT] / 2
+            x_move = center_x - bounding_box[LEFT] / 2
         if center_y is not None:
-            y_move = center_y - self.bounding_box[FRONT] / 2
+            y_move = center_y - bounding_box[FRONT] / 2
         if center_z is not None:
-            z_move = center_z - self.bounding_box[BOTTOM] / 2
+            z_move = center_z - bounding_box[BOTTOM] / 2
 
-        for part in self.parts.values():
-            if x_move is not None:
-                part.at(x=x_move + part.position[0])
-            if y_move is not None:
-                part.at(y=y_move + part.position[1])
-            if z_move is not None:
-                part.at(z=z_move + part.position[2])
+        with self._move_parts():
+            for part in self.parts.values():
+                if x_move is not None:
+                    part.at(x=x_move + part.position[0])
+                if y_move is not None:
+                    part.at(y=y_move + part.position[1])
+                if z_move is not None:
+                    part.at(z=z_move + part.position[2])
+        # The parts are placed relative to their position, which does not have to match their bounds.
+        self._bounding_box = None
 
     def add(self, part, suggested_name: str | None = None, *, external_subtract: bool = False):
         """This adds a part into the assembly.
@@ -355,6 +649,8 @@ class Assembly:
                 msg = f"Part with name/id {part_name} already in parts catalogue."
                 raise KeyError(msg)
             self.parts[part_name] = part
+            part._assemblies.append(self)
+            self._part_bounds_changed(None, part.bounding_box)
             if external_subtract:
                 self.external_features.append(part.external_features)
             return part_name
@@ -473,40 +769,19 @@ class Assembly:
         """
         Rotate the front and the left while holding the top where it currently is. Of all the parts in an assembly.
         """
-        back = self.bounding_box[BACK]
-        for part in self.parts.values():
-            x = part.position[0] + (part.x_max - part.x_min) / 2
-            y = part.position[1] + (part.y_max - part.y_min) / 2
-            x, y = back - y, x
-            part.rotate_freeze_top()
-            part.position[0] = x - (part.x_max - part.x_min) / 2
-            part.position[1] = y - (part.y_max - part.y_min) / 2
+        self.rotate("z")
 
     def rotate_freeze_left(self):
         """
         Rotate the top and front while holding the left where it currently is. Of all the parts in an assembly.
         """
-        top = self.bounding_box[TOP]
-        for part in self.parts.values():
-            y = part.position[1] + (part.y_max - part.y_min) / 2
-            z = part.position[2] + (part.z_max - part.z_min) / 2
-            y, z = top - z, y
-            part.rotate_freeze_left()
-            part.position[1] = y - (part.y_max - part.y_min) / 2
-            part.position[2] = z - (part.z_max - part.z_min) / 2
+        self.rotate("x")
 
     def rotate_freeze_front(self):
         """
         Rotate the left and top while holding the front where it currently is. Of all the parts in an assembly.
         """
-        right = self.bounding_box[RIGHT]
-        for part in self.parts.values():
-            x = part.position[0] + (part.x_max - part.x_min) / 2
-            z = part.position[2] + (part.z_max - part.z_min) / 2
-            x, z = z, right - x
-            part.rotate_freeze_front()
-            part.position[0] = x - (part.x_max - part.x_min) / 2
-            part.position[2] = z - (part.z_max - part.z_min) / 2
+        self.rotate("y")
 
     def rotate(self, actions: str):
         """Rotate the assembly several times.
@@ -515,24 +790,48 @@ class Assembly:
         `rotate_freeze_top`, and two `rotate_freeze_left`.
         Where rotate_freeze_<side> results in one 90degrees counter clock wise rotations on the side.
 
+        The actions are combined into one rotation and one shift that is applied to all the parts at once.
+
         Args:
             actions: This is a string specifying rotations.
 
         Raises:
             ValueError: When the given actions contains a string that is non x, y, or z.
         """
-        for action in actions:
-            match action.lower():
-                case "x":
-                    self.rotate_freeze_left()
-                case "y":
-                    self.rotate_freeze_front()
-                case "z":
-                    self.rotate_freeze_top()
-                case _:
-                    msg = f"""The actions permissable by rotate are 'x', 'y' or 'z'.
-                            {action} is not one of the permissable actions."""
-                    raise ValueError(msg)
+        matrix = rotation_matrix(actions)
+        if not self.parts:
+            return
+        box = self.bounding_box
+        low = [box[LEFT], box[FRONT], box[BOTTOM]]
+        high = [box[RIGHT], box[BACK], box[TOP]]
+
+        # Every action rotates the centers of the parts around an axis and shifts them back into the bounding box,
+        # the shift is along the axis that the rotation turned negative.
+        shift = np.zeros(3)
+        for action in actions.lower():
+            rotation = np.array(ROTATIONS[action])
+            shift = rotation @ shift + (rotation == -1) @ np.array(high)
+            axes = axis_order(ROTATIONS[action])
+            low = [low[axis] for axis in axes]
+            high = [high[axis] for axis in axes]
+
+        parts = list(self.parts.values())
+        positions = np.array([part.position for part in parts], dtype=float)
+        sizes = np.array(
+            [(part.x_max - part.x_min, part.y_max - part.y_min, part.z_max - part.z_min) for part in parts]
+        )
+        centers = (positions + sizes / 2) @ np.array(matrix).T + shift
+        positions = centers - sizes[:, list(axis_order(matrix))] / 2
+
+        rotated = normalize(actions)
+        with self._move_parts():
+            for part, position in zip(parts, positions.tolist(), strict=True):
+                part.rotate(rotated)
+                part.position[:] = [snap(value) for value in position]
+                part._bounds_changed()
+        # Rotating a part swaps its bounds along the axes, the bounds of the assembly swap the same way.
+        self._bounding_box = dict(zip((LEFT, FRONT, BOTTOM, RIGHT, BACK, TOP), low + high, strict=True))
+        self._bounding_box_parts = self.parts
 
     def combine_all_assemblies(self, new_name: str | None = None, path: Path | None = None):
         """
@@ -551,6 +850,8 @@ class Assembly:
         else:
             assembly_out = Assembly(name=self.name)
         assembly_out.parts = total_parts
+        for part in total_parts.values():
+            part._assemblies.append(assembly_out)
         if path:
             assembly_out._base_path = path
         else:
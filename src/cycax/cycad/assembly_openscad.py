@@ -16,6 +16,8 @@ class AssemblyOpenSCAD(AssemblyEngine):
         config: Configuration for the OpenSCAD assembly engine.
     """
 
+    part_formats = (("STL",),)
+
     def __init__(self, name: str, config: dict | None = None) -> None:
         self.name = name
         self._base_path = Path(".")
@@ -2,6 +2,10 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import typing
+
+from cycax.cycad.features import feature_key
+
 
 class BeveledEdge:
     """This class will store data relating to the rounding of edges on a cube.
@@ -14,6 +18,9 @@ class BeveledEdge:
         bound2: The bound of the second axis.
     """
 
+    __slots__ = ("axis1", "axis2", "bound1", "bound2", "depth", "edge_type", "side", "size")
+    _fields = ("edge_type", "axis1", "bound1", "axis2", "bound2", "size", "side", "depth")
+
     def __init__(
         self,
         edge_type: str,
@@ -34,6 +41,18 @@ class BeveledEdge:
         self.side = side
         self.depth = depth
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BeveledEdge):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def key(self) -> typing.Hashable:
+        """The value identity of the beveled edge, see cycax.cycad.features.feature_key."""
+        return feature_key(self.export())
+
     def export(self) -> dict:
         """
         This will create a dictionary of the rectangle cut out that can be used for the JSON.
@@ -45,6 +64,6 @@ class BeveledEdge:
         dict_edge = {}
         dict_edge["name"] = "beveled_edge"
         dict_edge["type"] = "cut"
-        for key, value in vars(self).items():
-            dict_edge[key] = value
+        for key in self._fields:
+            dict_edge[key] = getattr(self, key)
         return dict_edge
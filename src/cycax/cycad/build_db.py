@@ -0,0 +1,306 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Build records in a local SQLite database, one database in the build directory.
+
+Every build of a target file by an engine is recorded with the hash of its input, the engine and its config,
+the outputs with their hashes, the duration, the peak RSS and the status.
+The record is only committed when the build ends, a build that raises or does not create its outputs
+is recorded as failed. A target is fresh when its last build succeeded with the same input hash
+and its outputs are unchanged.
+
+Files are hashed with xxHash in chunks, the digests are cached by the path, size, modification time and inode
+of the file. An unchanged file is not read again, in this process or, through the database, in a later build.
+"""
+
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import xxhash
+
+try:
+    import resource
+except ImportError:
+    # The resource module is not available on Windows, the peak RSS is then not recorded.
+    resource = None
+
+DATABASE_NAME = ".cycax_build.sqlite"
+# Files are read and hashed this many bytes at a time.
+CHUNK_SIZE = 1 << 20
+SUCCESS = "success"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id INTEGER PRIMARY KEY,
+    target TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    config TEXT NOT NULL,
+    outputs TEXT NOT NULL,
+    started REAL NOT NULL,
+    duration REAL NOT NULL,
+    peak_rss INTEGER,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS builds_target ON builds (target, id);
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+
+# The digests of the files hashed by this process, by path, with the stat key of the file when it was hashed.
+_digests: dict[str, tuple[tuple[int, int, int], str]] = {}
+
+
+def _salted(digest: str, salt: str) -> str:
+    """Mix build settings into a hash."""
+    if not salt:
+        return digest
+    return xxhash.xxh3_128_hexdigest(f"{digest}:{salt}".encode())
+
+
+def _stat_key(file_path: Path) -> tuple[int, int, int]:
+    """The size, modification time and inode of a file, these change when the file is written."""
+    stat = file_path.stat()
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def content_hash(content: bytes, salt: str = "") -> str:
+    """Hash the input of a build.
+
+    Args:
+        content: The input, e.g. the part specification.
+        salt: Build settings that change the output, e.g. the quality, mixed into the hash.
+
+    Returns:
+        An xxHash (XXH3 128 bit) in hexadecimal format.
+    """
+    return _salted(xxhash.xxh3_128_hexdigest(content), salt)
+
+
+def stream_hash(file_path: Path) -> str:
+    """Hash a file, the file is read in chunks of CHUNK_SIZE.
+
+    Args:
+        file_path: The file.
+
+    Returns:
+        The same hash as content_hash of the content of the file.
+    """
+    digest = xxhash.xxh3_128()
+    with file_path.open("rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_hash(file_path: Path, salt: str = "") -> str:
+    """Hash a file, the file is only read when it changed since this process last hashed it.
+
+    Args:
+        file_path: The file.
+        salt: Build settings mixed into the hash, see content_hash.
+
+    Returns:
+        The same hash as content_hash of the content of the file.
+    """
+    key = _stat_key(file_path)
+    cached = _digests.get(str(file_path))
+    if cached is None or cached[0] != key:
+        cached = (key, stream_hash(file_path))
+        _digests[str(file_path)] = cached
+    return _salted(cached[1], salt)
+
+
+def _peak_rss() -> int | None:
+    """The peak resident set size in kB of this process or any of its finished child processes."""
+    if resource is None:
+        return None
+    return max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+
+
+class BuildRecord:
+    """The outputs of a running build, see BuildDatabase.build.
+
+    Args:
+        hasher: Hashes the output files.
+
+    Attributes:
+        outputs: The file and the hash of every output.
+        missing: The outputs the build did not create.
+    """
+
+    def __init__(self, hasher=file_hash):
+        self._hasher = hasher
+        self.outputs = []
+        self.missing = []
+
+    def add_output(self, file_path: Path):
+        """Add a file that the build created, the build fails when the file does not exist.
+
+        Args:
+            file_path: The output file.
+        """
+        if file_path.exists():
+            self.outputs.append({"file": str(file_path), "hash": self._hasher(file_path)})
+        else:
+            self.missing.append(str(file_path))
+
+
+class BuildDatabase:
+    """The build records of the parts built in a directory.
+
+    Use it as a context manager to close the connection to the database.
+
+    Args:
+        directory: The build directory, the database is stored in it as DATABASE_NAME.
+    """
+
+    def __init__(self, directory: Path):
+        self.file_path = Path(directory) / DATABASE_NAME
+        # Engines that build in parallel processes share the database, wait on each other's writes.
+        self._connection = sqlite3.connect(self.file_path, timeout=30)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the connection to the database."""
+        self._connection.close()
+
+    def is_fresh(self, target: Path, input_hash: str) -> bool:
+        """Check if a target is up to date.
+
+        Args:
+            target: The file that the build creates.
+            input_hash: The hash of the input of the build, see content_hash.
+
+        Returns:
+            True when the last build of the target succeeded with the same input and the outputs are unchanged.
+        """
+        row = self._connection.execute(
+            "SELECT input_hash, outputs, status FROM builds WHERE target = ? ORDER BY id DESC LIMIT 1",
+            (str(target),),
+        ).fetchone()
+        if row is None or row["status"] != SUCCESS or row["input_hash"] != input_hash:
+            return False
+        for output in json.loads(row["outputs"]):
+            output_file = Path(output["file"])
+            if not output_file.exists() or self.file_hash(output_file) != output["hash"]:
+                return False
+        return True
+
+    def file_hash(self, file_path: Path, salt: str = "") -> str:
+        """Hash a file, the digest is stored in the database and the file is only read again when it changed.
+
+        Args:
+            file_path: The file.
+            salt: Build settings mixed into the hash, see content_hash.
+
+        Returns:
+            The same hash as content_hash of the content of the file.
+        """
+        key = _stat_key(file_path)
+        cached = _digests.get(str(file_path))
+        if cached is None or cached[0] != key:
+            row = self._connection.execute(
+                "SELECT digest FROM file_hashes WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                (str(file_path), *key),
+            ).fetchone()
+            if row is None:
+                cached = (key, stream_hash(file_path))
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, inode, digest) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (str(file_path), *key, cached[1]),
+                    )
+            else:
+                cached = (key, row["digest"])
+            _digests[str(file_path)] = cached
+        return _salted(cached[1], salt)
+
+    @contextmanager
+    def build(self, target: Path, input_hash: str, engine: str, config: dict | None = None):
+        """Record a build of a target, the record is committed when the build ends.
+
+        The build is recorded as failed when it raises an exception or when an output is missing.
+        The target is removed before the build, a file left by an earlier build cannot count as its output.
+
+        Args:
+            target: The file that the build creates.
+            input_hash: The hash of the input of the build, see content_hash.
+            engine: The name of the engine.
+            config: The engine config.
+
+        Yields:
+            A BuildRecord to add the outputs to.
+        """
+        Path(target).unlink(missing_ok=True)
+        record = BuildRecord(self.file_hash)
+        started = time.time()
+        start = time.perf_counter()
+        status = FAILED
+        try:
+            yield record
+            if not record.missing:
+                status = SUCCESS
+        finally:
+            with self._connection:
+                self._connection.execute(
+                    "INSERT INTO builds (target, input_hash, engine, config, outputs, started, duration, peak_rss, "
+                    "status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        str(target),
+                        input_hash,
+                        engine,
+                        json.dumps(config or {}, sort_keys=True, default=str),
+                        json.dumps(record.outputs),
+                        started,
+                        time.perf_counter() - start,
+                        _peak_rss(),
+                        status,
+                    ),
+                )
+
+    def history(self, target: Path | None = None) -> list[dict]:
+        """The recorded builds, oldest first.
+
+        Args:
+            target: Only the builds of this target, all builds when not given.
+
+        Returns:
+            The build records, the config and the outputs are decoded from JSON.
+        """
+        if target is None:
+            rows = self._connection.execute("SELECT * FROM builds ORDER BY id").fetchall()
+        else:
+            rows = self._connection.execute(
+                "SELECT * FROM builds WHERE target = ? ORDER BY id", (str(target),)
+            ).fetchall()
+        records = []
+        for row in rows:
+            record = dict(row)
+            record["config"] = json.loads(record["config"])
+            record["outputs"] = json.loads(record["outputs"])
+            records.append(record)
+        return records
@@ -5,10 +5,9 @@
 from __future__ import annotations
 
 import copy
-import json
 import logging
 import warnings
-from collections import namedtuple
+from functools import cached_property
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -23,17 +22,42 @@ from cycax.cycad.features import (
     Feature,
     Holes,
     NutCutOut,
+    Pattern,
     RectangleAddOn,
     RectangleCutOut,
     Sphere,
+    unique_features,
 )
-from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP, Location
+from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP, Coordinate, Location, snap
+from cycax.cycad.optimize import optimize_spec
+from cycax.cycad.orientation import axis_order, normalize, rotation_matrix
+from cycax.cycad.quality import apply_quality
+from cycax.cycad.serialize import BINARY_SUFFIX, JSON_SUFFIX, file_state, save_spec
 from cycax.cycad.slot import Slot
+from cycax.cycad.spatial import FeatureIndex
+from cycax.cycad.validate import DEFAULT_MIN_WALL, validate_part
 
 if TYPE_CHECKING:
     from cycax.cycad.assembly import Assembly
 
 
+class _Bound:
+    """A side of the bounding box of a part, setting it marks the cached bounding box and center as stale."""
+
+    def __set_name__(self, owner, name: str):
+        self.attribute = f"_{name}"
+
+    def __get__(self, part, owner=None) -> float:
+        if part is None:
+            return self
+        return getattr(part, self.attribute)
+
+    def __set__(self, part, value: float):
+        old = part.bounding_box
+        setattr(part, self.attribute, snap(value))
+        part._bounds_changed(old)
+
+
 class CycadPart(Location):
     """Define a Part in CyCAd.
 
@@ -51,6 +75,13 @@ class CycadPart(Location):
 
     """
 
+    x_min = _Bound()  # Location.Left
+    y_min = _Bound()  # Location.Front
+    z_min = _Bound()  # Location.Bottom
+    x_max = _Bound()  # Location.Right
+    y_max = _Bound()  # Location.Back
+    z_max = _Bound()  # Location.Top
+
     def __init__(
         self,
         x: float,
@@ -67,12 +98,6 @@ class CycadPart(Location):
     ):
         super().__init__(x, y, z, side)
         self._name: str = ""
-        self.left = LeftSide(self)
-        self.right = RightSide(self)
-        self.top = TopSide(self)
-        self.bottom = BottomSide(self)
-        self.front = FrontSide(self)
-        self.back = BackSide(self)
 
         self._base_path = None
         self.part_no = part_no.strip().replace("-", "_").lower().replace(" ", "_")
@@ -81,13 +106,19 @@ class CycadPart(Location):
         self.z_size = z_size
         self.features = []  # Stores all the holes to be cut
         self.external_features = []
-        self.x_min: float = 0.0  # Location.Left
-        self.y_min: float = 0.0  # Location.Front
-        self.z_min: float = 0.0  # Location.Bottom
-        self.x_max: float = self.x_size  # Location.Right
-        self.y_max: float = self.y_size  # Location.Back
-        self.z_max: float = self.z_size  # Location.Top
-        self.bounding_box = {}
+        self._feature_index = None
+        self._feature_index_state = None
+        self._specs = {}
+        self._saved = None  # The file, spec and file state of the last save.
+        self._bounding_box = None
+        self._center = None
+        self._assemblies = []  # The assemblies that keep track of the bounds of this part.
+        self._x_min: float = 0.0
+        self._y_min: float = 0.0
+        self._z_min: float = 0.0
+        self._x_max: float = self.x_size
+        self._y_max: float = self.y_size
+        self._z_max: float = self.z_size
         self.position = [0.0, 0.0, 0.0]
         self.rotation = []
         self.final_location = False
@@ -101,6 +132,31 @@ class CycadPart(Location):
             assembly.add(self)
             # Assembly will set: part._base_path == assembly._base_path
 
+    # The sides are only made when used, most parts only use a few of their sides.
+    @cached_property
+    def left(self) -> LeftSide:
+        return LeftSide(self)
+
+    @cached_property
+    def right(self) -> RightSide:
+        return RightSide(self)
+
+    @cached_property
+    def top(self) -> TopSide:
+        return TopSide(self)
+
+    @cached_property
+    def bottom(self) -> BottomSide:
+        return BottomSide(self)
+
+    @cached_property
+    def front(self) -> FrontSide:
+        return FrontSide(self)
+
+    @cached_property
+    def back(self) -> BackSide:
+        return BackSide(self)
+
     def definition(self):
         """This method will be ovedridden to do a calculation."""
         pass
@@ -187,7 +243,7 @@ class CycadPart(Location):
     ):
         if centered:
             if (
-                x - x_size / 2 < self.x_size
+                x - x_size / 2 < self.x_min
                 or x + x_size / 2 > self.x_max
                 or y - y_size / 2 < self.y_min
                 or y + y_size / 2 > self.y_max
@@ -196,7 +252,7 @@ class CycadPart(Location):
             ):
                 warnings.warn("This rectangle cutout may break the mesh of the CycadPart.", stacklevel=2)
         elif (
-            x < self.x_size
+            x < self.x_min
             or x + x_size > self.x_max
             or y < self.y_min
             or y + y_size > self.y_max
@@ -259,6 +315,42 @@ class CycadPart(Location):
         cylinder = Cylinder(side=side, x=x, y=y, z=z, diameter=diameter, height=height)
         self.features.append(cylinder)
 
+    def make_hole_pattern(
+        self,
+        x: float,
+        y: float,
+        z: float,
+        side: str,
+        diameter: float,
+        depth: float,
+        step1: tuple[float, float, float],
+        count1: int,
+        step2: tuple[float, float, float] = (0.0, 0.0, 0.0),
+        count2: int = 1,
+        *,
+        kind: str = "grid",
+        mask: list[tuple[int, int]] | None = None,
+    ):
+        """Make a pattern of holes, stored as one feature instead of a feature per hole.
+
+        Args:
+            x: Position of the first hole on X-axis.
+            y: Position of the first hole on Y-axis.
+            z: Position of the first hole on Z-axis.
+            side: The side of the part the holes will be made in.
+            diameter: The diameter of the holes.
+            depth: The depth of the holes.
+            step1: The (x, y, z) between the columns, or from the center to the first hole of a polar pattern.
+            count1: The number of columns, or the number of holes of a polar pattern.
+            step2: The (x, y, z) between the rows, or the second axis of a polar pattern.
+            count2: The number of rows.
+            kind: The type of pattern, grid or polar.
+            mask: The (column, row) of the holes to leave out.
+        """
+        temp_hole = Holes(side=side, x=x, y=y, z=z, diameter=diameter, depth=depth)
+        pattern = Pattern(temp_hole, step1=step1, count1=count1, step2=step2, count2=count2, kind=kind, mask=mask)
+        self.features.append(pattern)
+
     def make_slot(
         self,
         x: float,
@@ -298,13 +390,9 @@ class CycadPart(Location):
         )
         # This will add it to the relevant array
         if external_subtract:
-            self.external_features.append(temp_slot.hole_left)
-            self.external_features.append(temp_slot.hole_right)
-            self.external_features.append(temp_slot.rectangle)
+            self.external_features.append(temp_slot.feature)
         else:
-            self.features.append(temp_slot.hole_left)
-            self.features.append(temp_slot.hole_right)
-            self.features.append(temp_slot.rectangle)
+            self.features.append(temp_slot.feature)
 
     def make_nut(
         self,
@@ -439,19 +527,44 @@ class CycadPart(Location):
         )
         self.features.append(temp_rect)
 
-    def make_bounding_box(self):
-        """This bounding box will be used to help keep track of and update the bounds.
-        This method is used extensively in assembly to keep track of where the box "should" be after moving it around.
+    @property
+    def bounding_box(self) -> dict:
+        """The plane of each side of the part, used to keep track of where the part is after moving it around.
+
+        The bounding box is cached until the bounds of the part change, do not modify it.
         """
+        if self._bounding_box is None:
+            self._bounding_box = {
+                TOP: self._z_max,
+                BOTTOM: self._z_min,
+                LEFT: self._x_min,
+                RIGHT: self._x_max,
+                FRONT: self._y_min,
+                BACK: self._y_max,
+            }
+        return self._bounding_box
+
+    def make_bounding_box(self) -> dict:
+        """Recalculate the bounding box.
+
+        The bounding box is kept up to date by move, at and rotate, this is only needed after changing the
+        position directly.
+        """
+        self._bounds_changed()
+        return self.bounding_box
 
-        self.bounding_box = {
-            "TOP": self.z_max,
-            "BOTTOM": self.z_min,
-            "LEFT": self.x_min,
-            "RIGHT": self.x_max,
-            "FRONT": self.y_min,
-            "BACK": self.y_max,
-        }
+    def _bounds_changed(self, old: dict | None = None):
+        """Mark the cached bounding box and center as stale.
+
+        Args:
+            old: The bounding box before the change, the assemblies of the part are told how the part moved.
+                None when only the position changed.
+        """
+        self._bounding_box = None
+        self._center = None
+        if old is not None:
+            for assembly in self._assemblies:
+                assembly._part_bounds_changed(old, self.bounding_box)
 
     def move(self, x: float | None = None, y: float | None = None, z: float | None = None):
         """This method will be used for moving the part.
@@ -462,24 +575,25 @@ class CycadPart(Location):
             z: the amount the object should be moved by along the z axis
         """
 
-        x_size = self.x_max - self.x_min
-        y_size = self.y_max - self.y_min
-        z_size = self.z_max - self.z_min
+        old = self.bounding_box
+        x_size = self._x_max - self._x_min
+        y_size = self._y_max - self._y_min
+        z_size = self._z_max - self._z_min
 
         if x is not None:
-            self.x_min = self.x_min + x
-            self.x_max = self.x_min + x_size
-            self.position[0] = self.position[0] + x
+            self._x_min = snap(self._x_min + x)
+            self._x_max = snap(self._x_min + x_size)
+            self.position[0] = snap(self.position[0] + x)
         if y is not None:
-            self.y_min = self.y_min + y
-            self.y_max = self.y_min + y_size
-            self.position[1] = self.position[1] + y
+            self._y_min = snap(self._y_min + y)
+            self._y_max = snap(self._y_min + y_size)
+            self.position[1] = snap(self.position[1] + y)
         if z is not None:
-            self.z_min = self.z_min + z
-            self.z_max = self.z_min + z_size
-            self.position[2] = self.position[2] + z
+            self._z_min = snap(self._z_min + z)
+            self._z_max = snap(self._z_min + z_size)
+            self.position[2] = snap(self.position[2] + z)
 
-        self.make_bounding_box()
+        self._bounds_changed(old)
 
     def at(self, x: float | None = None, y: float | None = None, z: float | None = None):
         """Place part at the exact provided coordinates.
@@ -489,22 +603,25 @@ class CycadPart(Location):
             y: The value to which y needs to be moved to on the axis.
             z: The value to which z needs to be moved to on the axis.
         """
-        x_size = self.x_max - self.x_min
-        y_size = self.y_max - self.y_min
-        z_size = self.z_max - self.z_min
+        old = self.bounding_box
+        x_size = self._x_max - self._x_min
+        y_size = self._y_max - self._y_min
+        z_size = self._z_max - self._z_min
 
         if x is not None:
-            self.x_min = x
-            self.x_max = x + x_size
-            self.position[0] = x
+            self._x_min = snap(x)
+            self._x_max = snap(x + x_size)
+            self.position[0] = snap(x)
         if y is not None:
-            self.y_min = y
-            self.y_max = y + y_size
-            self.position[1] = y
+            self._y_min = snap(y)
+            self._y_max = snap(y + y_size)
+            self.position[1] = snap(y)
         if z is not None:
-            self.z_min = z
-            self.z_max = z + z_size
-            self.position[2] = z
+            self._z_min = snap(z)
+            self._z_max = snap(z + z_size)
+            self.position[2] = snap(z)
+
+        self._bounds_changed(old)
 
     def insert_feature(self, feature: Feature):
         """This method will be used for inserting the hole into an object.
@@ -568,22 +685,39 @@ class CycadPart(Location):
             raise ValueError(msg)
         return self._base_path / self.part_no
 
+    @property
+    def feature_index(self) -> FeatureIndex:
+        """Spatial index over the features of the part, for queries like the features in a box or on a side.
+
+        The index is built on first use and rebuilt when features were added or removed since.
+        Features are in the coordinates of the part, before it is moved or rotated.
+        """
+        state = (id(self.features), len(self.features))
+        if self._feature_index is None or self._feature_index_state != state:
+            self._feature_index = FeatureIndex(self.features)
+            self._feature_index_state = state
+        return self._feature_index
+
     @property
     def center(self) -> tuple[float, float, float]:
         """Return the center of a part."""
-        centered_x = self.position[0] + self.x_max / 2
-        centered_y = self.position[1] + self.y_max / 2
-        centered_z = self.position[2] + self.z_max / 2
-        coordinate = namedtuple("Coordinate", ["x", "y", "z"])
-        return coordinate(x=centered_x, y=centered_y, z=centered_z)
+        if self._center is None:
+            self._center = Coordinate(
+                x=self.position[0] + self._x_max / 2,
+                y=self.position[1] + self._y_max / 2,
+                z=self.position[2] + self._z_max / 2,
+            )
+        return self._center
 
-    def save(self, path: Path | str | None = None) -> Path:
+    def save(self, path: Path | str | None = None, *, optimize: bool = True, binary: bool = False) -> Path:
         """
-        Save the part specification to a JSON file.
+        Save the part specification to a JSON or binary spec file.
 
         Args:
             path: Base path for storing part information.
                 A directory with the part_no will be created in this path.
+            optimize: Remove the features that cannot change the part before saving, see cycax.cycad.optimize.
+            binary: Save the spec in the compact binary format, see cycax.cycad.serialize.
         """
         if path is None:
             if self._base_path is None:
@@ -598,10 +732,15 @@ class CycadPart(Location):
 
         dir_name = self.path  # Using the path property to ensure it exists
         dir_name.mkdir(exist_ok=True)
-        file_path = dir_name / f"{self.part_no}.json"
+        file_path = dir_name / f"{self.part_no}{BINARY_SUFFIX if binary else JSON_SUFFIX}"
         file_path = file_path.expanduser().resolve().absolute()
-        file_path.write_text(json.dumps(self.export()))
-        logging.info("Saved part '%s' to %s", self.part_no, file_path)
+        spec = self.spec(optimize=optimize)
+        # The spec is not serialized again while neither the spec nor the saved file changed.
+        saved = self._saved
+        if saved is None or saved[0] != file_path or saved[1] is not spec or saved[2] != file_state(file_path):
+            save_spec(file_path, spec, binary=binary)
+            self._saved = (file_path, spec, file_state(file_path))
+            logging.info("Saved part '%s' to %s", self.part_no, file_path)
         return file_path
 
     def export(self) -> dict:
@@ -639,6 +778,27 @@ class CycadPart(Location):
             dict_out["subtract"].append(item.export())
         return dict_out
 
+    def spec(self, *, optimize: bool = True) -> dict:
+        """The specification that the engines build, shared by all the engines that build the part.
+
+        The part is exported on every call, so the specification always holds the current size and features.
+        The optimizer only runs again when the export changed, while the part is not changed the same specification
+        is returned. The specification is shared, do not change it.
+
+        Args:
+            optimize: Remove the features that cannot change the part, see cycax.cycad.optimize.
+
+        Returns:
+            The exported part, optimized when asked for.
+        """
+        export = self.export()
+        cached = self._specs.get(optimize)
+        if cached is None or cached[0] != export:
+            spec = optimize_spec(export)[0] if optimize else export
+            cached = (export, spec)
+            self._specs[optimize] = cached
+        return cached[1]
+
     def beveled_edge(self, edge_type: str, side1: str, side2: str, size: float):
         """This method will shape a edge of a CycadPart.
 
@@ -649,7 +809,6 @@ class CycadPart(Location):
             size: The radius of a round when rounding or the length of a chamfer.
         """
         edge = []
-        self.make_bounding_box()
         for side in (side1, side2):
             edge.append(
                 {
@@ -699,7 +858,7 @@ class CycadPart(Location):
             )
         )
 
-    def render(self, engine: str = "Preview3D", engine_config: dict | None = None) -> dict:
+    def render(self, engine: str = "Preview3D", engine_config: dict | None = None, quality: str | None = None) -> dict:
         """This class will render the necessary diagrams when called with the following methods.
 
         It is invoked by CycadPart and can be called:
@@ -708,6 +867,8 @@ class CycadPart(Location):
         Args:
             engine: Name of the engine to use.
             engine_config: Configuration passed on to the PartEngine. It is engine specific.
+            quality: The quality profile, one of preview, default or production.
+                Preview3D uses preview and the other engines default when not given.
         """
 
         _eng_lower = engine.lower()
@@ -717,15 +878,18 @@ class CycadPart(Location):
         elif _eng_lower == "openscad":
             if not engine_config:
                 engine_config = {"stl": True}
+            engine_config = apply_quality(engine_config, quality)
             part_engine = PartEngineOpenSCAD(name=self.part_no, path=self._base_path, config=engine_config)
 
         elif _eng_lower == "preview3d":
-            part_engine = PartEngineOpenSCAD(name=self.part_no, path=self._base_path, config={"stl": False})
+            engine_config = apply_quality({"stl": False}, quality or "preview")
+            part_engine = PartEngineOpenSCAD(name=self.part_no, path=self._base_path, config=engine_config)
 
         elif _eng_lower == "freecad":
             if engine_config is None:
                 engine_config = {}
                 engine_config["out_formats"] = [("png", "ALL"), ("STL",), ("DXF", TOP)]
+            engine_config = apply_quality(engine_config, quality)
             part_engine = PartEngineFreeCAD(name=self.part_no, path=self._base_path, config=engine_config)
 
         else:
@@ -745,6 +909,17 @@ class CycadPart(Location):
         """
         return engine.create(self)
 
+    def validate(self, min_wall: float = DEFAULT_MIN_WALL) -> dict:
+        """Check all the features of the part, see cycax.cycad.validate.
+
+        Args:
+            min_wall: The thinnest wall in mm that is allowed around holes.
+
+        Returns:
+            A report with the name of the part and the issues found.
+        """
+        return validate_part(self, min_wall=min_wall)
+
     def build(self, engine: PartEngine) -> list:
         """Build the part with the given PartEngine.
 
@@ -780,10 +955,11 @@ class CycadPart(Location):
 
             else:
                 sequence_n = 0
+                part_no = self.part_no
 
                 while True:
                     sequence_n += 1
-                    suggested_name = f"{self.part_no}_{sequence_n}"
+                    suggested_name = f"{part_no}_{sequence_n}"
                     if suggested_name not in used_names:
                         self._name = suggested_name
                         break
@@ -876,6 +1052,8 @@ class CycadPart(Location):
         Example: `CycadPart.rotate("xxyzyy")` is the same as two `rotate_freeze_front`, `rotate_freeze_left`,
         `rotate_freeze_top`, and two `rotate_freeze_left`.
         Where rotate_freeze_<side> results in one 90degrees counter clock wise rotations on the side.
+        The rotations of the part are kept as the shortest actions that give the same orientation,
+        see cycax.cycad.orientation.
 
         Args:
             actions: This is a string specifying rotations.
@@ -883,45 +1061,33 @@ class CycadPart(Location):
         Raises:
             ValueError: When the given actions contains a string that is non x, y, or z.
         """
-        for action in actions:
-            match action.lower():
-                case "x":
-                    self.rotate_freeze_left()
-                case "y":
-                    self.rotate_freeze_front()
-                case "z":
-                    self.rotate_freeze_top()
-                case _:
-                    msg = f"""The actions permissable by rotate are 'x', 'y' or 'z'.
-                            {action} is not one of the permissable actions."""
-                    raise ValueError(msg)
+        axes = axis_order(rotation_matrix(actions))
+        old = self.bounding_box
+        low = (self._x_min, self._y_min, self._z_min)
+        high = (self._x_max, self._y_max, self._z_max)
+        self._x_min, self._y_min, self._z_min = (low[axis] for axis in axes)
+        self._x_max, self._y_max, self._z_max = (high[axis] for axis in axes)
+        history = "".join(rotation["axis"] for rotation in self.rotation) + actions
+        self.rotation[:] = [{"axis": action, "angle": 90} for action in normalize(history)]
+        self._bounds_changed(old)
 
     def rotate_freeze_top(self):
         """
         This method will rotate the front and the left while holding the top where it currently is.
         """
-        self.rotation.append({"axis": "z", "angle": 90})
-        self.x_max, self.y_max = self.y_max, self.x_max
-        self.x_min, self.y_min = self.y_min, self.x_min
-        self.make_bounding_box()
+        self.rotate("z")
 
     def rotate_freeze_left(self):
         """
         This method will rotate the top and front while holding the left where it currently is.
         """
-        self.rotation.append({"axis": "x", "angle": 90})
-        self.y_max, self.z_max = self.z_max, self.y_max
-        self.y_min, self.z_min = self.z_min, self.y_min
-        self.make_bounding_box()
+        self.rotate("x")
 
     def rotate_freeze_front(self):
         """
         This method will rotate the left and top while holding the front where it currently is.
         """
-        self.rotation.append({"axis": "y", "angle": 90})
-        self.x_max, self.z_max = self.z_max, self.x_max
-        self.x_min, self.z_min = self.z_min, self.x_min
-        self.make_bounding_box()
+        self.rotate("y")
 
     def _final_place(self):
         """
@@ -951,6 +1117,8 @@ class CycadPart(Location):
         This method will be used to merge this part and another part together.
         which have identical sizes but different features.
         This part will receive the features of part2 and part2 its features.
+        Features with the same values are only kept once,
+        part2 receives copies so that moving or rotating one part does not change the features of the other.
 
         Args:
             part2: This part will receive the features present on part1.
@@ -959,14 +1127,10 @@ class CycadPart(Location):
             ValueError: if the sizes of the parts are not identical.
         """
         if self.x_size == part2.x_size and self.y_size == part2.y_size and self.z_size == part2.z_size:
-            for item in part2.features:
-                if item not in self.features:
-                    self.features.append(item)
-            for item in part2.external_features:
-                if item not in self.external_features:
-                    self.external_features.append(item)
-            part2.features = self.features
-            part2.external_features = self.external_features
+            self.features = unique_features(self.features + part2.features)
+            self.external_features = unique_features(self.external_features + part2.external_features)
+            part2.features = copy.deepcopy(self.features)
+            part2.external_features = copy.deepcopy(self.external_features)
         else:
             msg = f"merging {self} and {part2} but they are not of the same size."
             raise ValueError(msg)
@@ -3,12 +3,15 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import logging
+from math import cos, radians, sin
 
-from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP
+from cycax.cycad.features import unique_features
+from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP, snap
 from cycax.cycad.vents import Vent
 
 
 class CycadSide:
+    __slots__ = ("_parent",)
     name = ""
 
     def __init__(self, parent):
@@ -41,6 +44,14 @@ class CycadSide:
         msg = f"_location_calc is Not implemented on {self.name}"
         raise ValueError(msg)
 
+    def _vector_calc(
+        self, pos: tuple[float, float], offset: tuple[float, float], sink: float = 0.0
+    ) -> tuple[float, float, float]:
+        """The (x, y, z) vector of an offset on the side, from pos to pos + offset."""
+        start = self._location_calc(pos=pos, sink=sink)
+        end = self._location_calc(pos=(pos[0] + offset[0], pos[1] + offset[1]), sink=sink)
+        return end[0] - start[0], end[1] - start[1], end[2] - start[2]
+
     def _redefine_surface(self, add: float, sink: float = 0.0):
         """
         Moves the min or max on the object to where it is after and add.
@@ -179,6 +190,86 @@ class CycadSide:
             external_subtract=external_subtract,
         )
 
+    def hole_grid(
+        self,
+        pos: tuple[float, float],
+        diameter: float,
+        spacing: tuple[float, float],
+        count: tuple[int, int],
+        sink: float = 0.0,
+        depth: float | None = None,
+        mask: list[tuple[int, int]] | None = None,
+    ):
+        """Insert a grid of holes into the side, a single row or column is a linear pattern.
+
+        The grid is stored as one pattern feature, not a feature per hole.
+
+        Args:
+            pos: The (x, y) of the first hole.
+            diameter: The diameter of the holes.
+            spacing: The distance between the holes on the (x, y) of the side.
+            count: The number of holes on the (x, y) of the side.
+            sink: The holes can be sunk bellow the surface of the specified side to make pockets.
+            depth: How deep to drill the holes, if not specified will drill the holes all the way through.
+            mask: The (column, row) of the holes to leave out, e.g. [(0, 0)] leaves out the first hole.
+        """
+        _depth = self._depth_check(depth)
+        _location_tuple = self._location_calc(pos=pos, sink=sink)
+        self._parent.make_hole_pattern(
+            x=_location_tuple[0],
+            y=_location_tuple[1],
+            z=_location_tuple[2],
+            side=self.name,
+            diameter=diameter,
+            depth=_depth,
+            step1=self._vector_calc(pos=pos, offset=(spacing[0], 0.0), sink=sink),
+            count1=count[0],
+            step2=self._vector_calc(pos=pos, offset=(0.0, spacing[1]), sink=sink),
+            count2=count[1],
+            mask=mask,
+        )
+
+    def hole_circle(
+        self,
+        pos: tuple[float, float],
+        diameter: float,
+        radius: float,
+        count: int,
+        angle: float = 0.0,
+        sink: float = 0.0,
+        depth: float | None = None,
+        mask: list[int] | None = None,
+    ):
+        """Insert holes evenly spaced on a circle into the side, a polar pattern.
+
+        Args:
+            pos: The (x, y) of the center of the circle.
+            diameter: The diameter of the holes.
+            radius: The radius of the circle the holes are on.
+            count: The number of holes.
+            angle: The angle in degrees of the first hole, measured from the x axis of the side.
+            sink: The holes can be sunk bellow the surface of the specified side to make pockets.
+            depth: How deep to drill the holes, if not specified will drill the holes all the way through.
+            mask: The index of the holes to leave out.
+        """
+        _depth = self._depth_check(depth)
+        axis1 = (radius * cos(radians(angle)), radius * sin(radians(angle)))
+        axis2 = (-axis1[1], axis1[0])
+        _location_tuple = self._location_calc(pos=(pos[0] + axis1[0], pos[1] + axis1[1]), sink=sink)
+        self._parent.make_hole_pattern(
+            x=_location_tuple[0],
+            y=_location_tuple[1],
+            z=_location_tuple[2],
+            side=self.name,
+            diameter=diameter,
+            depth=_depth,
+            step1=self._vector_calc(pos=pos, offset=axis1, sink=sink),
+            count1=count,
+            step2=self._vector_calc(pos=pos, offset=axis2, sink=sink),
+            kind="polar",
+            mask=[(index, 0) for index in mask or []],
+        )
+
     def box(
         self,
         pos: tuple[float, float],
@@ -398,32 +489,32 @@ class CycadSide:
         """
         part1 = self._parent
         side = self.name
-        part1.make_bounding_box()
+        count = len(part1.features)
 
         for feature in part2._final_place():
             if feature.name == "cube":
                 if side == TOP:
-                    if (feature.z - feature.z_size / 2) == part1.bounding_box[TOP]:
+                    if snap(feature.z - feature.z_size / 2) == part1.bounding_box[TOP]:
                         feature.side = TOP
                         part1.insert_feature(feature)
                 elif side == BOTTOM:
-                    if (feature.z + feature.z_size / 2) == part1.bounding_box[BOTTOM]:
+                    if snap(feature.z + feature.z_size / 2) == part1.bounding_box[BOTTOM]:
                         feature.side = BOTTOM
                         part1.insert_feature(feature)
                 elif side == LEFT:
-                    if (feature.x + feature.x_size / 2) == part1.bounding_box[LEFT]:
+                    if snap(feature.x + feature.x_size / 2) == part1.bounding_box[LEFT]:
                         feature.side = LEFT
                         part1.insert_feature(feature)
                 elif side == RIGHT:
-                    if (feature.x - feature.x_size / 2) == part1.bounding_box[RIGHT]:
+                    if snap(feature.x - feature.x_size / 2) == part1.bounding_box[RIGHT]:
                         feature.side = RIGHT
                         part1.insert_feature(feature)
                 elif side == FRONT:
-                    if (feature.y + feature.y_size / 2) == part1.bounding_box[FRONT]:
+                    if snap(feature.y + feature.y_size / 2) == part1.bounding_box[FRONT]:
                         feature.side = FRONT
                         part1.insert_feature(feature)
                 elif side == BACK:
-                    if (feature.y - feature.y_size / 2) == part1.bounding_box[BACK]:
+                    if snap(feature.y - feature.y_size / 2) == part1.bounding_box[BACK]:
                         feature.side = BACK
                         part1.insert_feature(feature)
                 else:
@@ -456,6 +547,9 @@ class CycadSide:
             else:
                 msg = f"Side: {side} is not one of TOP, BOTTOM, LEFT, RIGHT, FRONT, BACK."
                 raise ValueError(msg)
+        # Parts are often subtracted more than once, e.g. from both parts they touch.
+        if len(part1.features) != count:
+            part1.features = unique_features(part1.features)
 
     def level(self, partside2):  # reference to CycadSide results in error
         """
@@ -475,8 +569,6 @@ class CycadSide:
         part2 = partside2._parent
         part1side = self.name
         part2side = partside2.name
-        part2.make_bounding_box()
-        part1.make_bounding_box()
         to_here = part2.bounding_box[part2side]
 
         if part1side == BOTTOM:
@@ -498,10 +590,9 @@ class CycadSide:
             msg = f"Side: {part1side} is not one of TOP, BOTTOM, LEFT, RIGHT, FRONT, BACK."
             raise ValueError(msg)
 
-        part1.make_bounding_box()
-
 
 class LeftSide(CycadSide):
+    __slots__ = ()
     name = LEFT
 
     def _location_calc(
@@ -543,6 +634,7 @@ class LeftSide(CycadSide):
 
 
 class RightSide(CycadSide):
+    __slots__ = ()
     name = RIGHT
 
     def _location_calc(
@@ -584,6 +676,7 @@ class RightSide(CycadSide):
 
 
 class TopSide(CycadSide):
+    __slots__ = ()
     name = TOP
 
     def _location_calc(
@@ -625,6 +718,7 @@ class TopSide(CycadSide):
 
 
 class BottomSide(CycadSide):
+    __slots__ = ()
     name = BOTTOM
 
     def _location_calc(
@@ -666,6 +760,7 @@ class BottomSide(CycadSide):
 
 
 class FrontSide(CycadSide):
+    __slots__ = ()
     name = FRONT
 
     def _location_calc(
@@ -707,6 +802,7 @@ class FrontSide(CycadSide):
 
 
 class BackSide(CycadSide):
+    __slots__ = ()
     name = BACK
 
     def _location_calc(
@@ -18,6 +18,8 @@ class AssemblyBuild123d(AssemblyEngine):
         config: Configuration for the Build123d assembly engine.
     """
 
+    part_formats = (("STEP",),)
+
     def __init__(self, name: str, config: dict | None = None) -> None:
         self.name = name
         self._base_path = Path(".")
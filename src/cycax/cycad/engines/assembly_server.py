@@ -9,6 +9,7 @@ from pathlib import Path
 
 from cycax.cycad.client import CycaxServerClient
 from cycax.cycad.engines.base_assembly_engine import AssemblyEngine
+from cycax.cycad.serialize import load_spec
 
 
 class AssemblyServer(AssemblyEngine, CycaxServerClient):
@@ -32,7 +33,7 @@ class AssemblyServer(AssemblyEngine, CycaxServerClient):
             self._base_path = path
 
         # Get the Assembly Specfile.
-        assembly_spec = json.loads(self._json_file.read_text())
+        assembly_spec = load_spec(self._json_file)
         logging.info("Assembly Build")
         # Enrich the Assembly Specfile with the JobID's of the parts.
         for part_seq in range(len(assembly_spec["parts"])):
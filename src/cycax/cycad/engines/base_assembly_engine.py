@@ -5,6 +5,8 @@
 import logging
 from pathlib import Path
 
+from cycax.cycad.serialize import spec_file
+
 
 class AssemblyEngine:
     """Base Class for all AssemblyEngines.
@@ -13,8 +15,11 @@ class AssemblyEngine:
         name: Name of the assembly.
         path: The path where the assembly is stored. Default to current working directory.
         config: Engine specific configuration.
+        part_formats: The file formats the engine needs from the part engines, e.g. (("STL",),).
     """
 
+    part_formats: tuple[tuple[str, ...], ...] = ()
+
     def __init__(self, name: str | None = None, path: Path | None = None, config: dict | None = None):
         self._base_path = None
         self._json_file = None
@@ -41,7 +46,7 @@ class AssemblyEngine:
             logging.error("Engine using a path that does not exists. Path=%s", path)
         self._base_path = path
         name = self.name
-        self._json_file = self._base_path / (name.lower() + ".json")
+        self._json_file = spec_file(self._base_path / (name.lower() + ".json"))
         if not self._json_file.exists():
             raise FileNotFoundError(self._json_file)
 
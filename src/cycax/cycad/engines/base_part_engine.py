@@ -5,6 +5,8 @@
 import logging
 from pathlib import Path
 
+from cycax.cycad.serialize import load_spec, spec_file
+
 
 class PartEngine:
     """Base Class for all PartEngines.
@@ -42,9 +44,28 @@ class PartEngine:
             logging.error("Engine using a path that does not exists. Path=%s", path)
         self._base_path = path
         name = self.name
-        self._json_file = self._base_path / name / f"{name}.json"
+        self._json_file = spec_file(self._base_path / name / f"{name}.json")
+
+    def part_spec(self, part=None) -> dict:
+        """The specification of the part to build.
+
+        The specification is taken from the part when it is given, all the engines that build the part share it and
+        the part does not have to be saved first. Else the saved spec file is read.
+
+        Args:
+            part: The CycadPart to build.
+
+        Returns:
+            The part specification, do not change it.
+
+        Raises:
+            FileNotFoundError: When no part is given and the part was not saved.
+        """
+        if part is not None:
+            return part.spec()
         if not self._json_file.exists():
             raise FileNotFoundError(self._json_file)
+        return load_spec(self._json_file)
 
     def get_appimage(self, name) -> Path | None:
         paths = ["~/Applications", self._base_path]
@@ -61,6 +82,23 @@ class PartEngine:
                 appimage = appimg
         return appimage
 
+    def out_formats(self, default: tuple[str, ...] = ("STL",)) -> set[str]:
+        """The file formats requested in the engine config.
+
+        The config holds a list of tuples, e.g. [("png", "ALL"), ("STL",), ("DXF", TOP)],
+        only the first item of each, the format, is used.
+
+        Args:
+            default: The formats to produce when the config does not request any.
+
+        Returns:
+            The upper case names of the formats to produce.
+        """
+        formats = {str(file_format[0]).upper() for file_format in self.config.get("out_formats", [])}
+        if not formats:
+            formats = {file_format.upper() for file_format in default}
+        return formats
+
     def create(self, part):
         pass
 
@@ -8,6 +8,8 @@
 # 2. The path to the part JSON file; as environmental variable ("CYCAX_JSON")
 # 3. The path to where the output files should be stored; as environmental variable ("CYCAX_CWD")
 # 4. The file types that needs to be generated; as environmental variable ("CYCAX_OUT_FORMATS")
+# 5. Optional, the mesh deflections; as environmental variables ("CYCAX_TOLERANCE" and "CYCAX_ANGULAR_TOLERANCE")
+# 6. Optional, a directory to keep tool solids in as BREP files; as environmental variable ("CYCAX_TOOL_CACHE")
 
 # How to use this file:
 # 1. Open the file up in FreeCAD and run as a Macro.
@@ -16,13 +18,16 @@
 import json
 import logging
 import os
-from math import sqrt
+import zlib
+from itertools import product
+from math import cos, pi, sin, sqrt
 from pathlib import Path
 
 import FreeCAD as App
 import FreeCADGui
 import importDXF
 import importSVG
+import MeshPart
 import Part
 from FreeCAD import Rotation, Vector  # noqa
 from PySide import QtGui
@@ -37,6 +42,38 @@ FRONT = "FRONT"
 BACK = "BACK"
 REAR = "BACK"
 
+# Distance in mm within which an edge is taken to lie on the bounds of a beveled edge.
+EDGE_TOLERANCE = 1e-6
+
+# The direction into the part from each side, as in cycax.cycad.engines.utils.CUT_DIRECTION.
+CUT_DIRECTION = {
+    TOP: (0, 0, -1),
+    BOTTOM: (0, 0, 1),
+    LEFT: (1, 0, 0),
+    RIGHT: (-1, 0, 0),
+    FRONT: (0, 1, 0),
+    BACK: (0, -1, 0),
+}
+
+# The start of a binary spec file, as in cycax.cycad.serialize.BINARY_MAGIC.
+BINARY_MAGIC = b"CYCAXSPEC1\n"
+
+
+def load_definition(in_name: Path) -> dict:
+    """Read a JSON or binary spec file, the same as cycax.cycad.serialize.load_spec."""
+    content = in_name.read_bytes()
+    if not content.startswith(BINARY_MAGIC):
+        return json.loads(content)
+    packed = json.loads(zlib.decompress(content[len(BINARY_MAGIC) :]))
+    definition = packed["values"]
+    for key, table in packed["tables"].items():
+        kinds = [
+            iter([dict(zip(kind["keys"], values, strict=True)) for values in zip(*kind["columns"], strict=True)])
+            for kind in table["kinds"]
+        ]
+        definition[key] = [next(kinds[kind]) for kind in table["order"]]
+    return definition
+
 
 class EngineFreecad:
     """This class will be used in FreeCAD to decode a JSON passed to it.
@@ -44,11 +81,48 @@ class EngineFreecad:
 
     Args:
         base_path: the path where the outputs need to be stored.
+        tolerance: The linear deflection in mm of the STL mesh.
+        angular_tolerance: The angular deflection in radians of the STL mesh.
+        tool_cache: Directory where tool solids are stored as BREP files between runs.
     """
 
-    def __init__(self, base_path: Path):
+    def __init__(
+        self,
+        base_path: Path,
+        tolerance: float = 1e-3,
+        angular_tolerance: float = 0.1,
+        tool_cache: Path | None = None,
+    ):
         self._base_path = base_path
         self.filepath = ""
+        self.tolerance = tolerance
+        self.angular_tolerance = angular_tolerance
+        self.tool_cache = tool_cache
+        self._tools = {}
+
+    def _tool(self, key: tuple, make):
+        """Return a copy of the canonical tool solid for key, the tool is only made once.
+
+        The copy shares the geometry of the tool, only its Placement is set per feature.
+
+        Args:
+            key: The kind of tool followed by its dimensions, e.g. ("nut", 6.2, 2.5).
+            make: Makes the tool, at the origin, when it is not in the cache.
+        """
+        if key not in self._tools:
+            brep_file = None
+            if self.tool_cache:
+                brep_file = Path(self.tool_cache) / ("-".join(str(value) for value in key) + ".brep")
+            if brep_file is not None and brep_file.exists():
+                tool = Part.Shape()
+                tool.importBrep(str(brep_file))
+            else:
+                tool = make()
+                if brep_file is not None:
+                    brep_file.parent.mkdir(parents=True, exist_ok=True)
+                    tool.exportBrep(str(brep_file))
+            self._tools[key] = tool
+        return self._tools[key].copy(False)
 
     def cylinder(self, feature: dict):
         """This method will draw a cylinder when given a dict that contains the necessary dimensions
@@ -127,14 +201,99 @@ class EngineFreecad:
         face = Part.Face(shape)
         return face
 
+    def pattern(self, feature: dict):
+        """This method will make the tool of a pattern at every position and fuse them into one solid.
+
+        The offsets are calculated as in cycax.cycad.engines.utils.pattern_offsets, which cannot be imported here.
+
+        Args:
+            feature: This is the dict that contains the pattern and its tool in "feature".
+        """
+        tool_spec = feature["feature"]
+        if tool_spec["name"] in ("hole", "cylinder_feature"):
+            tool = self.hole(tool_spec)
+        elif tool_spec["name"] == "cube":
+            tool = self.cube(tool_spec)
+        elif tool_spec["name"] == "nut":
+            tool = self.cut_nut(tool_spec)
+        elif tool_spec["name"] == "sphere":
+            tool = self.sphere(tool_spec)
+        elif tool_spec["name"] == "slot":
+            tool = self.slot(tool_spec)
+        else:
+            msg = f"Pattern of {tool_spec['name']} is not supported."
+            raise ValueError(msg)
+
+        step1 = feature["step1"]
+        step2 = feature["step2"]
+        mask = {tuple(position) for position in feature["mask"]}
+        if feature["kind"] == "polar":
+            count = feature["count1"]
+            factors = [
+                (cos(2 * pi * index / count) - 1.0, sin(2 * pi * index / count))
+                for index in range(count)
+                if (index, 0) not in mask
+            ]
+        else:
+            factors = [
+                position
+                for position in product(range(feature["count1"]), range(feature["count2"]))
+                if position not in mask
+            ]
+        shapes = []
+        for factor1, factor2 in factors:
+            offset = Vector(*(factor1 * value1 + factor2 * value2 for value1, value2 in zip(step1, step2, strict=True)))
+            shapes.append(tool.translated(offset))
+        if len(shapes) > 1:
+            return shapes[0].multiFuse(shapes[1:])
+        return shapes[0]
+
+    def _slot_tool(self, length: float, diameter: float, depth: float):
+        """Make a slot along the x axis, centered on the origin and extruded up the z axis."""
+        radius = diameter / 2
+        half = length / 2
+        corners = [
+            Vector(-half, -radius, 0),
+            Vector(half, -radius, 0),
+            Vector(half, radius, 0),
+            Vector(-half, radius, 0),
+        ]
+        edges = [
+            Part.LineSegment(corners[0], corners[1]).toShape(),
+            Part.Arc(corners[1], Vector(half + radius, 0, 0), corners[2]).toShape(),
+            Part.LineSegment(corners[2], corners[3]).toShape(),
+            Part.Arc(corners[3], Vector(-half - radius, 0, 0), corners[0]).toShape(),
+        ]
+        return Part.Face(Part.Wire(edges)).extrude(Vector(0, 0, depth))
+
+    def slot(self, feature: dict):
+        """This method will make a slot as a single extruded face and place it where it needs to go.
+
+        Args:
+            feature: This is the dictionary that contains the details of where the slot must be placed and its details.
+        """
+        if not feature["length"]:
+            return self.hole(feature)
+        slot = self._tool(
+            ("slot", feature["length"], feature["diameter"], feature["depth"]),
+            lambda: self._slot_tool(feature["length"], feature["diameter"], feature["depth"]),
+        )
+        x_dir = Vector(*(float(axis == feature["axis"]) for axis in "xyz"))
+        z_dir = Vector(*CUT_DIRECTION[feature["side"]])
+        rotation = App.Rotation(x_dir, z_dir.cross(x_dir), z_dir, "ZXY")
+        slot.Placement = App.Placement(Vector(feature["x"], feature["y"], feature["z"]), rotation)
+        return slot
+
     def cut_nut(self, feature: dict):
         """This method will take the 2D hexigon and convert it to a 3D shape and place it where it needs to go.
         Args:
             feature: this is a dict containing the necessary details of the hexigon like its size and location.
         """
 
-        hexigon = self._calc_hex(depth=0, diameter=feature["diameter"])
-        nut = hexigon.extrude(App.Vector(0, 0, feature["depth"]))
+        nut = self._tool(
+            ("nut", feature["diameter"], feature["depth"]),
+            lambda: self._calc_hex(depth=0, diameter=feature["diameter"]).extrude(App.Vector(0, 0, feature["depth"])),
+        )
 
         side = feature["side"]
         x = feature["x"]
@@ -211,14 +370,16 @@ class EngineFreecad:
         """
         pos_vec = Vector(0, 0, 0)
         if feature is not None:
-            cyl = Part.makeCylinder(feature["diameter"] / 2, feature["depth"], pos_vec)
+            radius = feature["diameter"] / 2
+            depth = feature["depth"]
+            cyl = self._tool(("cylinder", radius, depth), lambda: Part.makeCylinder(radius, depth, pos_vec))
             side = feature["side"]
             x = feature["x"]
             y = feature["y"]
             z = feature["z"]
             cut = feature["type"] == "cut"
         else:
-            cyl = Part.makeCylinder(radius, depth, pos_vec)
+            cyl = self._tool(("cylinder", radius, depth), lambda: Part.makeCylinder(radius, depth, pos_vec))
             x = move["x"]
             y = move["y"]
             z = move["z"]
@@ -330,7 +491,23 @@ class EngineFreecad:
         for obj in active_doc.Objects:
             if obj.ViewObject.Visibility:
                 filename = f"{self.filepath}.stl"
-                obj.Shape.exportStl(filename)
+                mesh = MeshPart.meshFromShape(
+                    Shape=obj.Shape,
+                    LinearDeflection=self.tolerance,
+                    AngularDeflection=self.angular_tolerance,
+                    Relative=False,
+                )
+                mesh.write(filename)
+
+    def render_to_step(self, active_doc: App.Document):
+        """This method will be used for creating a STEP of an object currently in view.
+        Args:
+            active_doc: The FreeCAD document.
+        """
+        for obj in active_doc.Objects:
+            if obj.ViewObject.Visibility:
+                filename = f"{self.filepath}.step"
+                obj.Shape.exportStep(filename)
 
     def _beveled_edge_cube(self, length: float, depth: float, side: str, move: dict):
         """
@@ -396,13 +573,54 @@ class EngineFreecad:
 
         return rhombus
 
+    def _native_bevel(self, features: dict, solid):
+        """Round or chamfer the edge with a native fillet or chamfer.
+
+        Args:
+            features: This is the dictionary that contains the details of the beveled edge.
+            solid: The solid with the edge.
+
+        Returns:
+            The beveled solid, None when the edge cannot be found or shaped.
+        """
+        axis1 = "xyz".index(features["axis1"])
+        axis2 = "xyz".index(features["axis2"])
+        edges = []
+        for edge in solid.Edges:
+            if not isinstance(edge.Curve, Part.Line):
+                continue
+            direction = edge.Vertexes[-1].Point - edge.Vertexes[0].Point
+            center = edge.CenterOfMass
+            if (
+                abs(direction[axis1]) < EDGE_TOLERANCE
+                and abs(direction[axis2]) < EDGE_TOLERANCE
+                and abs(center[axis1] - features["bound1"]) < EDGE_TOLERANCE
+                and abs(center[axis2] - features["bound2"]) < EDGE_TOLERANCE
+            ):
+                edges.append(edge)
+        if not edges:
+            logging.warning("Could not find the edge to bevel, cutting it instead.")
+            return None
+        try:
+            if features["edge_type"] == "chamfer":
+                return solid.makeChamfer(features["size"], edges)
+            return solid.makeFillet(features["size"], edges)
+        except Part.OCCError as error:
+            logging.warning("Could not bevel the edge, cutting it instead: %s", error)
+        return None
+
     def decode_beveled_edge(self, features: dict, solid):
         """
         This method will decode a beveled edge and either make a bevel or taper
 
+        The edge is rounded or chamfered natively, when that fails a cutter is made and subtracted.
+
         Args:
             features: This is the dictionary that contains the details of the beveled edge.
         """
+        res = self._native_bevel(features, solid)
+        if res is not None:
+            return res
 
         hypot = sqrt(features["size"] * 2 * features["size"] * 2 + features["size"] * 2 * features["size"] * 2) / 3
         move_cutter_cyl = {"x": 0.0, "y": 0.0, "z": 0.0}
@@ -457,7 +675,7 @@ class EngineFreecad:
             outformats: CSV containing views..
         """
 
-        definition = json.loads(in_name.read_text())
+        definition = load_definition(in_name)
 
         name = definition["name"]
         cut_features = []
@@ -483,6 +701,8 @@ class EngineFreecad:
                     solid = solid.fuse(self.sphere(feature))
                 elif feature["name"] == "cube":
                     solid = solid.fuse(self.cube(feature))
+                elif feature["name"] == "pattern":
+                    solid = solid.fuse(self.pattern(feature))
                 else:
                     logging.error("Adding not yet supported.")
             elif feature["type"] == "cut":
@@ -497,6 +717,10 @@ class EngineFreecad:
                     # This was necessary to avoid creating a shape that was too complicate for FreeCAD to follow.
                 elif feature["name"] == "nut":
                     cut_features.append(self.cut_nut(feature))
+                elif feature["name"] == "slot":
+                    cut_features.append(self.slot(feature))
+                elif feature["name"] == "pattern":
+                    cut_features.append(self.pattern(feature))
         if len(cut_features) > 1:
             s1 = cut_features.pop()
             fused = s1.multiFuse(cut_features)
@@ -525,8 +749,10 @@ class EngineFreecad:
                     engine.render_to_svg(view=fview, active_doc=doc)
                 case "STL":
                     engine.render_to_stl(active_doc=doc)
+                case "STEP":
+                    engine.render_to_step(active_doc=doc)
                 case _:
-                    msg = f"file_type: {out_format} is not one of PNG, DXF or STL."
+                    msg = f"file_type: {out_format} is not one of PNG, DXF, SVG, STL or STEP."
                     raise ValueError(msg)
         App.closeDocument(name)
         QtGui.QApplication.quit()
@@ -537,6 +763,11 @@ out_dir = os.getenv("CYCAX_CWD")
 files_to_produce = os.getenv("CYCAX_OUT_FORMATS")
 
 logging.error(f"Json file {json_file} out dir = {out_dir}")
-engine = EngineFreecad(Path(out_dir))
+engine = EngineFreecad(
+    Path(out_dir),
+    tolerance=float(os.getenv("CYCAX_TOLERANCE", "0.001")),
+    angular_tolerance=float(os.getenv("CYCAX_ANGULAR_TOLERANCE", "0.1")),
+    tool_cache=os.getenv("CYCAX_TOOL_CACHE"),
+)
 
 engine.build(Path(json_file), files_to_produce.replace(" ", ""))
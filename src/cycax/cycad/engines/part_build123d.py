@@ -2,14 +2,21 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import json
 import logging
+from collections.abc import Callable
 from pathlib import Path
 
 import build123d
+from OCP.StlAPI import StlAPI_Writer
 
 from cycax.cycad.engines.base_part_engine import PartEngine
+from cycax.cycad.engines.utils import CUT_DIRECTION, pattern_offsets
 from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, SIDES, TOP
+from cycax.cycad.quality import get_quality, quality_key
+
+EXPORT_FORMATS = ("STL", "GLTF", "STEP")
+# Distance in mm within which an edge is taken to lie on the bounds of a beveled edge.
+EDGE_TOLERANCE = 1e-6
 
 
 class PartEngineBuild123d(PartEngine):
@@ -19,8 +26,34 @@ class PartEngineBuild123d(PartEngine):
 
     def __init__(self, name: str | None = None, path: Path | None = None, config: dict | None = None):
         self.jobs = {}
+        self._tools = {}
         super().__init__(name, path, config)
 
+    def _tool(self, key: tuple, make: Callable[[], build123d.Shape]) -> build123d.Shape:
+        """
+        Return the canonical tool solid for key, it is only made once and placed with a transform per feature.
+
+        When config["tool_cache"] is a directory the tools are also stored there as BREP files between runs.
+
+        Args:
+            key: The kind of tool followed by its dimensions, e.g. ("nut", 6.2, 2.5, 0).
+            make: Makes the tool, at the origin, when it is not in the cache.
+        """
+        tool = self._tools.get(key)
+        if tool is None:
+            brep_file = None
+            if self.config.get("tool_cache"):
+                brep_file = Path(self.config["tool_cache"]) / ("-".join(str(value) for value in key) + ".brep")
+            if brep_file is not None and brep_file.exists():
+                tool = build123d.import_brep(brep_file)
+            else:
+                tool = make()
+                if brep_file is not None:
+                    brep_file.parent.mkdir(parents=True, exist_ok=True)
+                    build123d.export_brep(tool, brep_file)
+            self._tools[key] = tool
+        return tool
+
     def _decode_cylinder(self, feature_spec: dict) -> build123d.objects_part.Box:
         """
         This method creates a Cylinder object in Build123d.
@@ -82,7 +115,9 @@ class PartEngineBuild123d(PartEngine):
             feature_spec: This will be a dictionary containing the necessary information about the hole.
 
         """
-        feature = build123d.Cylinder(feature_spec["diameter"] / 2, height=feature_spec["depth"])
+        radius = feature_spec["diameter"] / 2
+        depth = feature_spec["depth"]
+        feature = self._tool(("cylinder", radius, depth), lambda: build123d.Cylinder(radius, height=depth))
         x = feature_spec["x"]
         y = feature_spec["y"]
         z = feature_spec["z"]
@@ -134,8 +169,14 @@ class PartEngineBuild123d(PartEngine):
         """
 
         rot = 0 if feature_spec["vertical"] else 90
-        hex2d = build123d.RegularPolygon(radius=feature_spec["diameter"] / 2, side_count=6, rotation=rot)
-        feature = build123d.extrude(hex2d, amount=feature_spec["depth"])
+        radius = feature_spec["diameter"] / 2
+        depth = feature_spec["depth"]
+        feature = self._tool(
+            ("nut", radius, depth, rot),
+            lambda: build123d.extrude(
+                build123d.RegularPolygon(radius=radius, side_count=6, rotation=rot), amount=depth
+            ),
+        )
         if feature_spec["side"] == FRONT:
             pos = build123d.Pos(feature_spec["x"], feature_spec["y"], feature_spec["z"])
             feature = pos * build123d.Rotation(X=270) * feature
@@ -164,10 +205,35 @@ class PartEngineBuild123d(PartEngine):
             feature: This will be a dictionary containing the necessary information about the sphere.
 
         """
-        feature = build123d.Sphere(feature_spec["diameter"] / 2)
+        radius = feature_spec["diameter"] / 2
+        feature = self._tool(("sphere", radius), lambda: build123d.Sphere(radius))
         feature = build123d.Pos(feature_spec["x"], feature_spec["y"], feature_spec["z"]) * feature
         return feature
 
+    def _decode_slot(self, feature_spec: dict) -> build123d.Part:
+        """
+        Return the solid of a slot, a slot sketch extruded into the part from the side.
+
+        Args:
+            feature_spec: This will be a dictionary containing the necessary information about the slot.
+
+        """
+        if not feature_spec["length"]:
+            return self._decode_cylinder_feature(feature_spec)
+        length = feature_spec["length"]
+        diameter = feature_spec["diameter"]
+        depth = feature_spec["depth"]
+        feature = self._tool(
+            ("slot", length, diameter, depth),
+            lambda: build123d.extrude(build123d.SlotCenterToCenter(length, diameter), amount=depth),
+        )
+        plane = build123d.Plane(
+            origin=(feature_spec["x"], feature_spec["y"], feature_spec["z"]),
+            x_dir=tuple(float(axis == feature_spec["axis"]) for axis in "xyz"),
+            z_dir=CUT_DIRECTION[feature_spec["side"]],
+        )
+        return plane.location * feature
+
     def _decode_beveled_edge(self, feature_spec: dict):
         """
         Return the solid to subtract off the edge.
@@ -215,19 +281,114 @@ class PartEngineBuild123d(PartEngine):
         feature_cylinder = self._decode_cylinder_feature(action_cylinder)
         return feature_cube - feature_cylinder
 
+    def _bevel_edges(self, part: build123d.Shape, feature_spec: dict) -> list[build123d.Edge]:
+        """
+        Return the straight edges of the part that lie on the bounds of a beveled edge.
+
+        Args:
+            part: The solid with all the added features of the part.
+            feature_spec: This will be a dictionary containing the necessary information about the beveled edge.
+        """
+        axis1 = "xyz".index(feature_spec["axis1"])
+        axis2 = "xyz".index(feature_spec["axis2"])
+        edges = []
+        for edge in part.edges():
+            if edge.geom_type != build123d.GeomType.LINE:
+                continue
+            direction = ((edge @ 1) - (edge @ 0)).to_tuple()
+            center = edge.center().to_tuple()
+            if (
+                abs(direction[axis1]) < EDGE_TOLERANCE
+                and abs(direction[axis2]) < EDGE_TOLERANCE
+                and abs(center[axis1] - feature_spec["bound1"]) < EDGE_TOLERANCE
+                and abs(center[axis2] - feature_spec["bound2"]) < EDGE_TOLERANCE
+            ):
+                edges.append(edge)
+        return edges
+
+    def _bevel(self, part: build123d.Shape, feature_spec: dict) -> build123d.Shape:
+        """
+        Round or chamfer an edge of the part with a native fillet or chamfer.
+
+        When the part is not a single solid, or the edge cannot be found or shaped,
+        the cutter from _decode_beveled_edge is subtracted instead.
+
+        Args:
+            part: The part with all its added features.
+            feature_spec: This will be a dictionary containing the necessary information about the beveled edge.
+        """
+        solids = part.solids()
+        edges = self._bevel_edges(solids[0], feature_spec) if len(solids) == 1 else []
+        if edges:
+            try:
+                if feature_spec["edge_type"] == "chamfer":
+                    return solids[0].chamfer(feature_spec["size"], None, edges)
+                return solids[0].fillet(feature_spec["size"], edges)
+            except Exception as error:  # OCCT raises its own exception types when the fillet fails.
+                logging.warning("Could not bevel the edge of %s, cutting it instead: %s", self.name, error)
+        else:
+            logging.warning("Could not find the edge to bevel on %s, cutting it instead.", self.name)
+        return part - build123d.Plane.XY * self._decode_beveled_edge(feature_spec)
+
+    def _decode_pattern(self, feature_spec: dict) -> build123d.Compound:
+        """
+        Return a compound of the pattern tool at every position, to be cut or added in one operation.
+
+        Args:
+            feature_spec: The pattern feature with its tool in "feature".
+        """
+        tool = self._decode_feature(feature_spec["feature"])
+        return build123d.Compound([build123d.Pos(*offset) * tool for offset in pattern_offsets(feature_spec)])
+
+    def _decode_feature(self, feature_spec: dict):
+        """
+        Return the solid of a feature.
+
+        Args:
+            feature_spec: The details of the feature.
+
+        Raises:
+            ValueError: if the feature type is not known.
+        """
+        match feature_spec["name"]:
+            case "cube":
+                feature = self._decode_cube(feature_spec)
+            case "hole":
+                feature = self._decode_cylinder_feature(feature_spec)
+            case "cylinder_feature":
+                feature = self._decode_cylinder_feature(feature_spec)
+            case "sphere":
+                feature = self._decode_sphere(feature_spec)
+            case "nut":
+                feature = self._decode_nut(feature_spec)
+            case "beveled_edge":
+                feature = self._decode_beveled_edge(feature_spec)
+            case "cylinder":
+                feature = self._decode_cylinder(feature_spec)
+            case "slot":
+                feature = self._decode_slot(feature_spec)
+            case "pattern":
+                feature = self._decode_pattern(feature_spec)
+            case _:
+                msg = f"Unknown feature type: {feature_spec['name']}"
+                raise ValueError(msg)
+        return feature
+
     def build(self, part) -> list:
         """Create the output files for the part."""
 
         self.name = name = part.part_no
-        files = []
-        files = self.jobs.get(name, [])
+        out_formats = tuple(tuple(file_format) for file_format in self.config.get("out_formats", []))
+        job_key = (name, quality_key(self.config), out_formats)
+        files = self.jobs.get(job_key, [])
         if not files:
             logging.info("Building part %s", name)
             self.set_path(part._base_path)
             file_no_ext = self._base_path / name / f"{name}"
-            data = json.loads(self._json_file.read_text())
+            file_no_ext.parent.mkdir(parents=True, exist_ok=True)
+            data = self.part_spec(part)
             files = self._build(data, file_no_ext)
-            self.jobs[name] = files
+            self.jobs[job_key] = files
         return self.file_list(files=files, engine="Build123d", score=3)
 
     def get_plane(self, part, side: str) -> build123d.Plane:
@@ -253,26 +414,13 @@ class PartEngineBuild123d(PartEngine):
         part = None
         add_features = []
         subtract_features = []
+        bevels = []
         for action in definition["features"]:
-            match action["name"]:
-                case "cube":
-                    feature = self._decode_cube(action)
-                case "hole":
-                    feature = self._decode_cylinder_feature(action)
-                case "cylinder_feature":
-                    feature = self._decode_cylinder_feature(action)
-                case "sphere":
-                    feature = self._decode_sphere(action)
-                case "nut":
-                    feature = self._decode_nut(action)
-                case "beveled_edge":
-                    feature = self._decode_beveled_edge(action)
-                case "cylinder":
-                    feature = self._decode_cylinder(action)
-                case _:
-                    msg = f"Unknown feature type: {action['name']}"
-                    raise ValueError(msg)
-
+            if action["name"] == "beveled_edge":
+                # Beveled edges are shaped on the part once all the features are added.
+                bevels.append(action)
+                continue
+            feature = self._decode_feature(action)
             feature = (
                 build123d.Plane.XY * feature
             )  # The position and direction in the JSON is all relevant to the XY Plane.
@@ -289,14 +437,50 @@ class PartEngineBuild123d(PartEngine):
                 part = feature
             else:
                 part += feature
+        for action in bevels:
+            part = self._bevel(part, action)
         for feature in subtract_features:
             part -= feature
 
+        return self._export(part, file_no_ext)
+
+    def _export(self, part, file_no_ext: Path) -> list[dict]:
+        """Export the part to the formats requested in config["out_formats"].
+
+        The part is tessellated once and the STL and glTF are written from that mesh.
+        The tolerances come from the quality profile in config["quality"],
+        config["tolerance"] and config["angular_tolerance"] override the profile.
+
+        Args:
+            part: The Build123d part.
+            file_no_ext: The path of the output files without the extension.
+
+        Returns:
+            The files that were written.
+        """
+        out_formats = self.out_formats(default=EXPORT_FORMATS)
+        quality = get_quality(self.config.get("quality"))
+        tolerance = self.config.get("tolerance", quality["tolerance"])
+        angular_tolerance = self.config.get("angular_tolerance", quality["angular_tolerance"])
         files = []
-        build123d.export_stl(to_export=part, file_path=file_no_ext.with_suffix(".stl"))
-        files.append({"file": file_no_ext.with_suffix(".stl"), "type": "stl"})
-        build123d.export_gltf(to_export=part, file_path=file_no_ext.with_suffix(".gltf"))
-        files.append({"file": file_no_ext.with_suffix(".gltf"), "type": "gltf"})
-        build123d.export_step(to_export=part, file_path=file_no_ext.with_suffix(".step"))
-        files.append({"file": file_no_ext.with_suffix(".step"), "type": "step"})
+        if out_formats & {"STL", "GLTF"}:
+            part.mesh(tolerance, angular_tolerance)
+        if "STL" in out_formats:
+            # export_stl always re-meshes, write the existing triangulation directly.
+            stl_writer = StlAPI_Writer()
+            stl_writer.ASCIIMode = False
+            stl_writer.Write(part.wrapped, str(file_no_ext.with_suffix(".stl")))
+            files.append({"file": file_no_ext.with_suffix(".stl"), "type": "stl"})
+        if "STEP" in out_formats:
+            build123d.export_step(to_export=part, file_path=file_no_ext.with_suffix(".step"))
+            files.append({"file": file_no_ext.with_suffix(".step"), "type": "step"})
+        if "GLTF" in out_formats:
+            # The glTF export clears the triangulation of the part when done, it has to be last.
+            build123d.export_gltf(
+                to_export=part,
+                file_path=file_no_ext.with_suffix(".gltf"),
+                linear_deflection=tolerance,
+                angular_deflection=angular_tolerance,
+            )
+            files.append({"file": file_no_ext.with_suffix(".gltf"), "type": "gltf"})
         return files
@@ -8,9 +8,11 @@ import subprocess
 import sys
 from pathlib import Path
 
+from cycax.cycad.build_db import BuildDatabase
 from cycax.cycad.engines.base_part_engine import PartEngine
-from cycax.cycad.engines.utils import check_source_hash
 from cycax.cycad.location import TOP
+from cycax.cycad.quality import get_quality, quality_key
+from cycax.cycad.serialize import BINARY_SUFFIX, save_spec
 
 
 class PartEngineFreeCAD(PartEngine):
@@ -19,44 +21,21 @@ class PartEngineFreeCAD(PartEngine):
             self.name = part.part_no
         if self._base_path is None:
             self.set_path(path=part._base_path)
+        # FreeCAD runs in its own process and reads the part specification from disk.
+        # The spec file is only written when it changed, see save_spec.
+        self._json_file.parent.mkdir(parents=True, exist_ok=True)
+        save_spec(self._json_file, self.part_spec(part), binary=self._json_file.suffix == BINARY_SUFFIX)
         fcstd_file = self._base_path / self.name / f"{self.name}.FCStd"
-        if check_source_hash(self._json_file, fcstd_file):
-            app_bin = self.get_appimage("FreeCAD")
-
-            logging.error("Use freeCAD %s", app_bin)
-            freecad_py = Path(sys.modules[self.__module__].__file__).parent / "cycax_part_freecad.py"
-
-            out_formats_set = set()
-            for file_format in self.config.get("out_formats", []):
-                out_formats_set.add(":".join(file_format[:2]))
-            if not out_formats_set:
-                out_formats_set.add("STL")
-
-            environment = dict(os.environ)
-            environment.update(
-                {
-                    "CYCAX_JSON": self._json_file,
-                    "CYCAX_CWD": self._base_path,
-                    "CYCAX_OUT_FORMATS": ",".join(out_formats_set),
-                }
-            )
-            result = subprocess.run(
-                [app_bin, freecad_py],
-                capture_output=True,
-                text=True,
-                env=environment,
-                shell=False,
-                check=False,
-            )
-            # TODO: Read https://wiki.freecad.org/Start_up_and_Configuration and set logging and headless args.
-
-            if result.stdout:
-                logging.info("FreeCAD: %s", result.stdout)
-            if result.stderr:
-                logging.error("FreeCAD: %s", result.stderr)
+        with BuildDatabase(self._base_path) as database:
+            input_hash = database.file_hash(self._json_file, salt=quality_key(self.config))
+            if not database.is_fresh(fcstd_file, input_hash):
+                with database.build(fcstd_file, input_hash, engine="FreeCAD", config=self.config) as build:
+                    self._run_freecad()
+                    build.add_output(fcstd_file)
 
         _files = [
             {"file": self._base_path / self.name / f"{self.name}-FreeCAD.stl"},
+            {"file": self._base_path / self.name / f"{self.name}.step"},
             {"file": self._base_path / self.name / f"{self.name}-perspectiveAll.png"},
             {"file": self._base_path / self.name / f"{self.name}-perspective.dxf", "side": TOP},
             {"file": self._base_path / self.name / f"{self.name}-perspectiveTop.png", "side": TOP},
@@ -64,3 +43,51 @@ class PartEngineFreeCAD(PartEngine):
         ]
 
         return self.file_list(files=_files, engine="FreeCAD", score=5)
+
+    def _run_freecad(self):
+        """Run the FreeCAD macro that builds the part from the saved spec file.
+
+        Raises:
+            RuntimeError: When FreeCAD fails.
+        """
+        app_bin = self.get_appimage("FreeCAD")
+
+        logging.error("Use freeCAD %s", app_bin)
+        freecad_py = Path(sys.modules[self.__module__].__file__).parent / "cycax_part_freecad.py"
+
+        out_formats_set = set()
+        for file_format in self.config.get("out_formats", []):
+            out_formats_set.add(":".join(file_format[:2]))
+        if not out_formats_set:
+            out_formats_set.add("STL")
+
+        quality = get_quality(self.config.get("quality"))
+        environment = dict(os.environ)
+        environment.update(
+            {
+                "CYCAX_JSON": self._json_file,
+                "CYCAX_CWD": self._base_path,
+                "CYCAX_OUT_FORMATS": ",".join(out_formats_set),
+                "CYCAX_TOLERANCE": str(self.config.get("tolerance", quality["tolerance"])),
+                "CYCAX_ANGULAR_TOLERANCE": str(self.config.get("angular_tolerance", quality["angular_tolerance"])),
+            }
+        )
+        if self.config.get("tool_cache"):
+            environment["CYCAX_TOOL_CACHE"] = str(self.config["tool_cache"])
+        result = subprocess.run(
+            [app_bin, freecad_py],
+            capture_output=True,
+            text=True,
+            env=environment,
+            shell=False,
+            check=False,
+        )
+        # TODO: Read https://wiki.freecad.org/Start_up_and_Configuration and set logging and headless args.
+
+        if result.stdout:
+            logging.info("FreeCAD: %s", result.stdout)
+        if result.stderr:
+            logging.error("FreeCAD: %s", result.stderr)
+        if result.returncode:
+            msg = f"FreeCAD failed to build {self.name}, exit code {result.returncode}."
+            raise RuntimeError(msg)
@@ -2,14 +2,16 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import json
 import logging
 import subprocess
 from pathlib import Path
 
+from cycax.cycad.build_db import BuildDatabase, content_hash
 from cycax.cycad.engines.base_part_engine import PartEngine
-from cycax.cycad.engines.utils import check_source_hash
+from cycax.cycad.engines.utils import pattern_offsets, slot_ends
 from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP
+from cycax.cycad.quality import get_quality, quality_key
+from cycax.cycad.serialize import canonical_json
 
 
 class PartEngineOpenSCAD(PartEngine):
@@ -19,6 +21,10 @@ class PartEngineOpenSCAD(PartEngine):
 
     dif = 0
 
+    def _fn(self) -> int:
+        """The number of facets on a circle, from the quality settings in the config."""
+        return self.config.get("fn", get_quality(self.config.get("quality"))["fn"])
+
     def _decode_cube(self, lookup: dict) -> str:
         """
         This method will return the string that will have the OpenSCAD for a cube.
@@ -61,7 +67,9 @@ class PartEngineOpenSCAD(PartEngine):
             res.append(self._cut_rotate(lookup["side"]))
         else:
             res.append(self._add_rotate(lookup["side"]))
-        res.append("cylinder(r= {diam}, h={depth}, $fn=64);".format(diam=tempdiam, depth=lookup["depth"]))
+        res.append(
+            "cylinder(r= {diam}, h={depth}, $fn={fn});".format(diam=tempdiam, depth=lookup["depth"], fn=self._fn())
+        )
         return res
 
     def _decode_nut(self, lookup: dict) -> str:
@@ -91,10 +99,64 @@ class PartEngineOpenSCAD(PartEngine):
         res = []
         res.append(self._translate(lookup))
         radius = lookup["diameter"] / 2
-        res.append(f"sphere(r={radius}, $fn=64);")
+        res.append(f"sphere(r={radius}, $fn={self._fn()});")
+
+        return res
+
+    def _decode_slot(self, lookup: dict) -> str:
+        """
+        This method will return the OpenSCAD for a slot, the hull around the holes at its two ends.
 
+        Args:
+            lookup: This will be a dictionary containing the necessary information about the slot.
+
+        """
+        res = ["hull(){"]
+        for x, y, z in slot_ends(lookup):
+            res.extend(self._decode_cylinder({**lookup, "x": x, "y": y, "z": z}, cut=True))
+        res.append("}")
         return res
 
+    def _decode_pattern(self, lookup: dict) -> str:
+        """
+        This method will return the OpenSCAD for loop that repeats the tool of a pattern.
+
+        Args:
+            lookup: This will be a dictionary containing the pattern and its tool in "feature".
+
+        """
+        tool = lookup["feature"]
+        if tool["name"] == "hole":
+            tool_scad = self._decode_cylinder(tool, cut=True)
+        elif tool["name"] == "cylinder_feature":
+            tool_scad = self._decode_cylinder(tool, cut=False)
+        elif tool["name"] == "cube":
+            tool_scad = [self._decode_cube(tool)]
+        elif tool["name"] == "nut":
+            tool_scad = self._decode_nut(tool)
+        elif tool["name"] == "sphere":
+            tool_scad = self._decode_sphere(tool)
+        elif tool["name"] == "slot":
+            tool_scad = self._decode_slot(tool)
+        else:
+            msg = f"Pattern of {tool['name']} is not supported."
+            raise ValueError(msg)
+
+        step1 = "[{}, {}, {}]".format(*lookup["step1"])
+        step2 = "[{}, {}, {}]".format(*lookup["step2"])
+        if lookup["mask"]:
+            offsets = ", ".join("[{}, {}, {}]".format(*offset) for offset in pattern_offsets(lookup))
+            res = f"for (offset = [{offsets}]) translate(offset)"
+        elif lookup["kind"] == "polar":
+            count = lookup["count1"]
+            angle = f"i * 360 / {count}"
+            res = f"for (i = [0:{count - 1}]) translate((cos({angle}) - 1) * {step1} + sin({angle}) * {step2})"
+        else:
+            columns = lookup["count1"] - 1
+            rows = lookup["count2"] - 1
+            res = f"for (i = [0:{columns}], j = [0:{rows}]) translate(i * {step1} + j * {step2})"
+        return res + "".join(tool_scad)
+
     def _decode_cut(self) -> str:
         """
         This method returns a simple OpenSCAD string neceseray to cut.
@@ -223,8 +285,8 @@ class PartEngineOpenSCAD(PartEngine):
         """
         if features["edge_type"] == "round":
             rotate = self._cut_rotate(features["side"])
-            cutter = "{rotate}cylinder(r= {diam}, h={depth}, $fn=64);".format(
-                rotate=rotate, diam=features["size"], depth=features["depth"]
+            cutter = "{rotate}cylinder(r= {diam}, h={depth}, $fn={fn});".format(
+                rotate=rotate, diam=features["size"], depth=features["depth"], fn=self._fn()
             )
 
         elif features["edge_type"] == "chamfer":
@@ -257,18 +319,26 @@ class PartEngineOpenSCAD(PartEngine):
 
         return res
 
-    def build(self, part) -> list:  # noqa: ARG002 Unused argument
+    def build(self, part) -> list:
         """Create the output files for the part."""
 
         name = str(self.part_no)
-        json_file = self._json_file
+        data = self.part_spec(part)
         scad_file = self._base_path / name / f"{name}.scad"
         stl_file = self._base_path / name / f"{name}.stl"
-        if check_source_hash(json_file, scad_file):
-            self.build_scad(json_file, scad_file)
-        if self.config.get("stl"):
-            if check_source_hash(scad_file, stl_file):
-                self.build_stl(scad_file, stl_file)
+        scad_file.parent.mkdir(parents=True, exist_ok=True)
+        with BuildDatabase(self._base_path) as database:
+            spec_hash = content_hash(canonical_json(data), salt=quality_key(self.config))
+            if not database.is_fresh(scad_file, spec_hash):
+                with database.build(scad_file, spec_hash, engine="OpenSCAD", config=self.config) as build:
+                    self.build_scad(data, scad_file)
+                    build.add_output(scad_file)
+            if self.config.get("stl") or "STL" in self.out_formats(default=()):
+                scad_hash = database.file_hash(scad_file)
+                if not database.is_fresh(stl_file, scad_hash):
+                    with database.build(stl_file, scad_hash, engine="OpenSCAD", config=self.config) as build:
+                        self.build_stl(scad_file, stl_file)
+                        build.add_output(stl_file)
 
         _files = [
             {"file": self._base_path / name / f"{name}.scad"},
@@ -278,15 +348,18 @@ class PartEngineOpenSCAD(PartEngine):
 
         return self.file_list(files=_files, engine="OpenSCAD", score=3)
 
-    def build_scad(self, json_file: Path, scad_file: Path):
+    def build_scad(self, data: dict, scad_file: Path):
         """
         This is the main working class for decoding the scad. It is necessary for it to be refactored.
+
+        Args:
+            data: The part specification.
+            scad_file: The OpenSCAD file to write.
+
         Raises:
             ValueError: if incorrect part_name is provided.
         """
 
-        data = json.loads(json_file.read_text())
-
         output = []
         dif = 0
         for action in data["features"]:
@@ -315,6 +388,12 @@ class PartEngineOpenSCAD(PartEngine):
             elif action["name"] == "sphere":
                 output.append(self._decode_sphere(action))
 
+            elif action["name"] == "slot":
+                output.append(self._decode_slot(action))
+
+            elif action["name"] == "pattern":
+                output.append(self._decode_pattern(action))
+
         i = 0
         while i < dif:
             i = i + 1
@@ -339,6 +418,7 @@ class PartEngineOpenSCAD(PartEngine):
 
         Raises:
             ValueError: If incorrect part_name is provided.
+            RuntimeError: When OpenSCAD fails.
 
         """
         app_bin = self.get_appimage("OpenSCAD")
@@ -349,3 +429,6 @@ class PartEngineOpenSCAD(PartEngine):
             logging.info("OpenSCAD: %s", result.stdout)
         if result.stderr:
             logging.error("OpenSCAD: %s", result.stderr)
+        if result.returncode:
+            msg = f"OpenSCAD failed to create {stl_file}, exit code {result.returncode}."
+            raise RuntimeError(msg)
@@ -67,7 +67,7 @@ class PartEngineServer(PartEngine):
 
     def create(self, part):
         """Push the creation of a part to the server as a Job."""
-        spec = part.export()
+        spec = part.spec()
         client = self.connect()
         response = None
         try:
@@ -2,7 +2,6 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import json
 import logging
 from pathlib import Path
 
@@ -11,7 +10,8 @@ import matplotlib.pyplot as plt
 from matplotlib.patches import Circle, Rectangle
 
 from cycax.cycad.engines.base_part_engine import PartEngine
-from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP
+from cycax.cycad.engines.utils import expand_feature
+from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP, snap
 
 x = "x"
 y = "y"
@@ -70,9 +70,9 @@ class Simple2D(PartEngine):
         Args:
             feature: this is the dictionary that contains the details of the object being produced.
         """
-        self.bounding_box[TOP] = self.bounding_box[TOP] + feature["z_size"]
-        self.bounding_box[RIGHT] = self.bounding_box[RIGHT] + feature["x_size"]
-        self.bounding_box[BACK] = self.bounding_box[BACK] + feature["y_size"]
+        self.bounding_box[TOP] = snap(self.bounding_box[TOP] + feature["z_size"])
+        self.bounding_box[RIGHT] = snap(self.bounding_box[RIGHT] + feature["x_size"])
+        self.bounding_box[BACK] = snap(self.bounding_box[BACK] + feature["y_size"])
         self.plane = self.side
         self.hole_sink = self.side
         self.plane = {TOP: z, BACK: y, BOTTOM: z, FRONT: y, LEFT: x, RIGHT: x}[self.plane]
@@ -93,9 +93,9 @@ class Simple2D(PartEngine):
             feature: this is the dictionary of the object that is being plotted.
         """
         if (
-            feature[self.plane] == self.bounding_box[self.side]
-            or feature[self.plane] + feature[self.hole_sink] == self.bounding_box[self.side]
-            or feature[self.plane] - feature[self.hole_sink] == self.bounding_box[self.side]
+            snap(feature[self.plane]) == self.bounding_box[self.side]
+            or snap(feature[self.plane] + feature[self.hole_sink]) == self.bounding_box[self.side]
+            or snap(feature[self.plane] - feature[self.hole_sink]) == self.bounding_box[self.side]
         ):
             ax.add_patch(
                 Circle((feature["x"], feature["y"]), feature["diameter"] / 2, **self._get_feature_style(feature))
@@ -110,9 +110,9 @@ class Simple2D(PartEngine):
             feature: this is the dictionary of the object that is being plotted.
         """
         if (
-            feature[self.plane] == self.bounding_box[self.side]
-            or feature[self.plane] + feature[self.plane + "_size"] == self.bounding_box[self.side]
-            or feature[self.plane] - feature[self.plane + "_size"] == self.bounding_box[self.side]
+            snap(feature[self.plane]) == self.bounding_box[self.side]
+            or snap(feature[self.plane] + feature[self.plane + "_size"]) == self.bounding_box[self.side]
+            or snap(feature[self.plane] - feature[self.plane + "_size"]) == self.bounding_box[self.side]
         ):
             length = self.side
             length = {
@@ -149,16 +149,19 @@ class Simple2D(PartEngine):
         elif feature_type == "hole":
             self._hole(ax, feature)
 
-    def build(self):
-        """This method will coordinate the drawing of the figure that is being decoded from the provided JSON."""
-        in_name = self._json_file
-        with open(in_name) as f:
-            data = json.load(f)
+    def build(self, part=None):
+        """This method will coordinate the drawing of the figure that is being decoded from the provided JSON.
+
+        Args:
+            part: The CycadPart to draw, the saved spec file is read when not given.
+        """
+        data = self.part_spec(part)
         fig, ax = plt.subplots()
-        for feature in data["features"]:
-            if feature["type"] == "add":
-                self.bounding_box(feature)
-            self.figure_feature(ax, feature)
+        for spec_feature in data["features"]:
+            for feature in expand_feature(spec_feature):
+                if feature["type"] == "add":
+                    self.bounding_box(feature)
+                self.figure_feature(ax, feature)
         ax.set_title(self.name)
         ax.autoscale_view()
         ax.set_aspect("equal", "box")
@@ -2,70 +2,133 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-import hashlib
-from pathlib import Path
+from itertools import product
+from math import cos, pi, sin
 
+from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP
 
-def load_file_hash(filename: Path) -> str:
-    """Load the stored hash for filename.
+# The direction into the part from each side, the direction a cut feature goes.
+CUT_DIRECTION = {
+    TOP: (0, 0, -1),
+    BOTTOM: (0, 0, 1),
+    LEFT: (1, 0, 0),
+    RIGHT: (-1, 0, 0),
+    FRONT: (0, 1, 0),
+    BACK: (0, -1, 0),
+}
+
+
+def pattern_offsets(feature_spec: dict) -> list[tuple[float, float, float]]:
+    """Calculate the offsets of the positions of a pattern feature from its tool.
 
     Args:
-        filename: The file who's stored hash we need to retrieve.
+        feature_spec: The pattern feature.
 
     Returns:
-        The SHA265 hash in hexadesimal format of the contents of the previous version of filename.
+        The (x, y, z) offset of every position in the pattern that is not masked, the tool is at (0, 0, 0).
     """
-    hash_file = filename.parent / f".{filename.name}.hash"
-    if hash_file.exists():
-        return hash_file.read_text()
+    step1 = feature_spec["step1"]
+    step2 = feature_spec["step2"]
+    mask = {tuple(position) for position in feature_spec.get("mask", [])}
+    if feature_spec["kind"] == "polar":
+        count = feature_spec["count1"]
+        factors = [
+            (cos(2 * pi * index / count) - 1.0, sin(2 * pi * index / count))
+            for index in range(count)
+            if (index, 0) not in mask
+        ]
     else:
-        return "."
-
+        factors = [
+            position
+            for position in product(range(feature_spec["count1"]), range(feature_spec["count2"]))
+            if position not in mask
+        ]
+    return [
+        tuple(factor1 * value1 + factor2 * value2 for value1, value2 in zip(step1, step2, strict=True))
+        for factor1, factor2 in factors
+    ]
 
-def store_file_hash(filename: Path, new_hash: str):
-    """Store the hash value that represents the contents of filename.
 
-    Use load_file_hash to fetch the hash for filename.
+def slot_ends(feature_spec: dict) -> list[tuple[float, float, float]]:
+    """Calculate the centers of the two round ends of a slot feature.
 
     Args:
-        filename: Store the hash value of this file.
-    """
-    hash_file = filename.parent / f".{filename.name}.hash"
-    hash_file.write_text(new_hash)
-
+        feature_spec: The slot feature.
 
-def generate_file_hash(filename: Path) -> str:
-    """
-    Args:
-        filename: A SHA256 hash will be generated from the contents of this file.
     Returns:
-        A SHA256 hash in hexadesimal format.
+        The (x, y, z) of the centers of the round ends on the surface of the side.
     """
-    content = filename.read_text()
-    hash_value = hashlib.sha256(content.encode("UTF-8")).hexdigest()
-    return hash_value
+    axis = "xyz".index(feature_spec["axis"])
+    ends = []
+    for sign in (-1, 1):
+        end = [feature_spec["x"], feature_spec["y"], feature_spec["z"]]
+        end[axis] += sign * feature_spec["length"] / 2
+        ends.append(tuple(end))
+    return ends
 
 
-def check_source_hash(source_filepath: Path, target_filepath: Path) -> bool:
-    """Check if we should build the target file.
+def expand_slot(feature_spec: dict) -> list[dict]:
+    """Expand a slot feature into two holes and the cube between them.
 
     Args:
-        source_filepath: The source file, this file must exists.
-        target_filepath: The target file, this is the file we want to find out iof we should create it.
+        feature_spec: The slot feature.
+
     Returns:
-        True if the source file should be generated.
+        The hole at each end of the slot and the centered cube between the holes.
     """
-    if not source_filepath.exists():
-        msg = f"Cannot create {target_filepath} the source file {source_filepath} does not exists."
-        raise ValueError(msg)
-
-    new_hash = generate_file_hash(source_filepath)
+    holes = [
+        {
+            "x": x,
+            "y": y,
+            "z": z,
+            "side": feature_spec["side"],
+            "diameter": feature_spec["diameter"],
+            "depth": feature_spec["depth"],
+            "name": "hole",
+            "type": "cut",
+        }
+        for x, y, z in slot_ends(feature_spec)
+    ]
+    if not feature_spec["length"]:
+        return holes[:1]
+    direction = CUT_DIRECTION[feature_spec["side"]]
+    sizes = [feature_spec["diameter"]] * 3
+    sizes[[abs(value) for value in direction].index(1)] = feature_spec["depth"]
+    sizes["xyz".index(feature_spec["axis"])] = feature_spec["length"]
+    cube = {
+        "x": feature_spec["x"] + direction[0] * feature_spec["depth"] / 2,
+        "y": feature_spec["y"] + direction[1] * feature_spec["depth"] / 2,
+        "z": feature_spec["z"] + direction[2] * feature_spec["depth"] / 2,
+        "side": feature_spec["side"],
+        "x_size": sizes[0],
+        "y_size": sizes[1],
+        "z_size": sizes[2],
+        "center": True,
+        "name": "cube",
+        "type": "cut",
+    }
+    return [*holes, cube]
+
+
+def expand_feature(feature_spec: dict) -> list[dict]:
+    """Expand a pattern or slot feature into simple features, for engines that do not support them.
 
-    if target_filepath.exists():
-        old_hash = load_file_hash(source_filepath)
-        # logging.debug("File %s has old hash %s and new hash %s", source_filepath, old_hash, new_hash)
-        if old_hash == new_hash:
-            return False
+    Args:
+        feature_spec: Any feature.
 
-    store_file_hash(source_filepath, new_hash)
-    return True
+    Returns:
+        The features at every position of a pattern, the holes and cube of a slot,
+        other features are returned as is.
+    """
+    if feature_spec["name"] == "slot":
+        return expand_slot(feature_spec)
+    if feature_spec["name"] != "pattern":
+        return [feature_spec]
+    features = []
+    for offset_x, offset_y, offset_z in pattern_offsets(feature_spec):
+        feature = dict(feature_spec["feature"])
+        feature["x"] += offset_x
+        feature["y"] += offset_y
+        feature["z"] += offset_z
+        features.append(feature)
+    return features
@@ -6,13 +6,85 @@ import typing
 
 from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP, Location
 
+# Features are compared with their values rounded to this number of decimals, that is to within a nanometer.
+KEY_DECIMALS = 6
+
+
+def feature_key(value: typing.Any) -> typing.Hashable:
+    """Make a canonical hashable value from an exported feature.
+
+    Dictionaries become tuples of sorted items, lists become tuples and floats are rounded to KEY_DECIMALS.
+
+    Args:
+        value: The export of a feature, or any value in it.
+
+    Returns:
+        A value that is equal for features with the same name, type, side, coordinates and dimensions.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, feature_key(item)) for key, item in value.items()))
+    if isinstance(value, list | tuple):
+        return tuple(feature_key(item) for item in value)
+    if isinstance(value, float):
+        return round(value, KEY_DECIMALS) + 0.0  # Adding 0.0 turns -0.0 into 0.0.
+    return value
+
+
+def unique_features(features: list) -> list:
+    """Remove the features that are equal to a later feature in the list.
+
+    The last of the equal features is kept, like the optimizer does, a cut that is repeated after an added feature
+    still cuts through the added feature.
+
+    Args:
+        features: The features, in order.
+
+    Returns:
+        The last of every set of equal features, in order.
+    """
+    seen = set()
+    unique = []
+    for feature in reversed(features):
+        key = feature.key()
+        if key not in seen:
+            seen.add(key)
+            unique.append(feature)
+    unique.reverse()
+    return unique
+
 
 class Feature(Location):
-    """The Parent class of all features,"""
+    """The Parent class of all features,
+
+    Features are equal when they have the same values, see key().
+    A feature is hashed on its values, do not change a feature while it is in a set or used as a dictionary key.
+    Features hold their values in slots, _fields lists the values that are exported in order.
+    Features that do not declare _fields, like the features defined outside of CyCAx, export the location and the
+    public values in their __dict__.
+    """
+
+    __slots__ = ()
+    _fields: typing.ClassVar[tuple[str, ...]] = ()
 
     def __repr__(self) -> str:
         return f"Feature(name={self.name}, type={self.type}, x={self.x}, y={self.y}, z={self.z}, side={self.side})"
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Feature):
+            return NotImplemented
+        return self.key() == other.key()
+
+    def __hash__(self) -> int:
+        return hash(self.key())
+
+    def key(self) -> typing.Hashable:
+        """The value identity of the feature.
+
+        Returns:
+            A canonical hashable value of the exported feature, see feature_key.
+        """
+        return feature_key(self.export())
+
     def export(self) -> dict:
         """Create a dictionary holding a representation of the feature.
 
@@ -23,16 +95,13 @@ class Feature(Location):
             AttributeError: When name or type is not defined on the feature.
         """
 
-        feature_dict = {}
         for key in ("name", "type"):
             getattr(self, key)  # Just get the attribute and let Python raise attribute error if it does not exists.
 
-        for key, value in vars(self).items():
-            if not key.startswith("_"):
-                # Save all the public variables of the feature.
-                feature_dict[key] = value
-
-        return feature_dict
+        data = {key: getattr(self, key) for key in self._fields or ("x", "y", "z", "side")}
+        if hasattr(self, "__dict__"):
+            data.update((key, value) for key, value in vars(self).items() if not key.startswith("_"))
+        return data
 
 
 class Holes(Feature):
@@ -51,6 +120,9 @@ class Holes(Feature):
 
     """
 
+    __slots__ = ("depth", "diameter", "name", "type")
+    _fields = ("x", "y", "z", "side", "diameter", "depth", "name", "type")
+
     def __init__(self, side: str, x: float, y: float, z: float, diameter: float, depth: float):
         Location.__init__(self, x, y, z, side)
         self.diameter = diameter
@@ -75,6 +147,9 @@ class Cylinder(Feature):
 
     """
 
+    __slots__ = ("depth", "diameter", "name", "type")
+    _fields = ("x", "y", "z", "side", "diameter", "depth", "name", "type")
+
     def __init__(self, side: str, x: float, y: float, z: float, diameter: float, height: float):
         Location.__init__(self, x, y, z, side)
         self.diameter = diameter
@@ -83,6 +158,85 @@ class Cylinder(Feature):
         self.type = "add"
 
 
+class SlotCutOut(Feature):
+    """This class will store data on slots. A slot is a hole stretched along an axis, cut into an object.
+
+    The location is the center of the slot on the surface of the side.
+
+    Args:
+        x: The location of x along the x axis.
+        y: The location of y along the y axis.
+        z: The location of z along the z axis.
+        side: The side of the object that this location refers to.
+            This will be used to specify from which side a feature should be inserted into another object.
+            This will be one of TOP, BOTTOM, LEFT, RIGHT, FRONT, BACK.
+        length: The distance between the centers of the round ends of the slot.
+        diameter: The width of the slot, the diameter of the round ends.
+        depth: depth of the slot.
+        axis: The axis the slot runs along, one of x, y or z.
+    """
+
+    __slots__ = ("axis", "depth", "diameter", "length", "name", "type")
+    _fields = ("x", "y", "z", "side", "length", "diameter", "depth", "axis", "name", "type")
+
+    def __init__(
+        self, side: str, x: float, y: float, z: float, length: float, diameter: float, depth: float, axis: str
+    ):
+        Location.__init__(self, x, y, z, side)
+        self.length = length
+        self.diameter = diameter
+        self.depth = depth
+        self.axis = axis
+        self.name = "slot"
+        self.type = "cut"
+
+    def swap_xy(self, rot: float, rotmax: list) -> list:
+        """
+        This will rotate slot while holding top where it is. It overrides the method present in the location super.
+
+        Args:
+            rot: the number of times to perform the swap.
+            rotmax: the maximum values for the swap.
+
+        Returns:
+            New location of relevant max of (x,y,z). useful when doing repeated swaps.
+        """
+        rotmax = super().swap_xy(rot=rot, rotmax=rotmax)
+        for _ in range(int(rot)):
+            self.axis = {"x": "y", "y": "x", "z": "z"}[self.axis]
+        return rotmax
+
+    def swap_xz(self, rot: float, rotmax: list) -> list:
+        """This will rotate slot while holding front where it is. It overrides the method present in the location super.
+
+        Args:
+            rot: the number of times to perform the swap.
+            rotmax: the maximum values for the swap.
+
+        Returns:
+            New location of relevant max of (x,y,z). useful when doing repeated swaps.
+        """
+        rotmax = super().swap_xz(rot=rot, rotmax=rotmax)
+        for _ in range(int(rot)):
+            self.axis = {"x": "z", "y": "y", "z": "x"}[self.axis]
+        return rotmax
+
+    def swap_yz(self, rot: float, rotmax: list) -> list:
+        """This will rotate slot while holding left where it is. It overrides the method present in the location super.
+
+        Args:
+            rot: the number of times to perform the swap.
+            rotmax: the maximum values for the swap.
+
+        Returns:
+            New location of relevant max of (x,y,z). useful when doing repeated swaps.
+        """
+        rotmax = super().swap_yz(rot=rot, rotmax=rotmax)
+        for _ in range(int(rot)):
+            self.axis = {"x": "x", "y": "z", "z": "y"}[self.axis]
+        return rotmax
+
+
 class RectangleCutOut(Feature):
     """This class can be used for cutting a hole that is not round but rather of the defined parameters.
 
@@ -104,6 +258,9 @@ class RectangleCutOut(Feature):
         center: This can be over ridden to instead specify the rectangle's location from its center.
     """
 
+    __slots__ = ("center", "name", "type", "x_size", "y_size", "z_size")
+    _fields = ("x", "y", "z", "side", "x_size", "y_size", "z_size", "center", "name", "type")
+
     def __init__(
         self,
         side: str,
@@ -215,6 +372,8 @@ class RectangleAddOn(RectangleCutOut):
         center: This can be over ridden to instead specify the rectangle's location from its center.
     """
 
+    __slots__ = ()
+
     def __init__(
         self,
         side: str,
@@ -295,6 +454,22 @@ class NutCutOut(Feature):
         },
     }
 
+    __slots__ = ("depth", "diameter", "name", "nut_type", "side_to_side", "thickness", "type", "vertical")
+    _fields = (
+        "name",
+        "type",
+        "x",
+        "y",
+        "z",
+        "side",
+        "nut_type",
+        "diameter",
+        "thickness",
+        "side_to_side",
+        "depth",
+        "vertical",
+    )
+
     def __init__(
         self,
         side: str,
@@ -336,6 +511,9 @@ class Sphere(Feature):
         diameter: diameter of the sphere.
     """
 
+    __slots__ = ("diameter", "name", "type")
+    _fields = ("name", "type", "x", "y", "z", "side", "diameter")
+
     def __init__(self, side: str, x: float, y: float, z: float, diameter: float, cut: bool):
         self.name = "sphere"
         if cut:
@@ -344,3 +522,170 @@ class Sphere(Feature):
             self.type = "add"
         Location.__init__(self, x, y, z, side)
         self.diameter = diameter
+
+
+class Pattern(Feature):
+    """A feature repeated in a grid or around a circle, e.g. the holes of a vent.
+
+    The pattern holds the feature at its first position, the tool, and the vectors to the other positions.
+    A grid has count1 by count2 positions, at i * step1 + j * step2 from the tool.
+    A polar pattern has count1 positions around a circle,
+    the center is at -step1 from the tool and step2 is step1 rotated 90 degrees in the plane of the circle.
+    The location of the pattern is the location of the tool.
+
+    Args:
+        feature: The feature at the first position of the pattern.
+        step1: The (x, y, z) vector between the columns of a grid, or from the center to the tool on a polar pattern.
+        count1: The number of columns in the grid, or the number of positions on a polar pattern.
+        step2: The (x, y, z) vector between the rows of the grid, or the second axis of a polar pattern.
+        count2: The number of rows in the grid, always one on a polar pattern.
+        kind: The type of pattern, grid or polar.
+        mask: The (column, row) of positions to leave out.
+
+    Raises:
+        ValueError: When a count is less than one or a masked position is not in the pattern.
+    """
+
+    __slots__ = ("count1", "count2", "feature", "kind", "mask", "name", "step1", "step2", "type")
+
+    def __init__(
+        self,
+        feature: Feature,
+        step1: tuple[float, float, float],
+        count1: int,
+        step2: tuple[float, float, float] = (0.0, 0.0, 0.0),
+        count2: int = 1,
+        *,
+        kind: str = "grid",
+        mask: list[tuple[int, int]] | None = None,
+    ):
+        if kind not in ("grid", "polar"):
+            msg = f"kind: {kind} is not one of grid or polar."
+            raise ValueError(msg)
+        if kind == "polar" and count2 != 1:
+            msg = "A polar pattern has one row, count2 must be 1."
+            raise ValueError(msg)
+        if int(count1) < 1 or int(count2) < 1:
+            msg = f"The counts of a pattern must be at least 1, not {count1} and {count2}."
+            raise ValueError(msg)
+        for column, row in mask or []:
+            if not (0 <= int(column) < int(count1) and 0 <= int(row) < int(count2)):
+                msg = f"The masked position ({column}, {row}) is not in the {count1} by {count2} pattern."
+                raise ValueError(msg)
+        self.feature = feature
+        self.name = "pattern"
+        self.type = feature.type
+        self.kind = kind
+        self.step1 = [float(value) for value in step1]
+        self.count1 = int(count1)
+        self.step2 = [float(value) for value in step2]
+        self.count2 = int(count2)
+        self.mask = sorted([int(i), int(j)] for i, j in mask or [])
+
+    @property
+    def x(self) -> float:
+        return self.feature.x
+
+    @x.setter
+    def x(self, value: float):
+        self.feature.x = value
+
+    @property
+    def y(self) -> float:
+        return self.feature.y
+
+    @y.setter
+    def y(self, value: float):
+        self.feature.y = value
+
+    @property
+    def z(self) -> float:
+        return self.feature.z
+
+    @z.setter
+    def z(self, value: float):
+        self.feature.z = value
+
+    @property
+    def side(self) -> str:
+        return self.feature.side
+
+    @side.setter
+    def side(self, value: str):
+        self.feature.side = value
+
+    @property
+    def depth(self) -> float:
+        """The depth of the tool, set when the pattern is subtracted from another part."""
+        return self.feature.depth
+
+    @depth.setter
+    def depth(self, value: float):
+        self.feature.depth = value
+
+    def export(self) -> dict:
+        """Create a dictionary holding a representation of the pattern.
+
+        Returns:
+            A serialised representation of the pattern, the tool is in "feature".
+        """
+        return {
+            "name": self.name,
+            "type": self.type,
+            "x": self.x,
+            "y": self.y,
+            "z": self.z,
+            "side": self.side,
+            "kind": self.kind,
+            "step1": list(self.step1),
+            "count1": self.count1,
+            "step2": list(self.step2),
+            "count2": self.count2,
+            "mask": [list(position) for position in self.mask],
+            "feature": self.feature.export(),
+        }
+
+    def swap_xy(self, rot: float, rotmax: list) -> list:
+        """Rotate the pattern while holding top where it is.
+
+        Args:
+            rot: the number of times to perform the swap.
+            rotmax: the maximum values for the swap.
+
+        Returns:
+            New location of relevant max of (x,y,z). useful when doing repeated swaps.
+        """
+        for step in (self.step1, self.step2):
+            for _ in range(int(rot)):
+                step[0], step[1] = -step[1], step[0]
+        return self.feature.swap_xy(rot=rot, rotmax=rotmax)
+
+    def swap_xz(self, rot: float, rotmax: list) -> list:
+        """Rotate the pattern while holding front where it is.
+
+        Args:
+            rot: the number of times to perform the swap.
+            rotmax: the maximum values for the swap.
+
+        Returns:
+            New location of relevant max of (x,y,z). useful when doing repeated swaps.
+        """
+        for step in (self.step1, self.step2):
+            for _ in range(int(rot)):
+                step[0], step[2] = step[2], -step[0]
+        return self.feature.swap_xz(rot=rot, rotmax=rotmax)
+
+    def swap_yz(self, rot: float, rotmax: list) -> list:
+        """Rotate the pattern while holding left where it is.
+
+        Args:
+            rot: the number of times to perform the swap.
+            rotmax: the maximum values for the swap.
+
+        Returns:
+            New location of relevant max of (x,y,z). useful when doing repeated swaps.
+        """
+        for step in (self.step1, self.step2):
+            for _ in range(int(rot)):
+                step[1], step[2] = -step[2], step[1]
+        return self.feature.swap_yz(rot=rot, rotmax=rotmax)
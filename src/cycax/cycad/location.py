@@ -2,6 +2,8 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+from collections import namedtuple
+
 # global location variables
 LEFT = "LEFT"
 RIGHT = "RIGHT"
@@ -13,6 +15,42 @@ REAR = BACK
 
 SIDES = (LEFT, RIGHT, TOP, BOTTOM, FRONT, BACK)
 
+# The center of a part or assembly.
+Coordinate = namedtuple("Coordinate", ["x", "y", "z"])
+
+# Coordinates are snapped to a grid with this many decimals in mm, 6 decimals is a nanometre.
+# Values on the grid compare exactly, e.g. a feature that lies on a side of a part after a chain of moves
+# and rotations, and the same part always exports the same values. Set it before the parts are made.
+GRID_DECIMALS = 6
+
+
+def snap(value: float) -> float:
+    """Snap a coordinate to the grid, see GRID_DECIMALS.
+
+    Args:
+        value: The coordinate.
+
+    Returns:
+        The nearest value on the grid, -0.0 is returned as 0.0.
+    """
+    # Adding 0.0 turns -0.0 into 0.0.
+    return round(float(value), GRID_DECIMALS) + 0.0
+
+
+class _Snapped:
+    """A coordinate of a location, the value is snapped to the grid when it is set."""
+
+    def __set_name__(self, owner, name: str):
+        self.attribute = f"_{name}"
+
+    def __get__(self, location, owner=None) -> float:
+        if location is None:
+            return self
+        return getattr(location, self.attribute)
+
+    def __set__(self, location, value: float):
+        setattr(location, self.attribute, snap(value))
+
 
 class Location:
     """The location of an object in 3D space.
@@ -26,10 +64,15 @@ class Location:
             This will be one of TOP, BOTTOM, LEFT, RIGHT, FRONT, BACK.
     """
 
+    __slots__ = ("_x", "_y", "_z", "side")
+    x = _Snapped()
+    y = _Snapped()
+    z = _Snapped()
+
     def __init__(self, x: float, y: float, z: float, side: str):
-        self.x = float(x)
-        self.y = float(y)
-        self.z = float(z)
+        self._x = snap(x)
+        self._y = snap(y)
+        self._z = snap(z)
         self.side = side
 
     def __repr__(self) -> str:
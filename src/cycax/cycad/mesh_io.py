@@ -0,0 +1,238 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Binary STL input and output on top of NumPy structured arrays.
+
+Binary STL files are memory-mapped, the triangles are never copied into memory unless they are modified.
+The structured array uses the same layout as the file (and numpy-stl), so writing is a straight dump of the array.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import numpy as np
+
+HEADER_SIZE = 80
+DATA_OFFSET = HEADER_SIZE + 4  # The header is followed by a uint32 triangle count.
+STL_DTYPE = np.dtype([("normals", "<f4", (3,)), ("vectors", "<f4", (3, 3)), ("attr", "<u2", (1,))])
+CHUNK_SIZE = 1_000_000  # Triangles per chunk when streaming, 50MB of STL data.
+
+
+def _triangle_count(path: Path) -> int | None:
+    """Return the triangle count from the header of a binary STL, or None when the file is not binary STL."""
+    size = path.stat().st_size
+    if size < DATA_OFFSET:
+        return None
+    with path.open("rb") as fh:
+        fh.seek(HEADER_SIZE)
+        (count,) = struct.unpack("<I", fh.read(4))
+    if size != DATA_OFFSET + count * STL_DTYPE.itemsize:
+        return None
+    return count
+
+
+def is_binary_stl(path: Path | str) -> bool:
+    """Check if a file is a binary STL.
+
+    The check is based on the file size matching the triangle count in the header.
+    Binary files that start with "solid" are correctly detected.
+
+    Args:
+        path: The STL file.
+
+    Returns:
+        True if the file is a binary STL file.
+    """
+    return _triangle_count(Path(path)) is not None
+
+
+def _read_ascii_stl(path: Path) -> np.ndarray:
+    normals = []
+    vertices = []
+    with path.open() as fh:
+        for line in fh:
+            words = line.split()
+            if not words:
+                continue
+            if words[0] == "facet":
+                normals.append([float(value) for value in words[2:5]])
+            elif words[0] == "vertex":
+                vertices.append([float(value) for value in words[1:4]])
+    triangles = np.zeros(len(normals), dtype=STL_DTYPE)
+    triangles["normals"] = np.asarray(normals, dtype="<f4").reshape(-1, 3)
+    triangles["vectors"] = np.asarray(vertices, dtype="<f4").reshape(-1, 3, 3)
+    return triangles
+
+
+def read_stl(path: Path | str, *, mmap: bool = True) -> np.ndarray:
+    """Read the triangles of a STL file.
+
+    Binary STL files are memory-mapped read only, nothing is loaded until it is accessed.
+    ASCII STL files cannot be mapped and are parsed into memory.
+
+    Args:
+        path: The STL file.
+        mmap: Memory-map binary files. When False the triangles are read into memory.
+
+    Returns:
+        A structured array with the fields normals, vectors and attr.
+    """
+    path = Path(path)
+    count = _triangle_count(path)
+    if count is None:
+        return _read_ascii_stl(path)
+    if count == 0:
+        return np.zeros(0, dtype=STL_DTYPE)
+    if mmap:
+        return np.memmap(path, dtype=STL_DTYPE, mode="r", offset=DATA_OFFSET, shape=(count,))
+    with path.open("rb") as fh:
+        fh.seek(DATA_OFFSET)
+        return np.fromfile(fh, dtype=STL_DTYPE, count=count)
+
+
+def triangles_from_mesh(vertices: Sequence, faces: Sequence) -> np.ndarray:
+    """Create STL triangles from an indexed mesh.
+
+    Args:
+        vertices: The (x, y, z) of every vertex.
+        faces: Three vertex indices per triangle.
+
+    Returns:
+        A structured array with the fields normals, vectors and attr.
+    """
+    points = np.asarray(vertices, dtype="<f4").reshape(-1, 3)
+    indices = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    triangles = np.zeros(len(indices), dtype=STL_DTYPE)
+    if len(indices):
+        vectors = points[indices]
+        triangles["vectors"] = vectors
+        triangles["normals"] = calculate_normals(vectors)
+    return triangles
+
+
+def calculate_normals(vectors: np.ndarray) -> np.ndarray:
+    """Calculate the unit normal of each triangle.
+
+    Args:
+        vectors: An (n, 3, 3) array of the triangle corners.
+
+    Returns:
+        An (n, 3) array of normals, degenerate triangles get a zero normal.
+    """
+    normals = np.cross(vectors[:, 1] - vectors[:, 0], vectors[:, 2] - vectors[:, 0])
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals.astype("<f4")
+
+
+class StlWriter:
+    """Stream triangles into a binary STL file.
+
+    The triangle count in the header is written when the writer is closed,
+    so the total does not have to be known upfront.
+
+    Example:
+        with StlWriter(path) as writer:
+            for triangles in chunks:
+                writer.write(triangles)
+
+    Args:
+        path: The STL file to write.
+        header: Up to 80 bytes of header text.
+    """
+
+    def __init__(self, path: Path | str, header: bytes = b"CyCAx binary STL"):
+        self.path = Path(path)
+        self.count = 0
+        self._fh = self.path.open("wb")
+        self._fh.write(header[:HEADER_SIZE].ljust(HEADER_SIZE, b"\0"))
+        self._fh.write(struct.pack("<I", 0))
+
+    def write(self, triangles: np.ndarray):
+        """Append triangles to the file.
+
+        Args:
+            triangles: A structured array with the STL dtype, or an (n, 3, 3) array of triangle corners.
+        """
+        if triangles.dtype != STL_DTYPE:
+            vectors = np.asarray(triangles, dtype="<f4").reshape(-1, 3, 3)
+            triangles = np.zeros(len(vectors), dtype=STL_DTYPE)
+            triangles["vectors"] = vectors
+            triangles["normals"] = calculate_normals(vectors)
+        for start in range(0, len(triangles), CHUNK_SIZE):
+            # tofile does not work on memory-maps opened in read mode, write through the buffer instead.
+            self._fh.write(np.ascontiguousarray(triangles[start : start + CHUNK_SIZE]).tobytes())
+        self.count += len(triangles)
+
+    def close(self):
+        """Write the triangle count and close the file."""
+        if self._fh.closed:
+            return
+        self._fh.seek(HEADER_SIZE)
+        self._fh.write(struct.pack("<I", self.count))
+        self._fh.close()
+
+    def __enter__(self) -> StlWriter:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_stl(path: Path | str, triangles: np.ndarray, header: bytes = b"CyCAx binary STL") -> Path:
+    """Write triangles to a binary STL file.
+
+    Args:
+        path: The STL file to write.
+        triangles: A structured array with the STL dtype, or an (n, 3, 3) array of triangle corners.
+        header: Up to 80 bytes of header text.
+
+    Returns:
+        The path of the STL file.
+    """
+    with StlWriter(path, header=header) as writer:
+        writer.write(triangles)
+    return writer.path
+
+
+def concatenate_stl(path: Path | str, sources: Iterable[Path | str]) -> Path:
+    """Concatenate several STL files into one binary STL file.
+
+    The sources are memory-mapped and copied in chunks, so the meshes are never fully loaded.
+
+    Args:
+        path: The STL file to write.
+        sources: The STL files to combine.
+
+    Returns:
+        The path of the combined STL file.
+    """
+    with StlWriter(path) as writer:
+        for source in sources:
+            writer.write(read_stl(source))
+    return writer.path
+
+
+def stl_bounds(triangles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the bounding box of the triangles, a chunk at a time.
+
+    Args:
+        triangles: A structured array with the STL dtype.
+
+    Returns:
+        The minimum and maximum (x, y, z) of all the vertices.
+    """
+    if len(triangles) == 0:
+        msg = "Cannot calculate the bounds of an empty mesh."
+        raise ValueError(msg)
+    low = np.full(3, np.inf, dtype="<f4")
+    high = np.full(3, -np.inf, dtype="<f4")
+    for start in range(0, len(triangles), CHUNK_SIZE):
+        vectors = triangles["vectors"][start : start + CHUNK_SIZE].reshape(-1, 3)
+        low = np.minimum(low, vectors.min(axis=0))
+        high = np.maximum(high, vectors.max(axis=0))
+    return low, high
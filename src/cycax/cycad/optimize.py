@@ -0,0 +1,115 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Optimizer pass over the features of a part specification, run before the specification is given to the engines.
+
+Features that cannot change the part are removed, the reason is one of:
+    duplicate: The feature has the same values as a later feature, see cycax.cycad.features.feature_key.
+    outside: The cut does not intersect any of the added features.
+    contained: The cut lies inside a rectangle (cube) cut that removes it anyway.
+
+When no feature is added after the first cut, the order of the cuts does not matter to any engine
+and the cuts are grouped by kind.
+"""
+
+import logging
+
+from cycax.cycad.features import feature_key
+from cycax.cycad.spatial import Bounds, FeatureIndex, feature_bounds
+
+# Distance in mm that bounds may overlap or stick out before it counts.
+BOUNDS_TOLERANCE = 1e-6
+
+
+def _overlap(bounds1: Bounds, bounds2: Bounds) -> bool:
+    """Check if two bounding boxes share some volume."""
+    return all(
+        bounds1[0][axis] < bounds2[1][axis] - BOUNDS_TOLERANCE
+        and bounds2[0][axis] < bounds1[1][axis] - BOUNDS_TOLERANCE
+        for axis in range(3)
+    )
+
+
+def _contains(outer: Bounds, inner: Bounds) -> bool:
+    """Check if the inner bounding box is inside the outer bounding box."""
+    return all(
+        outer[0][axis] - BOUNDS_TOLERANCE <= inner[0][axis] and inner[1][axis] <= outer[1][axis] + BOUNDS_TOLERANCE
+        for axis in range(3)
+    )
+
+
+def optimize_features(features: list[dict]) -> tuple[list[dict], list[dict]]:
+    """Remove the features that cannot change the part and group the cuts by kind.
+
+    Args:
+        features: The features of a part specification, in order.
+
+    Returns:
+        The optimized features and the removed features, each removed feature as a dict with its "reason" and "feature".
+    """
+    bounds = [feature_bounds(feature) for feature in features]
+    adds = [index for index, feature in enumerate(features) if feature["type"] == "add"]
+    removed = {}
+
+    # Adding or cutting the same feature twice has no effect, the last one is kept as it is not undone by later adds.
+    keys = [feature_key(feature) for feature in features]
+    last = {key: index for index, key in enumerate(keys)}
+    for index, key in enumerate(keys):
+        if last[key] != index:
+            removed[index] = "duplicate"
+
+    cuts = [
+        index
+        for index, feature in enumerate(features)
+        if feature["type"] == "cut" and index not in removed and bounds[index] is not None
+    ]
+    positions = {id(feature): index for index, feature in enumerate(features)}
+    if adds and None not in (bounds[index] for index in adds):
+        bodies = FeatureIndex(features[index] for index in adds)
+        for index in cuts:
+            nearby = bodies.intersecting(*bounds[index])
+            if not any(_overlap(bounds[index], bounds[positions[id(body)]]) for body in nearby):
+                removed[index] = "outside"
+
+    containers = FeatureIndex(features[index] for index in cuts if features[index]["name"] == "cube")
+    for index in cuts:
+        if index in removed:
+            continue
+        for container in (positions[id(feature)] for feature in containers.intersecting(*bounds[index])):
+            if container == index or container in removed or not _contains(bounds[container], bounds[index]):
+                continue
+            # A rectangle cut before this cut does not remove the features added between them.
+            if container > index or not any(container < add < index for add in adds):
+                removed[index] = "contained"
+                break
+
+    kept = [feature for index, feature in enumerate(features) if index not in removed]
+    first_cut = next((index for index, feature in enumerate(kept) if feature["type"] == "cut"), len(kept))
+    if all(feature["type"] == "cut" for feature in kept[first_cut:]):
+        kinds = {}
+        for feature in kept[first_cut:]:
+            kinds.setdefault(feature["name"], len(kinds))
+        kept[first_cut:] = sorted(kept[first_cut:], key=lambda feature: kinds[feature["name"]])
+
+    report = [{"reason": removed[index], "feature": features[index]} for index in sorted(removed)]
+    return kept, report
+
+
+def optimize_spec(spec: dict) -> tuple[dict, list[dict]]:
+    """Optimize the features of a part specification.
+
+    Args:
+        spec: The part specification, as exported by CycadPart.export().
+
+    Returns:
+        A new part specification with the optimized features and the features that were removed.
+    """
+    features, removed = optimize_features(spec["features"])
+    for item in removed:
+        logging.debug("Removed %s feature %s from '%s'.", item["reason"], item["feature"]["name"], spec["name"])
+    if removed:
+        logging.info(
+            "Optimizer removed %d of %d features from '%s'.", len(removed), len(spec["features"]), spec["name"]
+        )
+    return {**spec, "features": features}, removed
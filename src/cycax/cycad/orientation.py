@@ -0,0 +1,101 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""The 24 axis aligned orientations that parts and assemblies can be rotated to.
+
+Rotations are given as a string of actions, each of x, y or z is a 90 degree counter clockwise rotation around that
+axis. The actions are applied in order around the fixed axes, e.g. "xz" rotates around x and then around z.
+Every string of actions gives one of 24 orientations, ORIENTATIONS holds the shortest actions for each.
+"""
+
+from functools import lru_cache
+
+Matrix = tuple[tuple[int, int, int], tuple[int, int, int], tuple[int, int, int]]
+
+IDENTITY: Matrix = ((1, 0, 0), (0, 1, 0), (0, 0, 1))
+ROTATIONS: dict[str, Matrix] = {
+    "x": ((1, 0, 0), (0, 0, -1), (0, 1, 0)),
+    "y": ((0, 0, 1), (0, 1, 0), (-1, 0, 0)),
+    "z": ((0, -1, 0), (1, 0, 0), (0, 0, 1)),
+}
+
+
+def _multiply(matrix1: Matrix, matrix2: Matrix) -> Matrix:
+    """Multiply two matrices, the result applies matrix2 first and then matrix1."""
+    return tuple(
+        tuple(sum(matrix1[row][index] * matrix2[index][column] for index in range(3)) for column in range(3))
+        for row in range(3)
+    )
+
+
+@lru_cache(maxsize=1024)
+def rotation_matrix(actions: str) -> Matrix:
+    """Calculate the rotation matrix of a string of actions.
+
+    Args:
+        actions: The rotations, e.g. "xxyz", upper case actions are allowed.
+
+    Returns:
+        The rotation matrix.
+
+    Raises:
+        ValueError: When the given actions contains a string that is non x, y, or z.
+    """
+    matrix = IDENTITY
+    for action in actions:
+        rotation = ROTATIONS.get(action.lower())
+        if rotation is None:
+            msg = f"""The actions permissable by rotate are 'x', 'y' or 'z'.
+                    {action} is not one of the permissable actions."""
+            raise ValueError(msg)
+        matrix = _multiply(rotation, matrix)
+    return matrix
+
+
+def _shortest_actions() -> dict[Matrix, str]:
+    """Find the shortest actions for each orientation, the first in alphabetical order when there is a choice."""
+    orientations = {IDENTITY: ""}
+    found = [IDENTITY]
+    while found:
+        reached = []
+        for matrix in found:
+            for action, rotation in ROTATIONS.items():
+                rotated = _multiply(rotation, matrix)
+                if rotated not in orientations:
+                    orientations[rotated] = orientations[matrix] + action
+                    reached.append(rotated)
+        found = reached
+    return orientations
+
+
+ORIENTATIONS: dict[Matrix, str] = _shortest_actions()
+
+
+@lru_cache(maxsize=1024)
+def normalize(actions: str) -> str:
+    """Reduce a string of actions to the shortest actions that give the same orientation.
+
+    Args:
+        actions: The rotations, e.g. "xxyz".
+
+    Returns:
+        The shortest actions, e.g. "xxxx" gives "" and "zzzzz" gives "z".
+    """
+    return ORIENTATIONS[rotation_matrix(actions)]
+
+
+@lru_cache(maxsize=32)
+def axis_order(matrix: Matrix) -> tuple[int, int, int]:
+    """The axis that each axis comes from after a rotation.
+
+    Rotating swaps the bounds along the axes, e.g. after a rotation around z the bounds along x are the bounds
+    that were along y.
+
+    Args:
+        matrix: The rotation matrix.
+
+    Returns:
+        For each of x, y and z the index of the axis that it was before the rotation.
+    """
+    return tuple(next(column for column in range(3) if row[column]) for row in matrix)
@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from cycax.cycad.cycad_part import CycadPart
+
+if TYPE_CHECKING:
+    from cycax.cycad.assembly import Assembly
+    from cycax.cycad.spatial import FeatureIndex
+
+
+class _InstanceFeatures(tuple):
+    """The features of an instance, they can be read but features cannot be added.
+
+    Args:
+        features: The features of the part definition.
+        part_no: The part number of the part definition.
+    """
+
+    def __new__(cls, features, part_no: str):
+        instance_features = super().__new__(cls, features)
+        instance_features.part_no = part_no
+        return instance_features
+
+    def append(self, _feature):
+        """Features cannot be added to an instance, the part definition is shared with other instances.
+
+        Raises:
+            ValueError: Always.
+        """
+        msg = f"Cannot add features to an instance, add them to the part {self.part_no}."
+        raise ValueError(msg)
+
+    def extend(self, _features):
+        """Features cannot be added to an instance, see append.
+
+        Raises:
+            ValueError: Always.
+        """
+        self.append(_features)
+
+
+class PartInstance(CycadPart):
+    """A placed copy of a part that shares the definition of the part.
+
+    An instance only has its own position, rotation, colour and name. Everything else, like the size and the features,
+    comes from the part it was made from, the definition of the part is not run again.
+    Use instances for the many screws or fans of an assembly, the part is only saved and built once.
+    The features of an instance cannot be changed, change the features of the part instead.
+
+    Args:
+        part: The part definition, the instance starts where this part is, with the same rotation.
+        colour: The colour of the instance, defaults to the colour of the part.
+        assembly: The assembly this instance is a component of.
+    """
+
+    def __init__(self, part: CycadPart, colour: str | None = None, assembly: Assembly | None = None):
+        # CycadPart.__init__ is not called, it would run the definition of the part again.
+        self.part = part.part if isinstance(part, PartInstance) else part
+        self._name: str = ""
+        self._base_path = part._base_path
+        self.colour = colour or part.colour
+        self.position = list(part.position)
+        self.rotation = [dict(rotation) for rotation in part.rotation]
+        self._x_min, self._y_min, self._z_min = part.x_min, part.y_min, part.z_min
+        self._x_max, self._y_max, self._z_max = part.x_max, part.y_max, part.z_max
+        self._bounding_box = None
+        self._center = None
+        self._assemblies = []
+        self.assembly = assembly
+        if assembly:
+            assembly.add(self)
+
+    def __getattr__(self, name: str):
+        # Only called for attributes the instance does not have, those come from the part definition.
+        if name == "part":
+            raise AttributeError(name)
+        return getattr(self.part, name)
+
+    def __repr__(self) -> str:
+        return f"PartInstance({self.part_no}) position={self.position}"
+
+    @property
+    def part_no(self) -> str:
+        """The part number of the part definition."""
+        return self.part.part_no
+
+    @property
+    def features(self) -> tuple:
+        """The features of the part definition, features cannot be added to an instance."""
+        return _InstanceFeatures(self.part.features, self.part_no)
+
+    @features.setter
+    def features(self, _features: list):
+        msg = f"Cannot change the features of an instance, change the features of the part {self.part_no}."
+        raise ValueError(msg)
+
+    @property
+    def external_features(self) -> tuple:
+        """The features the part definition subtracts from the parts it is leveled with."""
+        return _InstanceFeatures(self.part.external_features, self.part_no)
+
+    def spec(self, *, optimize: bool = True) -> dict:
+        """The specification of the part definition, shared with the other instances."""
+        return self.part.spec(optimize=optimize)
+
+    @property
+    def feature_index(self) -> FeatureIndex:
+        """Spatial index over the features of the part definition."""
+        return self.part.feature_index
+
+    def insert_feature(self, feature):  # noqa: ARG002 Unused argument
+        """Features cannot be subtracted from an instance, the part definition is shared with other instances.
+
+        Raises:
+            ValueError: Always.
+        """
+        msg = f"Cannot subtract features from an instance, subtract from the part {self.part_no}."
+        raise ValueError(msg)
+
+    def merge(self, part2: CycadPart):  # noqa: ARG002 Unused argument
+        """Instances cannot be merged, the part definition is shared with other instances.
+
+        Raises:
+            ValueError: Always.
+        """
+        msg = f"Cannot merge an instance, merge the part {self.part_no}."
+        raise ValueError(msg)
@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Quality profiles that set the resolution of the generated models.
+
+Every profile sets the same keys in the engine config:
+    fn: Number of facets on a full circle in OpenSCAD ($fn).
+    tolerance: Linear deflection in mm of the mesh from the surface (Build123d and FreeCAD).
+    angular_tolerance: Angular deflection in radians of the mesh from the surface (Build123d and FreeCAD).
+"""
+
+import json
+
+DEFAULT_QUALITY = "default"
+
+QUALITY_PROFILES = {
+    "preview": {"fn": 16, "tolerance": 0.1, "angular_tolerance": 0.5},
+    "default": {"fn": 64, "tolerance": 1e-3, "angular_tolerance": 0.1},
+    "production": {"fn": 128, "tolerance": 5e-4, "angular_tolerance": 0.05},
+}
+
+
+def get_quality(quality: str | None = None) -> dict:
+    """Get the settings of a quality profile.
+
+    Args:
+        quality: Name of the profile, one of preview, default or production.
+
+    Returns:
+        A copy of the profile settings.
+
+    Raises:
+        ValueError: The quality profile does not exist.
+    """
+    name = (quality or DEFAULT_QUALITY).lower()
+    if name not in QUALITY_PROFILES:
+        msg = f"quality: {quality} is not one of {', '.join(QUALITY_PROFILES)}."
+        raise ValueError(msg)
+    return dict(QUALITY_PROFILES[name])
+
+
+def apply_quality(config: dict | None, quality: str | None = None) -> dict:
+    """Add the settings of a quality profile to an engine config.
+
+    Settings already in the config are kept, they override the profile.
+
+    Args:
+        config: The engine config.
+        quality: Name of the profile, the config's "quality" or the default profile is used when not given.
+
+    Returns:
+        A new engine config with the quality settings.
+    """
+    config = dict(config or {})
+    quality = quality or config.get("quality") or DEFAULT_QUALITY
+    profile = get_quality(quality)
+    profile.update(config)
+    profile["quality"] = quality.lower()
+    return profile
+
+
+def quality_key(config: dict) -> str:
+    """The quality settings of an engine config as a string, used to tell builds at different qualities apart.
+
+    Args:
+        config: The engine config.
+
+    Returns:
+        The quality settings in the config, resolved against the default profile.
+    """
+    settings = get_quality(config.get("quality"))
+    settings.update({key: config[key] for key in settings if key in config})
+    return json.dumps(settings, sort_keys=True)
@@ -0,0 +1,254 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Canonical JSON for part and assembly specifications.
+
+The same specification always gives the same bytes: keys are sorted, there are no spaces and floats are snapped
+to the coordinate grid, see cycax.cycad.location.GRID_DECIMALS. The bytes that are saved are the bytes that are hashed,
+so a spec is only hashed once and the hash does not change when the code that makes the spec is refactored.
+
+The bytes are always made by the json module of the standard library, the other JSON libraries format floats
+differently, e.g. orjson writes 5e-05 as 5e-5, and the hash would depend on the libraries that are installed.
+orjson is used to read specs when it is installed.
+
+Specs with many features can be saved in a compact binary format instead, in a file with BINARY_SUFFIX.
+Every list of dicts in the spec, like the features, is stored as a table per kind of dict, the keys once and
+the values in columns. The tables are saved as canonical JSON compressed with zlib, after BINARY_MAGIC.
+load_spec reads both formats.
+"""
+
+import json
+import math
+import os
+import threading
+import zlib
+from pathlib import Path
+
+import xxhash
+
+from cycax.cycad.location import snap
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bump when the layout of the specifications changes, all specs then hash to new values.
+SCHEMA_VERSION = 1
+# The start of a binary spec file, followed by the zlib compressed tables.
+BINARY_MAGIC = b"CYCAXSPEC1\n"
+BINARY_SUFFIX = ".cyspec"
+JSON_SUFFIX = ".json"
+
+
+def _normalize(value):
+    """Snap the floats to the grid, turn tuples into lists and sets into sorted lists, recursively."""
+    if isinstance(value, float):
+        if not math.isfinite(value):
+            msg = f"Cannot save {value} in a specification, only finite numbers can be saved."
+            raise ValueError(msg)
+        return snap(value)
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_normalize(item) for item in value]
+    if isinstance(value, set | frozenset):
+        return sorted(_normalize(item) for item in value)
+    return value
+
+
+def canonical_json(data: dict) -> bytes:
+    """Serialize a specification to canonical JSON.
+
+    Args:
+        data: The specification, as exported by CycadPart.export() or Assembly.export().
+
+    Returns:
+        The UTF-8 encoded JSON.
+
+    Raises:
+        ValueError: When the specification holds a NaN or infinite float.
+    """
+    data = _normalize(data)
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("UTF-8")
+
+
+def spec_hash(content: bytes) -> str:
+    """Hash the canonical JSON of a specification.
+
+    Args:
+        content: The bytes returned by canonical_json or read from a saved specification.
+
+    Returns:
+        The xxHash64 in hexadecimal, seeded with SCHEMA_VERSION.
+    """
+    return xxhash.xxh64(content, seed=SCHEMA_VERSION).hexdigest()
+
+
+def geometry_hash(data: dict) -> str:
+    """Hash a part specification without its name.
+
+    Parts with different part numbers but the same geometry have the same geometry hash, they build to the same files.
+
+    Args:
+        data: The part specification, as returned by CycadPart.spec().
+
+    Returns:
+        The hash of the canonical JSON of the specification, see spec_hash.
+    """
+    return spec_hash(canonical_json({**data, "name": ""}))
+
+
+def _table(rows: list[dict]) -> dict:
+    """Store a list of dicts as a table for every set of keys, the values in columns."""
+    kinds = {}
+    order = []
+    for row in rows:
+        keys = tuple(sorted(row))
+        if keys not in kinds:
+            kinds[keys] = (len(kinds), [[] for _ in keys])
+        kind, columns = kinds[keys]
+        order.append(kind)
+        for column, key in zip(columns, keys, strict=True):
+            column.append(row[key])
+    return {
+        "kinds": [{"keys": list(keys), "columns": columns} for keys, (_kind, columns) in kinds.items()],
+        "order": order,
+    }
+
+
+def _rows(table: dict) -> list[dict]:
+    """The list of dicts stored in a table."""
+    kinds = [
+        iter([dict(zip(kind["keys"], values, strict=True)) for values in zip(*kind["columns"], strict=True)])
+        for kind in table["kinds"]
+    ]
+    return [next(kinds[kind]) for kind in table["order"]]
+
+
+def binary_spec(data: dict) -> bytes:
+    """Serialize a specification to the binary format.
+
+    Args:
+        data: The specification, as exported by CycadPart.export() or Assembly.export().
+
+    Returns:
+        The binary spec, the same specification always gives the same bytes.
+    """
+    data = _normalize(data)
+    tables = {}
+    values = {}
+    for key, value in data.items():
+        if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+            tables[key] = _table(value)
+        else:
+            values[key] = value
+    return BINARY_MAGIC + zlib.compress(canonical_json({"tables": tables, "values": values}), 9)
+
+
+def loads_spec(content: bytes) -> dict:
+    """Read a specification from the bytes of a JSON or binary spec file.
+
+    Args:
+        content: The content of the file.
+
+    Returns:
+        The specification.
+    """
+    loads = json.loads if orjson is None else orjson.loads
+    if not content.startswith(BINARY_MAGIC):
+        return loads(content)
+    packed = loads(zlib.decompress(content[len(BINARY_MAGIC) :]))
+    data = packed["values"]
+    for key, table in packed["tables"].items():
+        data[key] = _rows(table)
+    return data
+
+
+def load_spec(file_path: Path) -> dict:
+    """Read a JSON or binary spec file.
+
+    Args:
+        file_path: The spec file.
+
+    Returns:
+        The specification.
+    """
+    return loads_spec(file_path.read_bytes())
+
+
+def spec_file(file_path: Path) -> Path:
+    """Find the saved spec file, the binary file is used when there is no JSON file.
+
+    Args:
+        file_path: The spec file with or without a suffix, e.g. build/fan/fan.json.
+
+    Returns:
+        The path of the JSON spec file, or the binary spec file when only that exists.
+    """
+    json_path = file_path.with_suffix(JSON_SUFFIX)
+    binary_path = file_path.with_suffix(BINARY_SUFFIX)
+    if not json_path.exists() and binary_path.exists():
+        return binary_path
+    return json_path
+
+
+def file_state(file_path: Path) -> tuple[int, int] | None:
+    """The size and modification time of a file, used to tell if a saved file was changed.
+
+    Args:
+        file_path: The file.
+
+    Returns:
+        The size and the modification time in ns, None when the file does not exist.
+    """
+    try:
+        stat = file_path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_if_changed(file_path: Path, content: bytes) -> bool:
+    """Write a file through a temporary file that is renamed, so a reader never sees a partly written file.
+
+    The file is not written when it already holds the content, its modification time is kept.
+
+    Args:
+        file_path: The file to write.
+        content: The new content of the file.
+
+    Returns:
+        True when the file was written.
+    """
+    state = file_state(file_path)
+    if state is not None and state[0] == len(content) and file_path.read_bytes() == content:
+        return False
+    temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        temp_path.write_bytes(content)
+        temp_path.replace(file_path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return True
+
+
+def save_spec(file_path: Path, data: dict, *, binary: bool = False) -> str:
+    """Save a specification as canonical JSON or in the binary format.
+
+    The file with the other suffix is removed, a spec is only ever saved in one format.
+    The file is only written when its content changes, see write_if_changed.
+
+    Args:
+        file_path: The file to write, the suffix is set to JSON_SUFFIX or BINARY_SUFFIX.
+        data: The specification.
+        binary: Save in the binary format.
+
+    Returns:
+        The hash of the saved bytes, see spec_hash.
+    """
+    content = binary_spec(data) if binary else canonical_json(data)
+    write_if_changed(file_path.with_suffix(BINARY_SUFFIX if binary else JSON_SUFFIX), content)
+    file_path.with_suffix(JSON_SUFFIX if binary else BINARY_SUFFIX).unlink(missing_ok=True)
+    return spec_hash(content)
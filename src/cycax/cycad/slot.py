@@ -2,7 +2,7 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
-from cycax.cycad.features import Holes, RectangleCutOut
+from cycax.cycad.features import Holes, RectangleCutOut, SlotCutOut
 from cycax.cycad.location import BACK, BOTTOM, FRONT, LEFT, RIGHT, TOP
 
 
@@ -25,6 +25,8 @@ class Slot:
         y_size: The location of y_size of slot.
         z_size: The location of z_size of slot.
         horizontal: This can be overridden if you need a vertical slot.
+        feature: The slot as a single SlotCutOut feature, made from hole_left and hole_right.
+            The rectangle between the holes is kept for engines and code that still work with the three features.
 
     """
 
@@ -214,3 +216,18 @@ class Slot:
                     z_size=z_size - y_size,
                 )
                 self.rectangle.__calc__()
+
+        left = (self.hole_left.x, self.hole_left.y, self.hole_left.z)
+        right = (self.hole_right.x, self.hole_right.y, self.hole_right.z)
+        distances = [abs(end - start) for start, end in zip(left, right, strict=True)]
+        axis = distances.index(max(distances))
+        self.feature = SlotCutOut(
+            side=side,
+            x=(left[0] + right[0]) / 2,
+            y=(left[1] + right[1]) / 2,
+            z=(left[2] + right[2]) / 2,
+            length=distances[axis],
+            diameter=self.hole_left.diameter,
+            depth=self.hole_left.depth,
+            axis="xyz"[axis],
+        )
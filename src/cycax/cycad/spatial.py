@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Spatial index over the bounding boxes of features, for region queries."""
+
+from collections.abc import Iterable
+from itertools import product
+from math import floor
+
+from cycax.cycad.engines.utils import CUT_DIRECTION, pattern_offsets, slot_ends
+from cycax.cycad.location import BACK, RIGHT, TOP
+
+# The largest feature spans at most this many cells along an axis, this limits the size of the grid.
+MAX_CELLS_PER_AXIS = 16
+
+Bounds = tuple[tuple[float, float, float], tuple[float, float, float]]
+
+
+def feature_bounds(feature: dict) -> Bounds | None:
+    """Calculate the axis aligned bounding box of a feature.
+
+    Args:
+        feature: Any feature of a part specification.
+
+    Returns:
+        The (low, high) corners of the bounding box, None when the bounds of the feature are not known.
+    """
+    name = feature["name"]
+    if name not in ("pattern", "cube", "sphere", "hole", "cylinder_feature", "nut", "slot"):
+        return None
+    position = (feature["x"], feature["y"], feature["z"])
+    if name == "pattern":
+        tool = feature_bounds(feature["feature"])
+        offsets = pattern_offsets(feature)
+        if tool is None or not offsets:
+            return None
+        low = tuple(tool[0][axis] + min(offset[axis] for offset in offsets) for axis in range(3))
+        high = tuple(tool[1][axis] + max(offset[axis] for offset in offsets) for axis in range(3))
+        return low, high
+    if name == "cube":
+        size = (feature["x_size"], feature["y_size"], feature["z_size"])
+        if feature.get("center"):
+            low = tuple(position[axis] - size[axis] / 2 for axis in range(3))
+        else:
+            move = {TOP: (0, 0, -size[2]), BACK: (0, -size[1], 0), RIGHT: (-size[0], 0, 0)}.get(
+                feature.get("side"), (0, 0, 0)
+            )
+            low = tuple(position[axis] + move[axis] for axis in range(3))
+        return low, tuple(low[axis] + size[axis] for axis in range(3))
+    if name == "sphere":
+        radius = feature["diameter"] / 2
+        return tuple(value - radius for value in position), tuple(value + radius for value in position)
+    direction = CUT_DIRECTION[feature["side"]]
+    if feature["type"] != "cut":
+        direction = tuple(-value for value in direction)
+    ends = slot_ends(feature) if name == "slot" else [position]
+    radius = feature["diameter"] / 2
+    low = []
+    high = []
+    for axis in range(3):
+        if direction[axis]:
+            depth = direction[axis] * feature["depth"]
+            low.append(min(position[axis], position[axis] + depth))
+            high.append(max(position[axis], position[axis] + depth))
+        else:
+            low.append(min(end[axis] for end in ends) - radius)
+            high.append(max(end[axis] for end in ends) + radius)
+    return tuple(low), tuple(high)
+
+
+class FeatureIndex:
+    """A uniform grid over the bounding boxes of features.
+
+    Every feature is stored in the grid cells its bounding box touches, a query only looks at the features in the
+    cells that the query touches. Features for which the bounds are not known, like beveled edges,
+    are not in the grid and are kept in unbounded.
+
+    Args:
+        features: Features, either Feature objects or exported features (dicts).
+        cell_size: The size in mm of a grid cell.
+            Defaults to the average size of the features, so that a feature is in a few cells,
+            but not less than the size of the largest feature divided by MAX_CELLS_PER_AXIS.
+
+    Attributes:
+        unbounded: The features that are not in the grid.
+    """
+
+    def __init__(self, features: Iterable, cell_size: float | None = None):
+        self._features = []
+        self._bounds = []
+        self._sides = {}
+        self.unbounded = []
+        for feature in features:
+            spec = feature if isinstance(feature, dict) else feature.export()
+            self._sides.setdefault(spec.get("side"), []).append(feature)
+            bounds = feature_bounds(spec)
+            if bounds is None:
+                self.unbounded.append(feature)
+            else:
+                self._features.append(feature)
+                self._bounds.append(bounds)
+
+        if cell_size is None:
+            sizes = [max(high[axis] - low[axis] for axis in range(3)) for low, high in self._bounds]
+            cell_size = max(sum(sizes) / len(sizes), max(sizes) / MAX_CELLS_PER_AXIS) if sizes else 1.0
+        self.cell_size = cell_size if cell_size > 0 else 1.0
+        self._cells = {}
+        for index, bounds in enumerate(self._bounds):
+            for cell in product(*self._cell_ranges(bounds)):
+                self._cells.setdefault(cell, []).append(index)
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def _cell_ranges(self, bounds: Bounds) -> list[range]:
+        """The range of cells along each axis that the bounds touch."""
+        low, high = bounds
+        return [range(floor(low[axis] / self.cell_size), floor(high[axis] / self.cell_size) + 1) for axis in range(3)]
+
+    def _candidates(self, bounds: Bounds) -> set[int]:
+        """The features in the cells that the bounds touch."""
+        ranges = self._cell_ranges(bounds)
+        candidates = set()
+        if len(ranges[0]) * len(ranges[1]) * len(ranges[2]) > len(self._cells):
+            # The query is larger than the occupied part of the grid, rather check every occupied cell.
+            for cell, indexes in self._cells.items():
+                if all(cell[axis] in ranges[axis] for axis in range(3)):
+                    candidates.update(indexes)
+        else:
+            for cell in product(*ranges):
+                candidates.update(self._cells.get(cell, ()))
+        return candidates
+
+    def intersecting(self, low: tuple[float, float, float], high: tuple[float, float, float]) -> list:
+        """Find the features whose bounding boxes intersect a box, touching counts as intersecting.
+
+        Args:
+            low: The (x, y, z) of the corner of the box nearest to the origin.
+            high: The (x, y, z) of the opposite corner of the box.
+
+        Returns:
+            The features, in the order they were given.
+        """
+        return [
+            self._features[index]
+            for index in sorted(self._candidates((low, high)))
+            if all(
+                self._bounds[index][0][axis] <= high[axis] and low[axis] <= self._bounds[index][1][axis]
+                for axis in range(3)
+            )
+        ]
+
+    def on_side(self, side: str) -> list:
+        """Find the features made from a side, including the features that are not in the grid.
+
+        Args:
+            side: One of TOP, BOTTOM, LEFT, RIGHT, FRONT, BACK.
+
+        Returns:
+            The features, in the order they were given.
+        """
+        return list(self._sides.get(side, []))
@@ -0,0 +1,205 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Geometric validation of part specifications, all the features of a part are checked at once on NumPy arrays.
+
+The checks are:
+    out_of_bounds: A cut sticks out of the bounding box of the added features of the part.
+    thin_wall: The wall between two holes, or between a hole and the side of the part, is thinner than min_wall.
+    overlapping_adds: Two added features overlap.
+
+A report is a dict that can be saved as JSON, it has the name of the part or assembly and a list of issues.
+Every issue has the check, the part, the indexes of the features in the features of the part specification,
+a message and, for thin walls, the wall thickness.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+from cycax.cycad.engines.utils import CUT_DIRECTION, expand_feature
+from cycax.cycad.spatial import feature_bounds
+
+# The thinnest wall in mm that is allowed between holes, or between a hole and the side of the part.
+DEFAULT_MIN_WALL = 1.0
+# Distance in mm that features may overlap or stick out before it counts.
+TOLERANCE = 1e-6
+# Number of holes compared against all the others at a time when checking the walls between holes.
+CHUNK_SIZE = 512
+
+
+def _bounds_array(features: list[dict]) -> np.ndarray:
+    """The bounds of the features as an (n, 2, 3) array, NaN where the bounds are not known."""
+    bounds = np.full((len(features), 2, 3), np.nan)
+    for index, feature in enumerate(features):
+        feature_box = feature_bounds(feature)
+        if feature_box is not None:
+            bounds[index] = feature_box
+    return bounds
+
+
+def _holes(features: list[dict]) -> tuple[np.ndarray, ...]:
+    """The holes of the part, also those in patterns, as arrays.
+
+    Returns:
+        The index of the feature, the cut axis, the center, the radius and the low and high bounds of every hole.
+    """
+    rows = []
+    for index, feature in enumerate(features):
+        for hole in expand_feature(feature) if feature["name"] == "pattern" else [feature]:
+            if hole["name"] != "hole":
+                continue
+            low, high = feature_bounds(hole)
+            axis = [abs(value) for value in CUT_DIRECTION[hole["side"]]].index(1)
+            rows.append((index, axis, hole["x"], hole["y"], hole["z"], hole["diameter"] / 2, *low, *high))
+    table = np.array(rows, dtype=float).reshape(-1, 12)
+    return (
+        table[:, 0].astype(int),
+        table[:, 1].astype(int),
+        table[:, 2:5],
+        table[:, 5],
+        table[:, 6:9],
+        table[:, 9:12],
+    )
+
+
+def _check_bounds(features: list[dict], bounds: np.ndarray, is_add: np.ndarray, is_cut: np.ndarray) -> list[dict]:
+    """Find the cuts that stick out of the bounding box of the added features."""
+    body_low = bounds[is_add, 0].min(axis=0)
+    body_high = bounds[is_add, 1].max(axis=0)
+    out = is_cut & ((bounds[:, 0] < body_low - TOLERANCE) | (bounds[:, 1] > body_high + TOLERANCE)).any(axis=1)
+    return [
+        {
+            "check": "out_of_bounds",
+            "features": [int(index)],
+            "message": f"The {features[index]['name']} sticks out of the part.",
+        }
+        for index in np.flatnonzero(out)
+    ]
+
+
+def _check_adds(features: list[dict], bounds: np.ndarray, is_add: np.ndarray) -> list[dict]:
+    """Find the added features that overlap."""
+    adds = np.flatnonzero(is_add)
+    low = bounds[adds, 0]
+    high = bounds[adds, 1]
+    overlap = ((low[:, None] < high[None, :] - TOLERANCE) & (low[None, :] < high[:, None] - TOLERANCE)).all(axis=2)
+    first, second = np.nonzero(np.triu(overlap, k=1))
+    return [
+        {
+            "check": "overlapping_adds",
+            "features": [int(adds[index1]), int(adds[index2])],
+            "message": f"The {features[adds[index1]]['name']} and {features[adds[index2]]['name']} overlap.",
+        }
+        for index1, index2 in zip(first, second, strict=True)
+    ]
+
+
+def _check_walls(features: list[dict], bounds: np.ndarray, is_add: np.ndarray, min_wall: float) -> list[dict]:
+    """Find the walls around holes that are thinner than min_wall."""
+    issues = []
+    indexes, axes, centers, radii, lows, highs = _holes(features)
+    body_low = bounds[is_add, 0].min(axis=0)
+    body_high = bounds[is_add, 1].max(axis=0)
+    for axis in range(3):
+        selected = np.flatnonzero(axes == axis)
+        if not len(selected):
+            continue
+        plane = [other for other in range(3) if other != axis]
+        points = centers[selected][:, plane]
+        radius = radii[selected]
+        low = lows[selected, axis]
+        high = highs[selected, axis]
+
+        # The wall between the hole and the sides of the part.
+        walls = np.minimum(points - body_low[plane], body_high[plane] - points).min(axis=1) - radius
+        for row in np.flatnonzero((walls > -TOLERANCE) & (walls < min_wall - TOLERANCE)):
+            issues.append(
+                {
+                    "check": "thin_wall",
+                    "features": [int(indexes[selected[row]])],
+                    "message": f"The wall between the hole and the side of the part is {walls[row]:.3f}mm.",
+                    "wall": float(walls[row]),
+                }
+            )
+
+        # The walls between holes that are next to each other, compared a chunk of holes at a time.
+        for start in range(0, len(selected), CHUNK_SIZE):
+            rows = slice(start, start + CHUNK_SIZE)
+            distance = np.linalg.norm(points[rows, None] - points[None, :], axis=2)
+            walls = distance - radius[rows, None] - radius[None, :]
+            thin = (walls > -TOLERANCE) & (walls < min_wall - TOLERANCE)
+            thin &= (low[rows, None] < high[None, :] - TOLERANCE) & (low[None, :] < high[rows, None] - TOLERANCE)
+            thin &= np.arange(start, start + thin.shape[0])[:, None] < np.arange(len(selected))[None, :]
+            for row, column in zip(*np.nonzero(thin), strict=True):
+                wall = float(walls[row, column])
+                issues.append(
+                    {
+                        "check": "thin_wall",
+                        "features": [int(indexes[selected[start + row]]), int(indexes[selected[column]])],
+                        "message": f"The wall between the holes is {wall:.3f}mm.",
+                        "wall": wall,
+                    }
+                )
+    return issues
+
+
+def validate_spec(spec: dict, *, min_wall: float = DEFAULT_MIN_WALL) -> list[dict]:
+    """Check all the features of a part specification.
+
+    Args:
+        spec: The part specification, as exported by CycadPart.export().
+        min_wall: The thinnest wall in mm that is allowed around holes.
+
+    Returns:
+        The issues found in the part.
+    """
+    features = spec["features"]
+    bounds = _bounds_array(features)
+    known = ~np.isnan(bounds).any(axis=(1, 2))
+    types = np.array([feature["type"] for feature in features])
+    is_add = known & (types == "add")
+    is_cut = known & (types == "cut")
+    issues = []
+    if is_add.any():
+        issues.extend(_check_bounds(features, bounds, is_add, is_cut))
+        issues.extend(_check_adds(features, bounds, is_add))
+        issues.extend(_check_walls(features, bounds, is_add, min_wall))
+    for issue in issues:
+        issue["part"] = spec["name"]
+    return issues
+
+
+def validate_part(part, *, min_wall: float = DEFAULT_MIN_WALL) -> dict:
+    """Check all the features of a part.
+
+    Args:
+        part: The CycadPart to check.
+        min_wall: The thinnest wall in mm that is allowed around holes.
+
+    Returns:
+        The report of the part.
+    """
+    return {"name": part.part_no, "issues": validate_spec(part.export(), min_wall=min_wall)}
+
+
+def validate_assembly(assembly, *, min_wall: float = DEFAULT_MIN_WALL) -> dict:
+    """Check all the features of every part in an assembly.
+
+    Parts with the same part number are only checked once.
+
+    Args:
+        assembly: The Assembly to check.
+        min_wall: The thinnest wall in mm that is allowed around holes.
+
+    Returns:
+        The report of the assembly, the issues of all its parts.
+    """
+    issues = []
+    checked = set()
+    for part in assembly.parts.values():
+        if part.part_no not in checked:
+            checked.add(part.part_no)
+            issues.extend(validate_spec(part.export(), min_wall=min_wall))
+    return {"name": assembly.name, "issues": issues}
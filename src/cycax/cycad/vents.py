@@ -61,7 +61,10 @@ class Vent:
         y_count = int((width + separation) / (diameter + separation))
         start_x = radius + self.x_min + (length - diameter * x_count - separation * (x_count - 1)) / 2
         start_y = radius + self.y_min + (width - diameter * y_count - separation * (y_count - 1)) / 2
-        for x, y in product(range(x_count), range(y_count)):
-            self.side.hole(
-                pos=(start_x + x * (diameter + separation), start_y + y * (diameter + separation)), diameter=diameter
+        if x_count > 0 and y_count > 0:
+            self.side.hole_grid(
+                pos=(start_x, start_y),
+                diameter=diameter,
+                spacing=(diameter + separation, diameter + separation),
+                count=(x_count, y_count),
             )
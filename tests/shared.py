@@ -9,6 +9,8 @@ from pathlib import Path
 import numpy as np
 from stl import mesh
 
+from cycax.cycad.mesh_io import CHUNK_SIZE, read_stl
+
 
 def check_json_reference(json_file: Path, reference_file: str) -> bool:
     """Check if a JSON file matches a reference file.
@@ -41,7 +43,8 @@ def check_stl_reference(stl_file: Path, reference_file: str) -> bool:
 def stl_compare(file1: Path, file2: Path) -> bool:
     """Compare two STL files for equality.
 
-    This is a very memory intensive operation and should be used sparingly.
+    The triangles are compared regardless of their order in the files.
+    Binary STL files are memory-mapped, only the sort order of the triangles is held in memory.
 
     Args:
         file1: Path to the first STL file.
@@ -50,14 +53,18 @@ def stl_compare(file1: Path, file2: Path) -> bool:
     Returns:
         True if the files are equal, False otherwise.
     """
-    lines1 = file1.read_text().splitlines()
-    lines2 = file2.read_text().splitlines()
-    if len(lines1) != len(lines2):
+    triangles1 = read_stl(file1)
+    triangles2 = read_stl(file2)
+    if len(triangles1) != len(triangles2):
         return False
-    sorted_lines1 = sorted(lines1)
-    sorted_lines2 = sorted(lines2)
-    for line_number in range(len(lines1)):
-        if sorted_lines1[line_number] != sorted_lines2[line_number]:
+    rows1 = triangles1["vectors"].reshape(-1, 9)
+    rows2 = triangles2["vectors"].reshape(-1, 9)
+    order1 = np.lexsort(rows1.T[::-1])
+    order2 = np.lexsort(rows2.T[::-1])
+    for start in range(0, len(order1), CHUNK_SIZE):
+        chunk1 = order1[start : start + CHUNK_SIZE]
+        chunk2 = order2[start : start + CHUNK_SIZE]
+        if not np.array_equal(rows1[chunk1], rows2[chunk2]):
             return False
     return True
 
@@ -2,7 +2,13 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+from pathlib import Path
+
+import pytest
+
 from cycax.cycad import Assembly, SheetMetal
+from cycax.cycad.engines.assembly_build123d import AssemblyBuild123d
+from cycax.cycad.engines.part_build123d import PartEngineBuild123d
 
 
 def test_part_names():
@@ -21,3 +27,87 @@ def test_part_names():
     assembly.add(mypart3, "top")
     assert list(assembly.parts.keys()) == ["test_part_1", "test_part_2", "top"], "The parts names are correct."
     assert mypart3 is assembly.get_part("top"), "The same part is return when accessed through get_part."
+
+
+def test_build_part_formats(tmp_path: Path):
+    assembly = Assembly("format-test")
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="format_part"))
+    assembly.save(tmp_path)
+    part_engine = PartEngineBuild123d()
+    assembly.build(engine=AssemblyBuild123d(assembly.name), part_engines=[part_engine])
+    assert "out_formats" not in part_engine.config, "The part engine that was given is not changed."
+    assert (tmp_path / "format_part" / "format_part.step").exists(), "The assembly engine needs STEP files."
+    assert not (tmp_path / "format_part" / "format_part.stl").exists()
+    assert (tmp_path / "format_test.step").exists()
+
+    part_engine = PartEngineBuild123d()
+    assembly.build(engine=AssemblyBuild123d(assembly.name), part_engines=[part_engine], out_formats=[("STL",)])
+    assert (tmp_path / "format_part" / "format_part.stl").exists(), "Requested formats are added to the plan."
+    assert assembly._plan_out_formats(AssemblyBuild123d(assembly.name), [("STL",)]) == [("STEP",), ("STL",)]
+
+
+def test_build_formats_same_engine(tmp_path: Path):
+    assembly = Assembly("reuse-test")
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="reuse_part"))
+    assembly.save(tmp_path)
+    part_engine = PartEngineBuild123d()
+    assembly.build(part_engines=[part_engine], out_formats=[("STEP",)])
+    assembly.build(part_engines=[part_engine], out_formats=[("STL",)])
+    assert (tmp_path / "reuse_part" / "reuse_part.stl").exists(), "The STEP build is not reused for STL."
+    assert [data_file["type"] for data_file in assembly._part_files["reuse_part"]] == ["STL"]
+
+
+def test_build_same_geometry_once(tmp_path: Path):
+    assembly = Assembly("dedup-test")
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="panel_a"))
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="panel_b"))
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="panel_a"))
+    assembly.save(tmp_path)
+    part_engine = PartEngineBuild123d()
+    assembly.build(part_engines=[part_engine], out_formats=[("STL",)])
+    assert [job_key[0] for job_key in part_engine.jobs] == ["panel_a"], "Parts with the same geometry are built once."
+    assert (tmp_path / "panel_b" / "panel_b.stl").samefile(tmp_path / "panel_a" / "panel_a.stl")
+    assert [data_file["file"] for data_file in assembly._part_files["panel_b"]] == [
+        tmp_path / "panel_b" / "panel_b.stl"
+    ]
+
+    assembly.add(SheetMetal(x_size=30, y_size=10, z_size=2, part_no="panel_b"))
+    with pytest.raises(ValueError, match="panel_b"):
+        assembly.build(part_engines=[PartEngineBuild123d()], out_formats=[("STL",)])
+
+
+def test_build_diverging_geometry(tmp_path: Path):
+    assembly = Assembly("diverge-test")
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="panel_a"))
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="panel_b"))
+    assembly.save(tmp_path)
+    assembly.build(part_engines=[PartEngineBuild123d()], out_formats=[("STL",)])
+    stl_a = tmp_path / "panel_a" / "panel_a.stl"
+    stl_b = tmp_path / "panel_b" / "panel_b.stl"
+    assert stl_a.samefile(stl_b)
+    content_20 = stl_b.read_bytes()
+
+    assembly = Assembly("diverge-test")
+    assembly.add(SheetMetal(x_size=40, y_size=10, z_size=2, part_no="panel_a"))
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="panel_b"))
+    assembly.save(tmp_path)
+    assembly.build(part_engines=[PartEngineBuild123d()], out_formats=[("STL",)])
+    assert not stl_a.samefile(stl_b), "Parts that are no longer the same do not share files."
+    assert stl_b.read_bytes() == content_20, "Building panel_a does not change panel_b."
+    assert stl_a.read_bytes() != content_20, "panel_a is built with its new size."
+
+
+def test_build_in_parallel(tmp_path: Path):
+    assembly = Assembly("parallel-test")
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="parallel_a"))
+    assembly.add(SheetMetal(x_size=20, y_size=10, z_size=2, part_no="parallel_b"))
+    assembly.add(SheetMetal(x_size=30, y_size=10, z_size=2, part_no="parallel_c"))
+    assembly.save(tmp_path)
+    part_engine = PartEngineBuild123d()
+    assembly.build_in_parallel(part_engines=[part_engine], out_formats=[("STL",)])
+    assert "out_formats" not in part_engine.config, "The engine config is sent to the workers, not changed."
+    for part_no in ["parallel_a", "parallel_b", "parallel_c"]:
+        assert [data_file["file"] for data_file in assembly._part_files[part_no]] == [
+            tmp_path / part_no / f"{part_no}.stl"
+        ]
+        assert (tmp_path / part_no / f"{part_no}.stl").exists()
@@ -3,11 +3,14 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from itertools import combinations
+from math import pi
 from pathlib import Path
 
+import build123d
 import pytest
 
 from cycax.cycad import SheetMetal
+from cycax.cycad.engines.part_build123d import PartEngineBuild123d
 from tests.shared import check_json_reference, check_stl_reference, hex_code_check, stl_compare
 
 
@@ -51,3 +54,26 @@ def q_test_edge_chamfer(tmp_path: Path):
         hex_code="d7c03ff389ae4fef7776d92c36c5db48e162714b60e94d3334415bfdb7a6d94b",
     )
     check_json_reference(tmp_path / "sheet_chamfer" / "sheet_chamfer.json", "sheet_chamfer.json")
+
+
+@pytest.mark.parametrize(("edge_type", "removed"), [("round", 9 - 9 * pi / 4), ("chamfer", 9 / 2)])
+def test_edge_build123d(tmp_path: Path, edge_type: str, removed: float):
+    sheet = SheetMetal(x_size=40, y_size=30, z_size=20, part_no=f"sheet_{edge_type}")
+    sheet.beveled_edge(edge_type=edge_type, side1="FRONT", side2="LEFT", size=3)
+    sheet.beveled_edge(edge_type=edge_type, side1="TOP", side2="RIGHT", size=3)
+    sheet.save(path=tmp_path)
+    sheet.build(PartEngineBuild123d(config={"out_formats": [("STEP",)]}))
+
+    part = build123d.import_step(tmp_path / sheet.part_no / f"{sheet.part_no}.step")
+    assert part.volume == pytest.approx(40 * 30 * 20 - removed * (20 + 30))
+    assert len(part.faces()) == 8, "Each bevel replaces an edge with a single face."
+
+
+def test_edge_build123d_fallback():
+    sheet = SheetMetal(x_size=40, y_size=30, z_size=20, part_no="sheet_fallback")
+    sheet.beveled_edge(edge_type="round", side1="FRONT", side2="LEFT", size=3)
+    bevel = sheet.export()["features"][-1]
+    box = build123d.Pos(20, 15, 10) * build123d.Box(40, 30, 20)
+    other = build123d.Pos(100, 0, 0) * build123d.Box(1, 1, 1)
+    part = PartEngineBuild123d()._bevel(build123d.Compound([box, other]), bevel)
+    assert part.volume == pytest.approx(40 * 30 * 20 + 1 - (9 - 9 * pi / 4) * 20)
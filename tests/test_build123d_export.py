@@ -0,0 +1,87 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from pathlib import Path
+
+from cycax.cycad import Print3D
+from cycax.cycad.engines.part_build123d import PartEngineBuild123d
+from cycax.cycad.mesh_io import read_stl, stl_bounds
+from tests.shared import stl_compare_models
+
+
+def make_part(tmp_path: Path, part_no: str) -> Print3D:
+    cube = Print3D(x_size=20, y_size=10, z_size=5, part_no=part_no)
+    cube.top.hole(pos=(5, 5), diameter=3)
+    cube.save(tmp_path)
+    return cube
+
+
+def test_build123d_all_formats(tmp_path: Path):
+    cube = make_part(tmp_path, "all_formats")
+    files = cube.build(PartEngineBuild123d())
+    assert sorted(_file["type"] for _file in files) == ["GLTF", "STEP", "STL"]
+
+    triangles = read_stl(tmp_path / "all_formats" / "all_formats.stl")
+    low, high = stl_bounds(triangles)
+    assert low.tolist() == [0, 0, 0]
+    assert high.tolist() == [20, 10, 5]
+
+
+def test_build123d_out_formats(tmp_path: Path):
+    cube = make_part(tmp_path, "stl_only")
+    files = cube.build(PartEngineBuild123d(config={"out_formats": [("png", "ALL"), ("STL",)]}))
+    assert [_file["type"] for _file in files] == ["STL"]
+    assert not (tmp_path / "stl_only" / "stl_only.step").exists()
+    assert not (tmp_path / "stl_only" / "stl_only.gltf").exists()
+
+
+def test_build123d_tool_cache(tmp_path: Path):
+    cube = Print3D(x_size=40, y_size=40, z_size=10, part_no="tool_cache")
+    for x in range(5, 40, 10):
+        cube.top.nut(pos=(x, 10), nut_type="M3", depth=3)
+        cube.top.hole(pos=(x, 30), diameter=3)
+    cube.save(tmp_path)
+    cache = tmp_path / "tools"
+    config = {"out_formats": [("STL",)], "tool_cache": cache}
+
+    engine = PartEngineBuild123d(config=config)
+    cube.build(engine)
+    assert len(engine._tools) == 2, "One tool for the nuts and one for the holes."
+    assert len(list(cache.glob("*.brep"))) == 2, "The tools are stored as BREP files."
+
+    first = tmp_path / "first.stl"
+    (tmp_path / "tool_cache" / "tool_cache.stl").rename(first)
+    cube.build(PartEngineBuild123d(config=config))
+    stl_compare_models(first, tmp_path / "tool_cache" / "tool_cache.stl")
+
+
+def test_build123d_in_memory(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cube = Print3D(x_size=20, y_size=10, z_size=5, part_no="in_memory")
+    cube.top.hole(pos=(5, 5), diameter=3)
+    spec = cube.spec()
+    files = cube.build(PartEngineBuild123d(config={"out_formats": [("STL",)]}))
+    assert [_file["type"] for _file in files] == ["STL"]
+    assert not (tmp_path / "in_memory" / "in_memory.json").exists(), "The part is built without saving it."
+    assert cube.spec() is spec, "The engines share the specification of the part."
+
+    cube.top.hole(pos=(15, 5), diameter=3)
+    assert cube.spec() is not spec
+    assert len(cube.spec()["features"]) == len(spec["features"]) + 1
+
+
+def test_spec_follows_part():
+    cube = Print3D(x_size=20, y_size=10, z_size=5, part_no="changing")
+    cube.top.hole(pos=(5, 5), diameter=3)
+    spec = cube.spec()
+    assert cube.spec() is spec, "The spec is not made again while the part is not changed."
+
+    cube.features = [cube.features[0].__class__(side="TOP", x=15, y=5, z=5, diameter=3, depth=5)]
+    assert cube.spec()["features"][-1]["x"] == 15, "A new list of features with the same length is used."
+
+    cube.features[0].diameter = 4
+    assert cube.spec()["features"][-1]["diameter"] == 4, "A feature that is changed in place is used."
+
+    cube.x_size = 30
+    assert cube.spec()["features"][0]["x_size"] == 30, "The new size is used."
@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import os
+from pathlib import Path
+
+import pytest
+
+from cycax.cycad import Print3D, build_db
+from cycax.cycad.build_db import FAILED, SUCCESS, BuildDatabase, content_hash, file_hash
+from cycax.cycad.engines.part_freecad import PartEngineFreeCAD
+from cycax.cycad.engines.part_openscad import PartEngineOpenSCAD
+from cycax.cycad.serialize import canonical_json, load_spec, loads_spec
+
+
+def test_build_records(tmp_path: Path):
+    target = tmp_path / "part.stl"
+    input_hash = content_hash(b"spec", salt="quality")
+    with BuildDatabase(tmp_path) as database:
+        assert not database.is_fresh(target, input_hash), "The target was never built."
+
+        with pytest.raises(RuntimeError), database.build(target, input_hash, engine="Test") as build:
+            target.write_text("half")
+            msg = "The engine crashed."
+            raise RuntimeError(msg)
+        assert not database.is_fresh(target, input_hash), "A build that raises is not fresh."
+
+        with database.build(target, input_hash, engine="Test") as build:
+            build.add_output(tmp_path / "not_created.stl")
+        assert not database.is_fresh(target, input_hash), "A build without its outputs is not fresh."
+
+        with database.build(target, input_hash, engine="Test", config={"path": tmp_path}) as build:
+            target.write_text("solid")
+            build.add_output(target)
+        assert database.is_fresh(target, input_hash)
+        assert not database.is_fresh(target, content_hash(b"spec", salt="production"))
+
+        history = database.history(target)
+        assert [record["status"] for record in history] == [FAILED, FAILED, SUCCESS]
+        assert history[-1]["outputs"] == [{"file": str(target), "hash": content_hash(b"solid")}]
+        assert history[-1]["config"] == {"path": str(tmp_path)}
+
+    target.write_text("other")
+    with BuildDatabase(tmp_path) as database:
+        assert not database.is_fresh(target, input_hash), "The output was changed."
+
+    target.unlink()
+    with BuildDatabase(tmp_path) as database:
+        assert not database.is_fresh(target, input_hash), "The output was removed."
+
+
+def test_stale_output(tmp_path: Path):
+    target = tmp_path / "part.stl"
+    target.write_text("old")
+    with BuildDatabase(tmp_path) as database, database.build(target, content_hash(b"new"), engine="Test") as build:
+        build.add_output(target)
+    with BuildDatabase(tmp_path) as database:
+        assert [record["status"] for record in database.history(target)] == [FAILED], "The old file is not the output."
+        assert not database.is_fresh(target, content_hash(b"new"))
+
+
+def test_openscad_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(PartEngineOpenSCAD, "get_appimage", lambda _self, _name: Path("/bin/false"))
+    cube = Print3D(x_size=10, y_size=10, z_size=10, part_no="failed_cube")
+    cube.save(tmp_path)
+    stl_file = tmp_path / "failed_cube" / "failed_cube.stl"
+    stl_file.write_text("solid old")
+    with pytest.raises(RuntimeError, match="exit code 1"):
+        cube.render("openscad")
+
+    with BuildDatabase(tmp_path) as database:
+        assert [record["status"] for record in database.history(stl_file)] == [FAILED]
+        assert not database.is_fresh(stl_file, database.file_hash(tmp_path / "failed_cube" / "failed_cube.scad"))
+
+
+def test_freecad_current_spec(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    specs = []
+
+    def run_freecad(engine: PartEngineFreeCAD):
+        specs.append(load_spec(engine._json_file))
+        (tmp_path / engine.name / f"{engine.name}.FCStd").write_text("FreeCAD")
+
+    monkeypatch.setattr(PartEngineFreeCAD, "_run_freecad", run_freecad)
+    cube = Print3D(x_size=10, y_size=10, z_size=10, part_no="freecad_cube")
+    cube.save(tmp_path)
+    cube.top.hole(pos=(5, 5), diameter=3)
+    cube.build(PartEngineFreeCAD(name=cube.part_no, path=tmp_path))
+    assert specs == [loads_spec(canonical_json(cube.spec()))]
+    assert specs[0]["features"][-1]["name"] == "hole", "FreeCAD builds the part, not the spec saved earlier."
+
+
+def test_openscad_build_record(tmp_path: Path):
+    cube = Print3D(x_size=10, y_size=10, z_size=10, part_no="recorded_cube")
+    cube.top.hole(pos=(5, 5), diameter=3)
+    cube.save(tmp_path)
+    cube.render("preview3d")
+    cube.render("preview3d")
+    cube.render("preview3d", quality="production")
+
+    with BuildDatabase(tmp_path) as database:
+        history = database.history(tmp_path / "recorded_cube" / "recorded_cube.scad")
+    assert [record["engine"] for record in history] == ["OpenSCAD", "OpenSCAD"], "The second render is fresh."
+    assert history[0]["input_hash"] != history[1]["input_hash"]
+    assert not list(tmp_path.rglob(".*.hash")), "No hash files are written."
+
+
+def test_file_hash(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    source = tmp_path / "part.json"
+    source.write_bytes(b"x" * (3 * build_db.CHUNK_SIZE + 5))
+    assert file_hash(source) == content_hash(source.read_bytes()), "Streaming gives the same hash."
+    assert file_hash(source, salt="quality") == content_hash(source.read_bytes(), salt="quality")
+
+    reads = []
+    stream_hash = build_db.stream_hash
+    monkeypatch.setattr(build_db, "stream_hash", lambda file_path: reads.append(file_path) or stream_hash(file_path))
+    file_hash(source)
+    assert not reads, "An unchanged file is not read again."
+
+    stat = source.stat()
+    source.write_bytes(b"y" * stat.st_size)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert file_hash(source) == content_hash(source.read_bytes())
+    assert reads == [source], "A changed file is read again."
+
+    monkeypatch.setattr(build_db, "_digests", {})
+    with BuildDatabase(tmp_path) as database:
+        database.file_hash(source)
+    monkeypatch.setattr(build_db, "_digests", {})
+    with BuildDatabase(tmp_path) as database:
+        assert database.file_hash(source) == content_hash(source.read_bytes())
+    assert reads == [source, source], "The digest is kept in the database for the next build."
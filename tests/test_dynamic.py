@@ -158,12 +158,7 @@ def test_dynamic():
             {
                 "part_no": "con_cube",
                 "position": [89, 0, 87],
-                "rotate": [
-                    {"axis": "z", "angle": 90},
-                    {"axis": "y", "angle": 90},
-                    {"axis": "y", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                ],
+                "rotate": [{"axis": "y", "angle": 90}, {"axis": "y", "angle": 90}],
                 "rotmax": [11, 11, 11],
                 "colour": "red",
             },
@@ -177,13 +172,7 @@ def test_dynamic():
             {
                 "part_no": "con_cube",
                 "position": [0, 0, 87],
-                "rotate": [
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                    {"axis": "y", "angle": 90},
-                    {"axis": "y", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                ],
+                "rotate": [{"axis": "x", "angle": 90}, {"axis": "x", "angle": 90}, {"axis": "z", "angle": 90}],
                 "rotmax": [11, 11, 11],
                 "colour": "red",
             },
@@ -197,41 +186,21 @@ def test_dynamic():
             {
                 "part_no": "con_cube",
                 "position": [0, 89, 87],
-                "rotate": [
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                    {"axis": "y", "angle": 90},
-                    {"axis": "y", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                ],
+                "rotate": [{"axis": "x", "angle": 90}, {"axis": "x", "angle": 90}],
                 "rotmax": [11, 11, 11],
                 "colour": "red",
             },
             {
                 "part_no": "con_cube",
                 "position": [0, 0, 2],
-                "rotate": [
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                ],
+                "rotate": [],
                 "rotmax": [11, 11, 11],
                 "colour": "red",
             },
             {
                 "part_no": "con_cube",
                 "position": [89, 89, 87],
-                "rotate": [
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                    {"axis": "y", "angle": 90},
-                    {"axis": "y", "angle": 90},
-                    {"axis": "z", "angle": 90},
-                ],
+                "rotate": [{"axis": "y", "angle": 90}, {"axis": "y", "angle": 90}, {"axis": "z", "angle": 90}],
                 "rotmax": [11, 11, 11],
                 "colour": "red",
             },
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from cycax.cycad import Assembly, Print3D
+from cycax.cycad.features import Feature, unique_features
 
 # Test that the entire system works together
 
@@ -51,3 +52,37 @@ def test_dynamic():
 
     assert "name" in test_box
     assert "parts" in test_box
+
+
+def test_feature_slots():
+    cube = ConCube()
+    cube.front.hole(pos=[3, 3], diameter=2, depth=2)
+    for feature in cube.features:
+        assert not hasattr(feature, "__dict__"), f"The {feature.name} keeps its values in a dict."
+    assert "left" in vars(cube)
+    assert "right" not in vars(cube)
+
+    hole = cube.features[-1].export()
+    assert list(hole) == ["x", "y", "z", "side", "diameter", "depth", "name", "type"]
+    nut = next(feature for feature in cube.export()["features"] if feature["name"] == "nut")
+    assert list(nut)[:6] == ["name", "type", "x", "y", "z", "side"]
+
+
+class Slot(Feature):
+    """A feature defined outside of CyCAx, without slots or _fields."""
+
+    def __init__(self, side: str, x: float, y: float, z: float, length: float):
+        super().__init__(x, y, z, side)
+        self.length = length
+        self.name = "slot"
+        self.type = "cut"
+
+
+def test_feature_without_fields():
+    slot = Slot(TOP, 1, 2, 3, length=4)
+    assert slot.export() == {"x": 1, "y": 2, "z": 3, "side": TOP, "length": 4, "name": "slot", "type": "cut"}
+    assert slot != Slot(TOP, 1, 2, 3, length=5), "Features with different values are not equal."
+    assert len(unique_features([slot, Slot(TOP, 1, 2, 3, length=5), Slot(TOP, 1, 2, 3, length=4)])) == 2
+    slot._cache = {"outline": [1, 2]}
+    assert "_cache" not in slot.export(), "Private values are not exported."
+    assert slot == Slot(TOP, 1, 2, 3, length=4)
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from pathlib import Path
+
+import numpy as np
+
+from cycax.cycad.mesh_io import (
+    STL_DTYPE,
+    StlWriter,
+    concatenate_stl,
+    is_binary_stl,
+    read_stl,
+    stl_bounds,
+    triangles_from_mesh,
+    write_stl,
+)
+from tests.shared import stl_compare
+
+
+def cube_triangles(offset: float = 0.0) -> np.ndarray:
+    vertices = [(x + offset, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)]
+    faces = [
+        (0, 1, 3), (0, 3, 2), (4, 6, 7), (4, 7, 5), (0, 4, 5), (0, 5, 1),
+        (2, 3, 7), (2, 7, 6), (0, 2, 6), (0, 6, 4), (1, 5, 7), (1, 7, 3),
+    ]  # fmt: skip
+    return triangles_from_mesh(vertices, faces)
+
+
+def test_write_read(tmp_path: Path):
+    stl_file = write_stl(tmp_path / "cube.stl", cube_triangles())
+    assert is_binary_stl(stl_file)
+    assert stl_file.stat().st_size == 84 + 12 * STL_DTYPE.itemsize
+
+    triangles = read_stl(stl_file)
+    assert isinstance(triangles, np.memmap), "Binary STL should be memory-mapped."
+    assert len(triangles) == 12
+    assert np.array_equal(triangles["vectors"], cube_triangles()["vectors"])
+    assert np.allclose(np.linalg.norm(triangles["normals"], axis=1), 1.0)
+    low, high = stl_bounds(triangles)
+    assert low.tolist() == [0, 0, 0]
+    assert high.tolist() == [1, 1, 1]
+
+
+def test_stream_and_concatenate(tmp_path: Path):
+    with StlWriter(tmp_path / "two.stl") as writer:
+        writer.write(cube_triangles())
+        writer.write(cube_triangles(offset=2.0)["vectors"])
+    assert writer.count == 24
+
+    write_stl(tmp_path / "a.stl", cube_triangles())
+    write_stl(tmp_path / "b.stl", cube_triangles(offset=2.0))
+    combined = concatenate_stl(tmp_path / "combined.stl", [tmp_path / "b.stl", tmp_path / "a.stl"])
+    assert len(read_stl(combined)) == 24
+    assert stl_compare(combined, tmp_path / "two.stl"), "Triangle order should not matter."
+    assert not stl_compare(combined, tmp_path / "a.stl")
+
+
+def test_ascii_reference():
+    reference = Path("./tests/references/sheet_round.stl")
+    assert not is_binary_stl(reference)
+    triangles = read_stl(reference)
+    assert len(triangles) > 0
+    assert stl_compare(reference, reference)
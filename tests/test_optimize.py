@@ -0,0 +1,116 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from pathlib import Path
+
+from cycax.cycad import Print3D
+from cycax.cycad.engines.part_build123d import PartEngineBuild123d
+from cycax.cycad.optimize import optimize_features, optimize_spec
+from cycax.cycad.serialize import canonical_json
+from cycax.cycad.spatial import feature_bounds
+from cycax.parts.fan import Fan80x80x15
+from tests.shared import stl_compare_models
+
+
+def reasons(removed: list[dict]) -> list[tuple[str, str]]:
+    return [(item["reason"], item["feature"]["name"]) for item in removed]
+
+
+def test_feature_bounds():
+    cube = Print3D(x_size=30, y_size=20, z_size=10, part_no="bounds")
+    cube.top.hole(pos=(5, 5), diameter=2, depth=3)
+    cube.left.slot(pos=(5, 3), width=2, length=8, depth=4)
+    cube.top.box(pos=(10, 10), length=4, width=2, depth=3)
+    body, hole, slot, box = cube.export()["features"]
+    assert feature_bounds(body) == ((0, 0, 0), (30, 20, 10))
+    assert feature_bounds(hole) == ((4, 4, 7), (6, 6, 10))
+    assert feature_bounds(slot) == ((0, 7, 2), (4, 15, 4))
+    assert feature_bounds(box) == ((10, 10, 7), (14, 12, 10))
+
+
+def test_optimize_removed():
+    cube = Print3D(x_size=30, y_size=20, z_size=10, part_no="removed")
+    cube.top.hole(pos=(5, 5), diameter=2)
+    cube.top.hole(pos=(5, 5), diameter=2)
+    cube.top.hole(pos=(50, 5), diameter=2)
+    cube.top.box(pos=(10, 10), length=10, width=8, depth=5)
+    cube.top.hole(pos=(12, 12), diameter=2, depth=3)
+    cube.top.nut(pos=(25, 5), nut_type="M3", depth=2)
+    features, removed = optimize_features(cube.export()["features"])
+    assert reasons(removed) == [("duplicate", "hole"), ("outside", "hole"), ("contained", "hole")]
+    assert [feature["name"] for feature in features] == ["cube", "hole", "cube", "nut"]
+
+
+def test_optimize_groups_cuts():
+    cube = Print3D(x_size=30, y_size=20, z_size=10, part_no="groups")
+    cube.top.hole(pos=(5, 5), diameter=2)
+    cube.top.nut(pos=(15, 5), nut_type="M3", depth=2)
+    cube.top.hole(pos=(25, 5), diameter=2)
+    features, removed = optimize_features(cube.export()["features"])
+    assert not removed
+    assert [feature["name"] for feature in features] == ["cube", "hole", "hole", "nut"]
+
+
+def test_optimize_keeps_order_after_add():
+    body = {
+        "name": "cube",
+        "type": "add",
+        "side": None,
+        "x": 0,
+        "y": 0,
+        "z": 0,
+        "x_size": 30,
+        "y_size": 20,
+        "z_size": 10,
+    }
+    box = {**body, "type": "cut", "side": "TOP", "z": 10, "z_size": 5}
+    cylinder = {
+        "name": "cylinder_feature",
+        "type": "add",
+        "side": "TOP",
+        "x": 15,
+        "y": 10,
+        "z": 5,
+        "diameter": 4,
+        "depth": 5,
+    }
+    hole = {"name": "hole", "type": "cut", "side": "TOP", "x": 15, "y": 10, "z": 10, "diameter": 2, "depth": 3}
+    features = [body, box, cylinder, hole]
+    optimized, removed = optimize_features(features)
+    assert not removed, "The rectangle is cut before the cylinder is added, the hole still cuts the cylinder."
+    assert optimized == features
+
+    optimized, removed = optimize_features([body, hole, cylinder, box])
+    assert reasons(removed) == [("contained", "hole")], "The rectangle is cut after the cylinder is added."
+
+
+def test_optimize_save(tmp_path: Path):
+    fan = Fan80x80x15()
+    spec, removed = optimize_spec(fan.export())
+    assert {item["reason"] for item in removed} == {"duplicate"}, "Fan.definition is called twice."
+    assert len(spec["features"]) == len(fan.export()["features"]) - len(removed)
+
+    json_file = fan.save(tmp_path)
+    assert json.loads(json_file.read_text()) == json.loads(canonical_json(spec)), "Saved with rounded floats."
+    (tmp_path / "raw").mkdir()
+    raw_file = fan.save(tmp_path / "raw", optimize=False)
+    assert json.loads(raw_file.read_text()) == json.loads(canonical_json(fan.export()))
+
+
+def test_optimize_build123d(tmp_path: Path):
+    cube = Print3D(x_size=30, y_size=20, z_size=10, part_no="optimized")
+    for _ in range(2):
+        cube.top.hole(pos=(5, 5), diameter=2)
+        cube.top.box(pos=(10, 10), length=10, width=8, depth=5)
+        cube.top.hole(pos=(12, 12), diameter=2, depth=3)
+        cube.front.hole(pos=(50, 5), diameter=2)
+        cube.left.nut(pos=(5, 5), nut_type="M3", depth=2)
+    engine = PartEngineBuild123d(config={"out_formats": [("STL",)]})
+    cube.save(tmp_path)
+    cube.build(engine)
+
+    (tmp_path / "raw").mkdir()
+    engine._build(cube.export(), tmp_path / "raw" / "raw")
+    stl_compare_models(tmp_path / "optimized" / "optimized.stl", tmp_path / "raw" / "raw.stl")
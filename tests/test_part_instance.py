@@ -0,0 +1,77 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+from pathlib import Path
+
+import pytest
+
+from cycax.cycad import Assembly, PartInstance, Print3D, SheetMetal
+
+
+class Screw(Print3D):
+    definitions = 0
+
+    def __init__(self):
+        super().__init__(part_no="screw", x_size=4, y_size=4, z_size=10)
+
+    def definition(self):
+        Screw.definitions += 1
+        self.top.hole(pos=(2, 2), diameter=2, depth=8)
+        self.bottom.hole(pos=(2, 2), diameter=3, external_subtract=True)
+
+
+def test_instances(tmp_path: Path):
+    Screw.definitions = 0
+    assembly = Assembly("hardware")
+    screw = Screw()
+    assembly.add(screw)
+    screws = [PartInstance(screw, assembly=assembly) for _count in range(20)]
+    for number, instance in enumerate(screws):
+        instance.move(x=10 * (number + 1))
+    screws[0].rotate("x")
+
+    assert Screw.definitions == 1, "The definition of the part is only run once."
+    assert len(assembly.parts) == 21
+    assert screws[1].part is screw
+    assert screws[1].features == tuple(screw.features)
+    assert screws[1].export() == screw.export()
+    assert screws[1].bounding_box == {"LEFT": 20, "RIGHT": 24, "FRONT": 0, "BACK": 4, "BOTTOM": 0, "TOP": 10}
+    assert screw.position == [0, 0, 0], "Moving an instance does not move the part."
+
+    exported = assembly.export()["parts"]
+    assert [part["part_no"] for part in exported] == ["screw"] * 21
+    assert exported[2]["position"] == [20, 0, 0]
+    assert exported[1]["rotate"] == [{"axis": "x", "angle": 90}]
+    assert exported[0]["rotate"] == []
+
+    assembly.save(tmp_path)
+    assert json.loads((tmp_path / "screw" / "screw.json").read_text())["name"] == "screw"
+    assert len(json.loads((tmp_path / "hardware.json").read_text())["parts"]) == 21
+
+    features = len(screw.features)
+    with pytest.raises(ValueError):
+        screws[1].bottom.subtract(screw)
+    with pytest.raises(ValueError, match="Cannot add features to an instance, add them to the part screw"):
+        screws[1].top.hole(pos=(1, 1), diameter=1)
+    with pytest.raises(ValueError, match="Cannot add features to an instance"):
+        screws[1].top.hole(pos=(1, 1), diameter=1, external_subtract=True)
+    assert len(screw.features) == features, "The part definition is not changed."
+
+
+def test_instance_level_subtract():
+    assembly = Assembly("panel")
+    panel = SheetMetal(x_size=50, y_size=50, z_size=2, part_no="panel")
+    assembly.add(panel)
+    screw = Screw()
+    instance = PartInstance(screw, colour="red", assembly=assembly)
+    assert instance.colour == "red"
+    assert "front" not in instance.__dict__, "The sides of an instance are made when used."
+
+    instance.move(x=10, y=10)
+    instance.level(bottom=panel.top, subtract=True)
+    assert instance.position == [10, 10, 2]
+    holes = [feature for feature in panel.features if feature.name == "hole"]
+    assert len(holes) == 1, "The external features of the part are subtracted from the panel."
+    assert (holes[0].x, holes[0].y) == (12, 12)
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from cycax.cycad import Assembly, Print3D
+from cycax.cycad.features import Cylinder, Holes, NutCutOut, unique_features
 
 # Tests the merging of a part.
 
@@ -34,3 +35,36 @@ def test_merge():
 
     assert mypart1.features == mypart2.features
     assert mypart2.external_features == mypart1.external_features
+
+
+def test_feature_value_identity():
+    hole1 = Holes(side="TOP", x=7, y=7.0000000001, z=2, diameter=3.2, depth=2)
+    hole2 = Holes(side="TOP", x=7.0, y=7, z=2, diameter=3.2, depth=2)
+    assert hole1 == hole2
+    assert len({hole1, hole2}) == 1
+    assert hole1 != Holes(side="BOTTOM", x=7, y=7, z=2, diameter=3.2, depth=2)
+    assert hole1 != NutCutOut(side="TOP", x=7, y=7, z=2, nut_type="M3", depth=2)
+
+
+def test_unique_features_keep_last():
+    hole = Holes(side="TOP", x=7, y=7, z=2, diameter=3.2, depth=2)
+    cylinder = Cylinder(side="TOP", x=7, y=7, z=2, diameter=5, height=2)
+    repeated = Holes(side="TOP", x=7, y=7, z=2, diameter=3.2, depth=2)
+    unique = unique_features([hole, cylinder, repeated])
+    assert unique == [cylinder, repeated], "The hole is still cut after the cylinder is added."
+    assert unique[1] is repeated
+
+
+def test_merge_value_duplicates():
+    mypart1 = Print3D(x_size=100, y_size=100, z_size=2, part_no="part-test1")
+    mypart2 = Print3D(x_size=100, y_size=100, z_size=2, part_no="part-test2")
+    for x in range(1, 3000):
+        mypart1.top.hole(pos=[x / 30, 7], diameter=1)
+        mypart2.top.hole(pos=[x / 30, 7], diameter=1)
+    mypart2.top.hole(pos=[50, 50], diameter=1)
+
+    mypart1.merge(mypart2)
+    assert len(mypart1.features) == 3000
+    assert mypart1.features == mypart2.features
+    assert mypart1.features is not mypart2.features
+    assert all(feature1 is not feature2 for feature1, feature2 in zip(mypart1.features, mypart2.features, strict=True))
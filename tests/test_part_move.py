@@ -63,3 +63,66 @@ def test_at():
     mypart1.at(x=10, y=10, z=10)
 
     assert mypart1.position == [10, 10, 10]
+
+
+def test_bounding_box_cache():
+    assembly = Assembly("assembly-test")
+    mypart1 = Print3D(x_size=10, y_size=20, z_size=30, part_no="part-test1")
+    mypart2 = Print3D(x_size=5, y_size=5, z_size=5, part_no="part-test2")
+    assembly.add(mypart1)
+    assembly.add(mypart2)
+
+    assert mypart1.bounding_box is mypart1.bounding_box, "The bounding box is cached."
+    assert mypart1.center is mypart1.center, "The center is cached."
+    assert assembly.bounding_box == {"LEFT": 0, "FRONT": 0, "BOTTOM": 0, "RIGHT": 10, "BACK": 20, "TOP": 30}
+
+    mypart2.move(x=-5, z=40)
+    assert assembly.bounding_box == {"LEFT": -5, "FRONT": 0, "BOTTOM": 0, "RIGHT": 10, "BACK": 20, "TOP": 45}
+    mypart2.at(x=0, z=0)
+    assert assembly.bounding_box == {"LEFT": 0, "FRONT": 0, "BOTTOM": 0, "RIGHT": 10, "BACK": 20, "TOP": 30}
+    mypart1.at(x=100)
+    assert mypart1.bounding_box["LEFT"] == 100
+    assert assembly.bounding_box == {"LEFT": 0, "FRONT": 0, "BOTTOM": 0, "RIGHT": 110, "BACK": 20, "TOP": 30}
+
+    assembly.move(y=3)
+    assembly.rotate("xyz")
+    assembly.at(min_x=7)
+    expected = assembly._calculate_bounding_box()
+    assert assembly.bounding_box == expected, "The cached bounding box matches the bounds of the parts."
+    assert mypart1.center == (
+        mypart1.position[0] + mypart1.x_max / 2,
+        mypart1.position[1] + mypart1.y_max / 2,
+        mypart1.position[2] + mypart1.z_max / 2,
+    )
+
+
+def test_coordinate_grid():
+    plate = Print3D(x_size=20, y_size=20, z_size=2, part_no="plate")
+    spacer = Print3D(x_size=4, y_size=4, z_size=1, part_no="spacer")
+    spacer.bottom.hole(pos=(2, 2), diameter=2, external_subtract=True)
+    for _step in range(10):
+        plate.move(z=0.1)
+        spacer.move(x=0.7, y=0.7)
+    spacer.move(z=plate.z_max)
+
+    assert sum([0.1] * 10) != 1.0, "The moves add up to a value just off the grid."
+    assert plate.position == [0, 0, 1.0]
+    assert plate.bounding_box["TOP"] == 3.0
+    assert spacer.position == [7.0, 7.0, 3.0]
+
+    plate.top.subtract(spacer)
+    hole = plate.features[-1]
+    assert (hole.name, hole.side) == ("hole", "TOP"), "The hole lies on the top of the plate."
+    assert (hole.x, hole.y, hole.z) == (9.0, 9.0, 2.0)
+
+    assembly = Assembly("grid")
+    assembly.add(plate)
+    other = Print3D(x_size=20, y_size=20, z_size=2, part_no="other")
+    other.move(x=30)
+    assembly.add(other)
+    assert assembly.bounding_box["LEFT"] == 0
+    assembly.move(x=0.1)
+    assembly.move(x=0.2)
+    assert assembly.bounding_box["LEFT"] == 0.3, "The moved bounding box is on the grid."
+    plate.move(x=5)
+    assert assembly.bounding_box["LEFT"] == 5.3, "Moving the part on the side inwards updates the bounding box."
@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from cycax.cycad import Assembly, SheetMetal
+from cycax.cycad.orientation import normalize, rotation_matrix
 
 # Tests that with multiple roations the expected outcome is still achieved
 
@@ -69,29 +70,15 @@ def test_rotate():
     mypart9.rotate_freeze_top()
 
     assembly_def = assembly.export()
-    assert assembly_def["parts"][0]["rotate"] == [
-        {"axis": "x", "angle": 90},
-        {"axis": "y", "angle": 90},
-        {"axis": "z", "angle": 90},
-        {"axis": "x", "angle": 90},
-        {"axis": "x", "angle": 90},
-    ]
-    assert assembly_def["parts"][1]["rotate"] == [
-        {"axis": "x", "angle": 90},
-        {"axis": "y", "angle": 90},
-        {"axis": "z", "angle": 90},
-    ]
+    # The rotations are kept as the shortest actions that give the same orientation.
+    for part_def, actions in zip(
+        assembly_def["parts"],
+        ["xyzxx", "xyz", "xy", "yx", "zy", "yz", "xz", "zx", "xyzxyz"],
+        strict=True,
+    ):
+        rotated = "".join(rotation["axis"] for rotation in part_def["rotate"])
+        assert rotation_matrix(rotated) == rotation_matrix(actions)
+        assert rotated == normalize(actions)
+        assert len(rotated) <= 4, "No orientation needs more than four actions."
     assert assembly_def["parts"][2]["rotate"] == [{"axis": "x", "angle": 90}, {"axis": "y", "angle": 90}]
-    assert assembly_def["parts"][3]["rotate"] == [{"axis": "y", "angle": 90}, {"axis": "x", "angle": 90}]
-    assert assembly_def["parts"][4]["rotate"] == [{"axis": "z", "angle": 90}, {"axis": "y", "angle": 90}]
-    assert assembly_def["parts"][5]["rotate"] == [{"axis": "y", "angle": 90}, {"axis": "z", "angle": 90}]
-    assert assembly_def["parts"][6]["rotate"] == [{"axis": "x", "angle": 90}, {"axis": "z", "angle": 90}]
-    assert assembly_def["parts"][7]["rotate"] == [{"axis": "z", "angle": 90}, {"axis": "x", "angle": 90}]
-    assert assembly_def["parts"][8]["rotate"] == [
-        {"axis": "x", "angle": 90},
-        {"axis": "y", "angle": 90},
-        {"axis": "z", "angle": 90},
-        {"axis": "x", "angle": 90},
-        {"axis": "y", "angle": 90},
-        {"axis": "z", "angle": 90},
-    ]
+    assert assembly_def["parts"][3]["rotate"] == [{"axis": "x", "angle": 90}, {"axis": "z", "angle": 90}]
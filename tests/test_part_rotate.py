@@ -104,6 +104,33 @@ def test_rotate_side():
         assert assembly_def["parts"][3]["rotate"] == [{"axis": "z", "angle": 90}] * count
 
 
+def test_rotate_assembly():
+    assembly = Assembly("assembly-test")
+    mypart1 = SheetMetal(x_size=10, y_size=20, z_size=2, part_no="part-test1")
+    mypart2 = SheetMetal(x_size=10, y_size=20, z_size=2, part_no="part-test2")
+    assembly.add(mypart1)
+    assembly.add(mypart2)
+    mypart2.move(x=10)
+
+    assembly.rotate("z")
+    assert mypart1.position == [0, 0, 0]
+    assert mypart2.position == [0, 10, 0]
+    assert assembly.bounding_box == {"LEFT": 0, "FRONT": 0, "BOTTOM": 0, "RIGHT": 20, "BACK": 20, "TOP": 2}
+    assert assembly.export()["parts"][1]["rotate"] == [{"axis": "z", "angle": 90}]
+
+    # Many rotations are combined, the history of the parts does not grow.
+    # Repeating any rotation 12 times is a full turn, 12 is a multiple of the order of every orientation.
+    assembly.rotate("xyzxyzzyXZ" * 12)
+    for part in (mypart1, mypart2):
+        assert len(part.rotation) <= 4, "No orientation needs more than four actions."
+
+    assembly.rotate("zzz")
+    assert mypart1.position == [0, 0, 0]
+    assert mypart2.position == [10, 0, 0]
+    assert mypart2.bounding_box == {"LEFT": 10, "FRONT": 0, "BOTTOM": 0, "RIGHT": 20, "BACK": 20, "TOP": 2}
+    assert assembly.export()["parts"][1]["rotate"] == []
+
+
 # TODO: Add tests that rotate the part in multiple directions.
 # TODO: Add tests that level then rotate a part. If rotate after level is not allowed then err.
 # TODO: Test Print3D
@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+from math import cos, radians, sin
+from pathlib import Path
+
+import pytest
+
+from cycax.cycad import Print3D
+from cycax.cycad.engines.part_build123d import PartEngineBuild123d
+from cycax.cycad.engines.utils import expand_feature
+from cycax.cycad.features import Holes, Pattern
+from cycax.cycad.location import SIDES
+from tests.shared import stl_compare_models
+
+
+def hole_positions(features: list[dict]) -> list[tuple]:
+    return sorted((round(f["x"], 6), round(f["y"], 6), round(f["z"], 6), f["side"]) for f in features)
+
+
+@pytest.mark.parametrize("side_name", SIDES)
+def test_hole_grid(side_name: str):
+    grid = Print3D(x_size=30, y_size=30, z_size=30, part_no="grid")
+    getattr(grid, side_name.lower()).hole_grid(pos=(5, 5), diameter=2, spacing=(4, 5), count=(3, 2), mask=[(1, 1)])
+    holes = Print3D(x_size=30, y_size=30, z_size=30, part_no="holes")
+    for column, row in ((0, 0), (0, 1), (1, 0), (2, 0), (2, 1)):
+        getattr(holes, side_name.lower()).hole(pos=(5 + column * 4, 5 + row * 5), diameter=2)
+
+    spec = grid.export()["features"][1]
+    assert spec["name"] == "pattern", "The grid is a single feature."
+    expanded = expand_feature(spec)
+    expected = [feature.export() for feature in holes.features if feature.name == "hole"]
+    assert hole_positions(expanded) == hole_positions(expected)
+
+
+@pytest.mark.parametrize("side_name", SIDES)
+def test_hole_circle(side_name: str):
+    circle = Print3D(x_size=30, y_size=30, z_size=30, part_no="circle")
+    getattr(circle, side_name.lower()).hole_circle(pos=(15, 15), diameter=2, radius=5, count=6, angle=15, mask=[2])
+    holes = Print3D(x_size=30, y_size=30, z_size=30, part_no="holes")
+    for index in (0, 1, 3, 4, 5):
+        angle = radians(15 + index * 60)
+        getattr(holes, side_name.lower()).hole(pos=(15 + 5 * cos(angle), 15 + 5 * sin(angle)), diameter=2)
+
+    expanded = expand_feature(circle.export()["features"][1])
+    expected = [feature.export() for feature in holes.features if feature.name == "hole"]
+    assert hole_positions(expanded) == hole_positions(expected)
+
+
+@pytest.mark.parametrize("swap", ["swap_xy", "swap_xz", "swap_yz"])
+def test_pattern_rotate(swap: str):
+    cube = Print3D(x_size=30, y_size=20, z_size=10, part_no="rotate")
+    cube.front.hole_grid(pos=(5, 2), diameter=2, spacing=(4, 3), count=(3, 2))
+    cube.front.hole_circle(pos=(20, 5), diameter=1, radius=3, count=5)
+    for pattern in cube.features[1:]:
+        holes = [
+            Holes(**{key: f[key] for key in ("side", "x", "y", "z", "diameter", "depth")})
+            for f in expand_feature(pattern.export())
+        ]
+        for hole in holes:
+            getattr(hole, swap)(rot=1, rotmax=[30, 20, 10])
+        getattr(pattern, swap)(rot=1, rotmax=[30, 20, 10])
+        assert hole_positions(expand_feature(pattern.export())) == hole_positions([hole.export() for hole in holes])
+
+
+def test_vent_circles_grid():
+    panel = Print3D(x_size=100, y_size=100, z_size=2, part_no="panel")
+    panel.top.vent(x_min=10, y_min=10, x_max=90, y_max=90).circles_grid(diameter=2)
+    features = panel.export()["features"]
+    assert len(features) == 2, "The vent is one pattern feature."
+    assert features[1]["count1"] * features[1]["count2"] == len(expand_feature(features[1]))
+
+
+def test_pattern_build123d(tmp_path: Path):
+    grid = Print3D(x_size=30, y_size=30, z_size=5, part_no="grid")
+    grid.top.hole_grid(pos=(5, 5), diameter=2, spacing=(4, 5), count=(3, 2), mask=[(1, 1)])
+    grid.top.hole_circle(pos=(20, 20), diameter=2, radius=5, count=6)
+    grid.save(tmp_path)
+    engine = PartEngineBuild123d(config={"out_formats": [("STL",)]})
+    grid.build(engine)
+
+    spec = copy.deepcopy(grid.export())
+    spec["features"] = [expanded for feature in spec["features"] for expanded in expand_feature(feature)]
+    (tmp_path / "expanded").mkdir()
+    engine._build(spec, tmp_path / "expanded" / "expanded")
+    stl_compare_models(tmp_path / "grid" / "grid.stl", tmp_path / "expanded" / "expanded.stl")
+
+
+def test_pattern_checks():
+    hole = Holes(side="TOP", x=5, y=5, z=2, diameter=2, depth=2)
+    with pytest.raises(ValueError, match="at least 1"):
+        Pattern(hole, step1=(4, 0, 0), count1=0)
+    with pytest.raises(ValueError, match="at least 1"):
+        Pattern(hole, step1=(4, 0, 0), count1=3, step2=(0, 4, 0), count2=-1)
+    with pytest.raises(ValueError, match=r"\(3, 0\) is not in the 3 by 2 pattern"):
+        Pattern(hole, step1=(4, 0, 0), count1=3, step2=(0, 4, 0), count2=2, mask=[(3, 0)])
+
+
+def test_pattern_subtract():
+    plate = Print3D(x_size=30, y_size=30, z_size=5, part_no="plate")
+    hole = Holes(side="TOP", x=5, y=5, z=5, diameter=2, depth=1)
+    plate.insert_feature(Pattern(hole, step1=(4, 0, 0), count1=3))
+    pattern = plate.export()["features"][-1]
+    assert pattern["feature"]["depth"] == 5, "The holes of a subtracted pattern go through the part."
@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+from pathlib import Path
+
+import pytest
+
+from cycax.cycad import Print3D
+from cycax.cycad.quality import apply_quality, get_quality, quality_key
+
+
+def test_quality_profiles():
+    assert get_quality()["fn"] == 64, "The default profile keeps the OpenSCAD facets at 64."
+    assert get_quality("preview")["tolerance"] > get_quality("production")["tolerance"]
+    config = apply_quality({"fn": 32}, "production")
+    assert config["fn"] == 32, "Settings in the config override the profile."
+    assert config["quality"] == "production"
+    assert quality_key({"quality": "preview"}) != quality_key({})
+    assert quality_key({"quality": "default"}) == quality_key({})
+    with pytest.raises(ValueError):
+        get_quality("ultra")
+
+
+def test_quality_openscad(tmp_path: Path):
+    cube = Print3D(x_size=10, y_size=10, z_size=10, part_no="quality_cube")
+    cube.top.hole(pos=(5, 5), diameter=3)
+    cube.save(tmp_path)
+    scad_file = tmp_path / "quality_cube" / "quality_cube.scad"
+
+    cube.render("preview3d")
+    assert "$fn=16" in scad_file.read_text(), "Preview3D uses the preview profile."
+    cube.render("preview3d", quality="production")
+    assert "$fn=128" in scad_file.read_text(), "A new quality rebuilds the cached SCAD file."
+    cube.render("preview3d", quality="production")
+    assert "$fn=128" in scad_file.read_text()
@@ -0,0 +1,88 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from cycax.cycad import Assembly, Print3D, serialize
+from cycax.cycad.engines.base_part_engine import PartEngine
+from cycax.cycad.serialize import binary_spec, canonical_json, load_spec, loads_spec, spec_hash
+from cycax.parts.fan import Fan80x80x15
+
+
+def test_canonical_json():
+    data1 = {"b": [1, (2.0, -0.0)], "a": 0.1 + 0.2, "c": {"y": 1, "x": {3, 1}}}
+    data2 = {"c": {"x": [1, 3], "y": 1}, "a": 0.3, "b": [1, [2.0, 0.0]]}
+    assert canonical_json(data1) == b'{"a":0.3,"b":[1,[2.0,0.0]],"c":{"x":[1,3],"y":1}}'
+    assert canonical_json(data1) == canonical_json(data2)
+    assert spec_hash(canonical_json(data1)) == spec_hash(canonical_json(data2))
+    with pytest.raises(ValueError):
+        canonical_json({"x": float("nan")})
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_canonical_floats(monkeypatch: pytest.MonkeyPatch, backend: str):
+    orjson = pytest.importorskip("orjson") if backend == "orjson" else None
+    monkeypatch.setattr(serialize, "orjson", orjson)
+    data = {"small": 5e-05, "large": 1e16, "size": 12.5}
+    content = canonical_json(data)
+    assert content == b'{"large":1e+16,"size":12.5,"small":5e-05}', "Floats are written the same by all backends."
+    assert loads_spec(content) == data
+
+
+def test_saved_spec_is_canonical(tmp_path: Path):
+    box = Assembly("box")
+    fan = Fan80x80x15()
+    box.add(fan)
+    box.save(tmp_path)
+    for json_file in tmp_path.rglob("*.json"):
+        content = json_file.read_bytes()
+        assert canonical_json(json.loads(content)) == content, f"{json_file} is not canonical."
+
+
+def test_binary_spec(tmp_path: Path):
+    panel = Print3D(part_no="panel", x_size=100, y_size=100, z_size=2)
+    for x in range(20):
+        for y in range(20):
+            panel.top.hole(pos=[3 + x * 4.7, 3 + y * 4.7], diameter=3.1, depth=2)
+    panel.top.box(pos=[50, 50], length=10, width=10, depth=1)
+    spec = panel.export()
+    content = binary_spec(spec)
+    assert len(content) * 5 < len(canonical_json(spec))
+    assert loads_spec(content) == json.loads(canonical_json(spec))
+
+    json_file = panel.save(tmp_path, optimize=False)
+    assert json_file.suffix == ".json"
+    binary_file = panel.save(tmp_path, optimize=False, binary=True)
+    assert binary_file.suffix == ".cyspec"
+    assert not json_file.exists(), "A spec is only saved in one format."
+    assert load_spec(binary_file) == json.loads(canonical_json(spec))
+
+    engine = PartEngine(name="panel", path=tmp_path)
+    assert engine._json_file == binary_file
+
+
+def test_save_if_changed(tmp_path: Path):
+    box = Assembly("box")
+    fan = Fan80x80x15()
+    box.add(fan)
+    box.save(tmp_path)
+    fan_file = tmp_path / "fan_80x80x15" / "fan_80x80x15.json"
+    content = fan_file.read_bytes()
+    os.utime(fan_file, ns=(0, 0))
+
+    box.save(tmp_path)
+    assert fan_file.stat().st_mtime_ns == 0, "An unchanged spec is not written again."
+
+    fan_file.write_text("{}")
+    box.save(tmp_path)
+    assert fan_file.read_bytes() == content, "A spec changed on disk is saved again."
+
+    fan.top.hole(pos=(40, 40), diameter=3)
+    box.save(tmp_path)
+    assert fan_file.read_bytes() != content
+    assert not list(tmp_path.rglob("*.tmp")), "The temporary files are renamed."
@@ -112,7 +112,9 @@ def test_slots(tmp_path):
             pname = f"cube_{side.lower()}_vertical"
         stl = tmp_path / assembly.name / pname / f"{pname}.stl"
         build123d_stl = stl.with_name(f"{pname}_build123d.stl")
-        assembly.build(engine=AssemblyBuild123d(assembly.name), part_engines=[PartEngineBuild123d()])
+        assembly.build(
+            engine=AssemblyBuild123d(assembly.name), part_engines=[PartEngineBuild123d()], out_formats=[("STL",)]
+        )
         stl.rename(build123d_stl)
         assembly.build(part_engines=[PartEngineFreeCAD()])
         # Check that the STL files produced by FreeCAD and Build123d are the same.
@@ -0,0 +1,72 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import copy
+from itertools import product
+from pathlib import Path
+
+import pytest
+
+from cycax.cycad import Print3D
+from cycax.cycad.engines.part_build123d import PartEngineBuild123d
+from cycax.cycad.engines.utils import expand_feature
+from cycax.cycad.location import SIDES
+from cycax.cycad.slot import Slot
+from tests.shared import stl_compare_models
+
+
+def rounded(features: list[dict]) -> list[dict]:
+    features = [
+        {key: round(value, 6) if isinstance(value, float) else value for key, value in f.items()} for f in features
+    ]
+    return sorted(features, key=repr)
+
+
+def make_slot(side_name: str, *, horizontal: bool) -> Slot:
+    """Make the slot that CycadSide.slot would add to a 30x20x10 part."""
+    side = getattr(Print3D(x_size=30, y_size=20, z_size=10, part_no="slot"), side_name.lower())
+    length, width = (8, 4) if horizontal else (4, 8)
+    x, y, z = side._location_calc(pos=(6, 4), sink=0.0)
+    x_size, y_size, z_size = side._box_size_calc(width=width, length=length, depth=side._depth_check(None))
+    return Slot(side=side_name, x=x, y=y, z=z, x_size=x_size, y_size=y_size, z_size=z_size, horizontal=horizontal)
+
+
+def test_slot_single_feature():
+    cube = Print3D(x_size=30, y_size=20, z_size=10, part_no="slot")
+    cube.top.slot(pos=(5, 5), width=4, length=10)
+    cube.top.slot(pos=(5, 5), width=4, length=10, external_subtract=True)
+    assert [feature["name"] for feature in cube.export()["features"]] == ["cube", "slot"]
+    assert len(cube.external_features) == 1
+
+
+@pytest.mark.parametrize(("side", "horizontal"), list(product(SIDES, (True, False))))
+def test_slot_expand(side: str, *, horizontal: bool):
+    slot = make_slot(side, horizontal=horizontal)
+    expected = [slot.hole_left.export(), slot.hole_right.export(), slot.rectangle.export()]
+    assert rounded(expand_feature(slot.feature.export())) == rounded(expected)
+
+
+@pytest.mark.parametrize(("side", "swap"), list(product(SIDES, ("swap_xy", "swap_xz", "swap_yz"))))
+def test_slot_rotate(side: str, swap: str):
+    slot = make_slot(side, horizontal=True)
+    for feature in (slot.feature, slot.hole_left, slot.hole_right, slot.rectangle):
+        getattr(feature, swap)(rot=1, rotmax=[30, 20, 10])
+    expected = [slot.hole_left.export(), slot.hole_right.export(), slot.rectangle.export()]
+    assert rounded(expand_feature(slot.feature.export())) == rounded(expected)
+
+
+def test_slot_build123d(tmp_path: Path):
+    cube = Print3D(x_size=30, y_size=20, z_size=10, part_no="slots")
+    cube.top.slot(pos=(5, 5), width=4, length=10, depth=3)
+    cube.front.slot(pos=(20, 2), width=3, length=6, horizontal=False)
+    cube.left.slot(pos=(5, 3), width=2, length=8, depth=4)
+    cube.save(tmp_path)
+    engine = PartEngineBuild123d(config={"out_formats": [("STL",)]})
+    cube.build(engine)
+
+    spec = copy.deepcopy(cube.export())
+    spec["features"] = [expanded for feature in spec["features"] for expanded in expand_feature(feature)]
+    (tmp_path / "expanded").mkdir()
+    engine._build(spec, tmp_path / "expanded" / "expanded")
+    stl_compare_models(tmp_path / "slots" / "slots.stl", tmp_path / "expanded" / "expanded.stl")
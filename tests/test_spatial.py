@@ -0,0 +1,52 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import random
+
+from cycax.cycad import Print3D, SheetMetal
+from cycax.cycad.spatial import FeatureIndex, feature_bounds
+
+
+def test_feature_index_intersecting():
+    rng = random.Random(36)  # noqa: S311 Not used for cryptography.
+    panel = Print3D(x_size=300, y_size=200, z_size=5, part_no="panel")
+    for _ in range(500):
+        panel.top.hole(pos=(rng.uniform(0, 300), rng.uniform(0, 200)), diameter=rng.uniform(1, 6))
+        panel.front.box(pos=(rng.uniform(0, 290), rng.uniform(0, 3)), length=5, width=1, depth=rng.uniform(1, 10))
+    index = FeatureIndex(panel.features)
+    assert len(index) == 1000
+
+    for _ in range(50):
+        low = (rng.uniform(-10, 300), rng.uniform(-10, 200), rng.uniform(-1, 5))
+        high = tuple(value + rng.uniform(0, 50) for value in low)
+        expected = []
+        for feature in panel.features:
+            feature_low, feature_high = feature_bounds(feature.export())
+            if all(feature_low[axis] <= high[axis] and low[axis] <= feature_high[axis] for axis in range(3)):
+                expected.append(feature)
+        assert index.intersecting(low, high) == expected
+
+
+def test_feature_index_on_side():
+    sheet = SheetMetal(x_size=100, y_size=50, z_size=2, part_no="sheet")
+    sheet.top.hole(pos=(10, 10), diameter=3)
+    sheet.left.hole(pos=(10, 1), diameter=1)
+    sheet.beveled_edge(edge_type="round", side1="FRONT", side2="LEFT", size=3)
+    sheet.top.hole(pos=(20, 10), diameter=3)
+    index = sheet.feature_index
+    assert [feature.x for feature in index.on_side("TOP")] == [10, 20]
+    assert index.on_side("RIGHT") == []
+    assert len(index.unbounded) == 1, "The beveled edge has no bounds."
+    assert index.on_side("LEFT") == [sheet.features[1]]
+    assert index.on_side("BOTTOM") == [sheet.features[2]], "Features that are not in the grid are found by side."
+
+
+def test_part_feature_index_rebuild():
+    panel = Print3D(x_size=100, y_size=100, z_size=5, part_no="panel")
+    panel.top.hole(pos=(10, 10), diameter=3)
+    index = panel.feature_index
+    assert panel.feature_index is index, "The index is only built once."
+    panel.top.hole(pos=(90, 90), diameter=3)
+    assert panel.feature_index is not index
+    assert len(panel.feature_index.intersecting((80, 80, 0), (100, 100, 5))) == 1
@@ -0,0 +1,75 @@
+# SPDX-FileCopyrightText: 2025 Tsolo.io
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import json
+
+import pytest
+
+from cycax.cycad import Assembly, Print3D
+from cycax.cycad.validate import validate_spec
+
+
+def checks(report: dict) -> list[tuple[str, list[int]]]:
+    return [(issue["check"], issue["features"]) for issue in report["issues"]]
+
+
+def test_validate_clean():
+    panel = Print3D(x_size=100, y_size=50, z_size=5, part_no="clean")
+    panel.top.hole(pos=(10, 10), diameter=3)
+    panel.top.hole(pos=(20, 10), diameter=3)
+    panel.top.box(pos=(40, 20), length=10, width=10, depth=2)
+    assert panel.validate() == {"name": "clean", "issues": []}
+
+
+def test_validate_out_of_bounds():
+    panel = Print3D(x_size=100, y_size=50, z_size=5, part_no="bounds")
+    panel.top.hole(pos=(10, 10), diameter=3)
+    panel.top.hole(pos=(0.5, 25), diameter=3)
+    panel.top.box(pos=(95, 20), length=10, width=10, depth=2)
+    assert checks(panel.validate()) == [("out_of_bounds", [2]), ("out_of_bounds", [3])]
+
+
+def test_validate_thin_wall():
+    panel = Print3D(x_size=100, y_size=50, z_size=5, part_no="walls")
+    panel.top.hole(pos=(10, 10), diameter=4)
+    panel.top.hole(pos=(14.5, 10), diameter=4)  # A 0.5mm wall between the holes.
+    panel.top.hole(pos=(2.8, 30), diameter=4)  # A 0.8mm wall to the left side.
+    panel.bottom.hole(pos=(10, 10), diameter=4, depth=2)
+    panel.top.hole(pos=(14.5, 40), diameter=4, depth=2)  # Not next to the hole from the bottom.
+    report = panel.validate()
+    assert checks(report) == [("thin_wall", [3]), ("thin_wall", [1, 2])]
+    assert [issue["wall"] for issue in report["issues"]] == pytest.approx([0.8, 0.5])
+    assert checks(panel.validate(min_wall=0.4)) == []
+
+
+def test_validate_thin_wall_pattern():
+    panel = Print3D(x_size=100, y_size=50, z_size=5, part_no="pattern")
+    panel.top.hole_grid(pos=(10, 10), diameter=4, spacing=(4.5, 10), count=(2, 2))
+    assert checks(panel.validate()) == [("thin_wall", [1, 1]), ("thin_wall", [1, 1])]
+
+
+def test_validate_overlapping_adds():
+    panel = Print3D(x_size=100, y_size=50, z_size=5, part_no="adds")
+    panel.top.cylinder(pos=(10, 10), diameter=4, height=5)
+    panel.top.cylinder(pos=(30, 10), diameter=4, height=5)
+    assert checks(panel.validate()) == [], "The second cylinder is on top of the first one."
+    spec = panel.export()
+    spec["features"][2].update(x=12, y=10, z=5)
+    assert checks({"issues": validate_spec(spec)}) == [("overlapping_adds", [1, 2])]
+
+
+def test_validate_assembly():
+    assembly = Assembly("farm")
+    for number in range(500):
+        panel = Print3D(x_size=100, y_size=50, z_size=5, part_no=f"panel_{number}")
+        for column in range(10):
+            panel.top.hole(pos=(5 + column * 9, 10), diameter=8)
+            panel.top.hole(pos=(5 + column * 9, 40), diameter=3)
+        panel.top.hole(pos=(0.5, 25), diameter=3)
+        assembly.add(panel)
+
+    report = assembly.validate()
+    assert len(report["issues"]) == 500
+    assert {issue["check"] for issue in report["issues"]} == {"out_of_bounds"}
+    assert json.loads(json.dumps(report)) == report